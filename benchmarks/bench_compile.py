@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import loopy as lp
+from .workloads import CACHE_MODES, WORKLOADS, get_kernel_name, set_cache_mode
+
+
+# {{{ base class
+
+class _PipelineStageBenchmark:
+    """Times one stage of the compilation pipeline on each workload in
+    :data:`~benchmarks.workloads.WORKLOADS`, for each of the
+    :data:`~benchmarks.workloads.CACHE_MODES`.
+
+    Subclasses implement :meth:`prepare`, which brings the kernel to the input
+    state of the stage, and :meth:`run_stage`.
+    """
+
+    params = (sorted(WORKLOADS), CACHE_MODES)
+    param_names = ("workload", "cache_mode")
+
+    # Each sample needs its own setup so that "cold" runs see a new kernel and
+    # "warm" runs see empty in-memory caches.
+    number = 1
+    repeat = (3, 10, 30.0)
+    warmup_time = 0
+    timeout = 600
+
+    def setup(self, workload, cache_mode):
+        self.workload = WORKLOADS[workload]
+        self.previous_caching_enabled = lp.CACHING_ENABLED
+
+        set_cache_mode(cache_mode)
+
+        self.name = get_kernel_name(workload, cache_mode)
+        self.stage_input = self.prepare()
+
+        if cache_mode == "warm":
+            self.run_stage()
+            lp.clear_in_mem_caches()
+
+    def teardown(self, workload, cache_mode):
+        lp.set_caching_enabled(self.previous_caching_enabled)
+
+    def make(self):
+        return self.workload.make(self.name, lp.OpenCLTarget())
+
+    def prepare(self):
+        raise NotImplementedError
+
+    def run_stage(self):
+        raise NotImplementedError
+
+# }}}
+
+
+class MakeKernel(_PipelineStageBenchmark):
+    def prepare(self):
+        return None
+
+    def run_stage(self):
+        return self.make()
+
+    def time_make_kernel(self, workload, cache_mode):
+        self.run_stage()
+
+
+class ExpandSubst:
+    """Times :func:`loopy.expand_subst` on the workloads that use
+    substitution rules.
+    """
+
+    params = ["dg_flux", "nbody", "sem_tim2d"]
+    param_names = ["workload"]
+
+    def setup(self, workload):
+        self.t_unit = WORKLOADS[workload].make(workload, lp.OpenCLTarget())
+
+    def time_expand_subst(self, workload):
+        lp.expand_subst(self.t_unit)
+
+
+class PreprocessProgram(_PipelineStageBenchmark):
+    def prepare(self):
+        return self.workload.transform(self.make())
+
+    def run_stage(self):
+        return lp.preprocess_program(self.stage_input)
+
+    def time_preprocess_program(self, workload, cache_mode):
+        self.run_stage()
+
+
+class Linearize(_PipelineStageBenchmark):
+    def prepare(self):
+        return lp.preprocess_program(self.workload.transform(self.make()))
+
+    def run_stage(self):
+        return lp.linearize(self.stage_input)
+
+    def time_linearize(self, workload, cache_mode):
+        self.run_stage()
+
+
+class GenerateCode(_PipelineStageBenchmark):
+    def prepare(self):
+        return lp.linearize(
+                lp.preprocess_program(self.workload.transform(self.make())))
+
+    def run_stage(self):
+        return lp.generate_code_v2(self.stage_input)
+
+    def time_generate_code_v2(self, workload, cache_mode):
+        self.run_stage()
+
+
+class FullPipeline(_PipelineStageBenchmark):
+    """Times everything from kernel creation to device code, i.e. what a fresh
+    process pays for its first kernel.
+    """
+
+    def prepare(self):
+        return None
+
+    def run_stage(self):
+        t_unit = self.workload.transform(self.make())
+        return lp.generate_code_v2(t_unit).device_code()
+
+    def time_full_pipeline(self, workload, cache_mode):
+        self.run_stage()
+
+# vim: foldmethod=marker
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+import loopy as lp
+from .workloads import CACHE_MODES, get_kernel_name, set_cache_mode
+from loopy.version import LOOPY_USE_LANGUAGE_VERSION_2018_2  # noqa: F401
+
+
+def make_axpy(name):
+    return lp.make_kernel(
+            "{[i]: 0<=i<n}",
+            "out[i] = alpha*x[i] + y[i]",
+            [
+                lp.GlobalArg("x,y,out", np.float64, shape="n"),
+                lp.ValueArg("alpha", np.float64),
+                lp.ValueArg("n", np.int32),
+                ],
+            name=name, target=lp.ExecutableCTarget())
+
+
+def make_axpy_args(n):
+    rng = np.random.default_rng(seed=17)
+    return {
+            "x": rng.random(n),
+            "y": rng.random(n),
+            "out": np.empty(n),
+            "alpha": 2.0,
+            }
+
+
+class CExecutorFirstCall:
+    """Times the first call to a :class:`loopy.target.c.c_execution.CExecutor`,
+    i.e. type inference, scheduling, code generation, compilation and
+    invoker generation, or whichever of those are not served from cache.
+    """
+
+    params = CACHE_MODES
+    param_names = ("cache_mode",)
+
+    number = 1
+    repeat = (3, 10, 60.0)
+    warmup_time = 0
+    timeout = 600
+
+    def setup(self, cache_mode):
+        self.previous_caching_enabled = lp.CACHING_ENABLED
+        set_cache_mode(cache_mode)
+
+        self.t_unit = make_axpy(get_kernel_name("axpy", cache_mode))
+        self.args = make_axpy_args(16)
+
+        if cache_mode == "warm":
+            self.t_unit.executor()(**self.args)
+            lp.clear_in_mem_caches()
+
+    def teardown(self, cache_mode):
+        lp.set_caching_enabled(self.previous_caching_enabled)
+
+    def time_first_call(self, cache_mode):
+        self.t_unit.executor()(**self.args)
+
+
+class _CExecutorHotPathBenchmark:
+    def setup_executor(self, caching_enabled, n):
+        self.previous_caching_enabled = lp.CACHING_ENABLED
+        set_cache_mode("warm" if caching_enabled else "disabled")
+
+        self.executor = make_axpy("axpy").executor()
+        self.args = make_axpy_args(n)
+
+        # build and load the kernel
+        self.executor(**self.args)
+
+    def teardown(self, caching_enabled, *args):
+        lp.set_caching_enabled(self.previous_caching_enabled)
+
+
+class CExecutorCallOverhead(_CExecutorHotPathBenchmark):
+    """Times calls of an already-built kernel on single-element arrays, i.e.
+    the per-call cost of argument processing and the invoker.
+    """
+
+    params = (False, True)
+    param_names = ("caching_enabled",)
+
+    def setup(self, caching_enabled):
+        self.setup_executor(caching_enabled, 1)
+
+    def time_call(self, caching_enabled):
+        self.executor(**self.args)
+
+
+class CExecutorThroughput(_CExecutorHotPathBenchmark):
+    """Times calls of an already-built kernel on arrays of increasing size."""
+
+    params = ((False, True), (2**10, 2**16, 2**22))
+    param_names = ("caching_enabled", "n")
+
+    def setup(self, caching_enabled, n):
+        self.setup_executor(caching_enabled, n)
+
+    def time_call(self, caching_enabled, n):
+        self.executor(**self.args)
+
+    def track_bandwidth(self, caching_enabled, n):
+        nrounds = max(1, 2**22 // n)
+
+        start = perf_counter()
+        for _ in range(nrounds):
+            self.executor(**self.args)
+        elapsed = (perf_counter() - start) / nrounds
+
+        # x and y are read, out is written
+        return 3 * n * np.dtype(np.float64).itemsize / elapsed * 1e-9
+
+    track_bandwidth.unit = "GB/s"
+
+# vim: foldmethod=marker
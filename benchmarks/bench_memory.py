@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import pickle
+import tracemalloc
+
+import numpy as np
+
+import loopy as lp
+from loopy.version import LOOPY_USE_LANGUAGE_VERSION_2018_2  # noqa: F401
+
+
+def make_unrolled(ninsns):
+    """Return a linearized kernel with one statement per entry of an
+    unrolled local matrix, in the style of ``proto-tests/test_fem_assembly.py``.
+    """
+    knl = lp.make_kernel(
+            "{[e,i]: 0<=e<n and 0<=i<4}",
+            [f"out[e, {k}] = {k}*a[e, {k}] + sum(i, b[e, i])"
+                for k in range(ninsns)],
+            [
+                lp.GlobalArg("a,out", np.float64, shape=("n", ninsns)),
+                lp.GlobalArg("b", np.float64, shape=("n", 4)),
+                ...],
+            name="unrolled")
+    knl = lp.split_iname(knl, "e", 16, outer_tag="g.0")
+
+    caching_enabled = lp.CACHING_ENABLED
+    lp.set_caching_enabled(False)
+    try:
+        return lp.linearize(lp.preprocess_kernel(knl))
+    finally:
+        lp.set_caching_enabled(caching_enabled)
+
+
+def get_allocated_bytes(f):
+    """Return the number of bytes allocated by *f* that are still alive
+    when it returns.
+    """
+    tracemalloc.start()
+    try:
+        result = f()  # noqa: F841
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+class LinearizedKernelFootprint:
+    """Tracks the size of the instructions and the linearization of a kernel
+    with many statements, in memory and pickled, and times pickling it.
+    """
+
+    params = (100, 300)
+    param_names = ("ninsns",)
+
+    timeout = 600
+
+    def setup(self, ninsns):
+        self.t_unit = make_unrolled(ninsns)
+        self.kernel = self.t_unit.default_entrypoint
+        self.pickled_t_unit = pickle.dumps(self.t_unit)
+
+    def track_instructions_bytes(self, ninsns):
+        pickled = pickle.dumps(list(self.kernel.instructions))
+        return get_allocated_bytes(lambda: pickle.loads(pickled))
+
+    def track_linearization_bytes(self, ninsns):
+        pickled = pickle.dumps(self.kernel.linearization)
+        return get_allocated_bytes(lambda: pickle.loads(pickled))
+
+    def track_pickled_bytes(self, ninsns):
+        return len(self.pickled_t_unit)
+
+    def peakmem_unpickle(self, ninsns):
+        list(pickle.loads(self.pickled_t_unit).default_entrypoint.instructions)
+
+    def time_pickle(self, ninsns):
+        pickle.dumps(self.t_unit)
+
+    def time_unpickle(self, ninsns):
+        pickle.loads(self.pickled_t_unit)
+
+    track_instructions_bytes.unit = "bytes"
+    track_linearization_bytes.unit = "bytes"
+    track_pickled_bytes.unit = "bytes"
+
+# vim: foldmethod=marker
@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Callable
+from uuid import uuid4
+
+import numpy as np
+
+import loopy as lp
+from loopy.version import LOOPY_USE_LANGUAGE_VERSION_2018_2  # noqa: F401
+
+
+__doc__ = """
+Kernels for the benchmark suite, taken from the application tests in
+``test/test_apps.py``, ``test/test_dg.py``, ``test/test_sem_reagan.py``,
+``test/test_numa_diff.py`` and ``test/test_nbody.py``, along with a
+DG surface flux kernel built from nested substitution rules.
+
+.. autoclass:: Workload
+
+.. autodata:: WORKLOADS
+
+.. autodata:: CACHE_MODES
+
+.. autofunction:: set_cache_mode
+.. autofunction:: get_kernel_name
+"""
+
+
+# {{{ workload container
+
+@dataclass(frozen=True)
+class Workload:
+    """
+    .. attribute:: make
+
+        A callable taking *(name, target)* and returning a freshly created
+        :class:`loopy.TranslationUnit`. Calling it times the front-end,
+        i.e. :func:`loopy.make_kernel` or :func:`loopy.parse_fortran`.
+
+    .. attribute:: transform
+
+        A callable taking and returning a :class:`loopy.TranslationUnit`
+        applying the optimizing transformations from the corresponding test.
+    """
+    make: Callable[[str, lp.TargetBase], lp.TranslationUnit]
+    transform: Callable[[lp.TranslationUnit], lp.TranslationUnit]
+
+# }}}
+
+
+# {{{ test_apps.py: convolution
+
+def make_convolution(name, target):
+    knl = lp.make_kernel(
+        "{ [iimg, ifeat, icolor, im_x, im_y, f_x, f_y]: \
+                -f_w <= f_x,f_y <= f_w \
+                and 0 <= im_x < im_w and 0 <= im_y < im_h \
+                and 0<=iimg<=nimgs and 0<=ifeat<nfeats and 0<=icolor<ncolors \
+                }",
+        """
+        out[iimg, ifeat, im_x, im_y] = sum((f_x, f_y, icolor), \
+            img[iimg, f_w+im_x-f_x, f_w+im_y-f_y, icolor] \
+            * f[ifeat, f_w+f_x, f_w+f_y, icolor])
+        """,
+        [
+            lp.GlobalArg("f", np.float32, shape=lp.auto),
+            lp.GlobalArg("img", np.float32, shape=lp.auto),
+            lp.GlobalArg("out", np.float32, shape=lp.auto),
+            "..."
+            ],
+        assumptions="f_w>=1 and im_w, im_h >= 2*f_w+1 and nfeats>=1 and nimgs>=0",
+        name=name, target=target)
+
+    return lp.fix_parameters(knl, f_w=3, ncolors=3)
+
+
+def transform_convolution(knl):
+    knl = lp.split_iname(knl, "im_x", 16, outer_tag="g.0", inner_tag="l.0")
+    knl = lp.split_iname(knl, "im_y", 16, outer_tag="g.1", inner_tag="l.1")
+    knl = lp.tag_inames(knl, {"ifeat": "g.2"})
+    knl = lp.add_prefetch(knl, "f[ifeat,:,:,:]",
+            fetch_outer_inames="im_x_outer, im_y_outer, ifeat",
+            default_tag="l.auto")
+    knl = lp.add_prefetch(knl, "img", "im_x_inner, im_y_inner, f_x, f_y",
+            fetch_outer_inames="iimg, im_x_outer, im_y_outer, ifeat, icolor",
+            default_tag="l.auto")
+    return knl
+
+# }}}
+
+
+# {{{ test_apps.py: stencil
+
+def make_stencil(name, target, n=256):
+    return lp.make_kernel(
+            "{[i,j]: 0<= i,j < %d}" % n,
+            [
+                "a_offset(ii, jj) := a[ii+1, jj+1]",
+                "z[i,j] = -2*a_offset(i,j)"
+                " + a_offset(i,j-1)"
+                " + a_offset(i,j+1)"
+                " + a_offset(i-1,j)"
+                " + a_offset(i+1,j)"
+                ],
+            [
+                lp.GlobalArg("a", np.float32, shape=(n+2, n+2,)),
+                lp.GlobalArg("z", np.float32, shape=(n+2, n+2,))
+                ],
+            name=name, target=target)
+
+
+def transform_stencil(knl):
+    knl = lp.split_iname(knl, "i", 16, outer_tag="g.1", inner_tag="l.1")
+    knl = lp.split_iname(knl, "j", 16, outer_tag="g.0", inner_tag="l.0")
+    knl = lp.add_prefetch(knl, "a", ["i_inner", "j_inner"],
+            fetch_bounding_box=True, default_tag="l.auto")
+    knl = lp.prioritize_loops(knl, ["a_dim_0_outer", "a_dim_1_outer"])
+    return knl
+
+# }}}
+
+
+# {{{ test_dg.py: volume kernel
+
+def make_dg_volume(name, target):
+    try:
+        from pyopencl.array import vec
+    except ImportError:
+        # asv skips benchmarks whose setup raises NotImplementedError
+        raise NotImplementedError(
+                "dg_volume needs pyopencl vector types") from None
+
+    dtype = np.float32
+    dtype4 = vec.float4
+
+    n = 3
+    np_ = (n+1)*(n+2)*(n+3)//6
+
+    knl = lp.make_kernel([
+            "{[n,m,k]: 0<= n,m < Np and 0<= k < K}",
+            ],
+            """
+                <> du_drst = simul_reduce(sum, m, DrDsDt[n,m]*u[k,m])
+                <> dv_drst = simul_reduce(sum, m, DrDsDt[n,m]*v[k,m])
+                <> dw_drst = simul_reduce(sum, m, DrDsDt[n,m]*w[k,m])
+                <> dp_drst = simul_reduce(sum, m, DrDsDt[n,m]*p[k,m])
+
+                # volume flux
+                rhsu[k,n] = dot(drst_dx[k],dp_drst)
+                rhsv[k,n] = dot(drst_dy[k],dp_drst)
+                rhsw[k,n] = dot(drst_dz[k],dp_drst)
+                rhsp[k,n] = dot(drst_dx[k], du_drst) + dot(drst_dy[k], dv_drst) \
+                    + dot(drst_dz[k], dw_drst)
+                """,
+            [
+                lp.GlobalArg("u,v,w,p,rhsu,rhsv,rhsw,rhsp",
+                    dtype, shape="K, Np", order="C"),
+                lp.GlobalArg("DrDsDt", dtype4, shape="Np, Np", order="C"),
+                lp.GlobalArg("drst_dx,drst_dy,drst_dz", dtype4, shape="K",
+                    order="F"),
+                lp.ValueArg("K", np.int32, approximately=1000),
+                ],
+            name=name, assumptions="K>=1", target=target)
+
+    return lp.fix_parameters(knl, Np=np_)
+
+
+def transform_dg_volume(knl):
+    knl = lp.tag_inames(knl, {"n": "l.0"})
+    knl = lp.split_iname(knl, "k", 3, outer_tag="g.0", inner_tag="l.1")
+    for name in ["u", "v", "w", "p"]:
+        knl = lp.add_prefetch(knl, "%s[k,:]" % name, ["k_inner"],
+                default_tag="l.auto")
+    return knl
+
+# }}}
+
+
+# {{{ test_dg.py-style: surface flux with nested substitution rules
+
+def make_dg_flux(name, target):
+    nfaces = 3
+    nfp = 4
+    np_ = 10
+
+    fields = ["u", "v", "p"]
+    rules = []
+    for fld in fields:
+        rules.extend([
+            f"{fld}_int(ii) := {fld}[k, fmask[f, ii]]",
+            f"{fld}_ext(ii) := {fld}[nbr[k, f], fmask[nbrface[k, f], ii]]",
+            f"d{fld}(ii) := {fld}_ext(ii) - {fld}_int(ii)",
+            ])
+
+    knl = lp.make_kernel(
+            "{[k,f,i]: 0<=k<K and 0<=f<Nfaces and 0<=i<Nfp}",
+            [
+                *rules,
+                "ndotdu(ii) := nx[k, f]*du(ii) + ny[k, f]*dv(ii)",
+                "fluxu(ii) := nx[k, f]*(dp(ii) - alpha*ndotdu(ii))",
+                "fluxv(ii) := ny[k, f]*(dp(ii) - alpha*ndotdu(ii))",
+                "fluxp(ii) := ndotdu(ii) - alpha*dp(ii)",
+                "rhsu[k, f, i] = 0.5*fscale[k, f]*fluxu(i)",
+                "rhsv[k, f, i] = 0.5*fscale[k, f]*fluxv(i)",
+                "rhsp[k, f, i] = 0.5*fscale[k, f]*fluxp(i)",
+            ],
+            [
+                lp.GlobalArg("u,v,p", np.float64, shape="K, Np"),
+                lp.GlobalArg("rhsu,rhsv,rhsp", np.float64,
+                    shape="K, Nfaces, Nfp"),
+                lp.GlobalArg("nx,ny,fscale", np.float64, shape="K, Nfaces"),
+                lp.GlobalArg("nbr,nbrface", np.int32, shape="K, Nfaces"),
+                lp.GlobalArg("fmask", np.int32, shape="Nfaces, Nfp"),
+                lp.ValueArg("alpha", np.float64),
+                lp.ValueArg("K", np.int32, approximately=1000),
+                ],
+            name=name, assumptions="K>=1", target=target)
+
+    return lp.fix_parameters(knl, Nfaces=nfaces, Nfp=nfp, Np=np_)
+
+
+def transform_dg_flux(knl):
+    knl = lp.split_iname(knl, "k", 16, outer_tag="g.0", inner_tag="l.1")
+    knl = lp.tag_inames(knl, {"i": "l.0"})
+    return knl
+
+# }}}
+
+
+# {{{ test_sem_reagan.py: 2D spectral element Laplacian
+
+def make_sem_tim2d(name, target):
+    from pymbolic import var
+
+    dtype = np.float32
+    n = 8
+
+    field_shape = (var("K"), n, n)
+
+    knl = lp.make_kernel(
+            "{[i,j,e,m,o,o2]: 0<=i,j,m,o,o2<n and 0<=e<K}",
+            [
+                "ur(a,b) := simul_reduce(sum, o, D[a,o]*u[e,o,b])",
+                "us(a,b) := simul_reduce(sum, o2, D[b,o2]*u[e,a,o2])",
+
+                "Gux(a,b) := G$x[0,e,a,b]*ur(a,b)+G$x[1,e,a,b]*us(a,b)",
+                "Guy(a,b) := G$y[1,e,a,b]*ur(a,b)+G$y[2,e,a,b]*us(a,b)",
+                "lap[e,i,j]  = "
+                "  simul_reduce(sum, m, D[m,i]*Gux(m,j))"
+                "+ simul_reduce(sum, m, D[m,j]*Guy(i,m))"
+            ],
+            [
+                lp.GlobalArg("u", dtype, shape=field_shape, order="C"),
+                lp.GlobalArg("lap", dtype, shape=field_shape, order="C"),
+                lp.GlobalArg("G", dtype, shape=(3, *field_shape), order="C"),
+                lp.GlobalArg("D", dtype, shape=(n, n), order="C"),
+                lp.ValueArg("K", np.int32, approximately=1000),
+                ],
+            name=name, assumptions="K>=1", target=target)
+
+    return lp.fix_parameters(knl, n=n)
+
+
+def transform_sem_tim2d(knl):
+    knl = lp.tag_inames(knl, {"i": "l.0", "j": "l.1", "e": "g.0"})
+
+    knl = lp.add_prefetch(knl, "D[:,:]", fetch_outer_inames="e",
+            default_tag="l.auto")
+    knl = lp.add_prefetch(knl, "u[e, :, :]", default_tag="l.auto")
+
+    knl = lp.precompute(knl, "ur(m,j)", ["m", "j"], default_tag="l.auto")
+    knl = lp.precompute(knl, "us(i,m)", ["i", "m"], default_tag="l.auto")
+
+    knl = lp.precompute(knl, "Gux(m,j)", ["m", "j"], default_tag="l.auto")
+    knl = lp.precompute(knl, "Guy(i,m)", ["i", "m"], default_tag="l.auto")
+
+    knl = lp.add_prefetch(knl, "G$x[:,e,:,:]", default_tag="l.auto")
+    knl = lp.add_prefetch(knl, "G$y[:,e,:,:]", default_tag="l.auto")
+
+    knl = lp.tag_inames(knl, {"o": "unr"})
+    knl = lp.tag_inames(knl, {"m": "unr"})
+
+    knl = lp.set_instruction_priority(knl, "id:D_fetch", 5)
+
+    return knl
+
+# }}}
+
+
+# {{{ test_numa_diff.py: GNuMA horizontal volume kernel
+
+_GNUMA_SOURCE = os.path.join(
+        os.path.dirname(__file__), os.pardir, "test", "strongVolumeKernels.f90")
+
+
+def make_gnuma_horiz(name, target):
+    try:
+        import fparser  # noqa: F401
+    except ImportError:
+        raise NotImplementedError("gnuma_horiz needs fparser") from None
+
+    with open(_GNUMA_SOURCE) as sourcef:
+        source = sourcef.read()
+
+    source = source.replace("datafloat", "real*4")
+
+    t_unit = lp.parse_fortran(source, _GNUMA_SOURCE, seq_dependencies=False)
+
+    hsv_r = lp.tag_instructions(t_unit["strongVolumeKernelR"], "rknl")
+    hsv_s = lp.tag_instructions(t_unit["strongVolumeKernelS"], "sknl")
+    hsv = lp.fuse_kernels([hsv_r, hsv_s], ["_r", "_s"])
+    hsv = lp.rename_callable(hsv, hsv.default_entrypoint.name, name)
+
+    return hsv.copy(target=target)
+
+
+def transform_gnuma_horiz(hsv):
+    from loopy.frontend.fortran.translator import specialize_fortran_division
+
+    hsv = lp.add_nosync(hsv, "any", "writes:rhsQ", "writes:rhsQ", force=True)
+    hsv = lp.fix_parameters(hsv, Nq=7)
+    hsv = lp.prioritize_loops(hsv, "e,k,j,i")
+    hsv = lp.tag_inames(hsv, {"e": "g.0", "j": "l.1", "i": "l.0"})
+    hsv = lp.assume(hsv, "elements >= 1")
+    hsv = lp.fix_parameters(hsv, p_p0=1, p_Gamma=1.4, p_R=1)
+    hsv = specialize_fortran_division(hsv)
+
+    hsv = lp.tag_array_axes(hsv, "D", "f,f")
+    hsv = lp.add_prefetch(hsv, "D[:,:]", fetch_outer_inames="e",
+            default_tag="l.auto")
+
+    return hsv
+
+# }}}
+
+
+# {{{ test_nbody.py
+
+def make_nbody(name, target):
+    dtype = np.float32
+
+    return lp.make_kernel(
+            "[N] -> {[i,j,k]: 0<=i,j<N and 0<=k<3 }",
+            [
+                "axdist(k) := x[i,k]-x[j,k]",
+                "invdist := rsqrt(sum(k, axdist(k)**2))",
+                "pot[i] = sum(j, if(i != j, invdist, 0))",
+            ], [
+                lp.GlobalArg("x", dtype, shape="N,3", order="C"),
+                lp.GlobalArg("pot", dtype, shape="N", order="C"),
+                lp.ValueArg("N", np.int32),
+            ], name=name, assumptions="N>=1", target=target)
+
+
+def transform_nbody(knl):
+    knl = lp.expand_subst(knl)
+    knl = lp.split_iname(knl, "i", 256,
+            outer_tag="g.0", inner_tag="l.0")
+    knl = lp.split_iname(knl, "j", 256)
+    knl = lp.add_prefetch(knl, "x[j,k]", ["j_inner", "k"],
+            ["x_fetch_j", "x_fetch_k"],
+            fetch_outer_inames="i_outer, j_outer", default_tag=None)
+    knl = lp.tag_inames(knl, {"x_fetch_k": "unr", "x_fetch_j": "l.0"})
+    knl = lp.add_prefetch(knl, "x[i,k]", ["k"], default_tag=None)
+    knl = lp.prioritize_loops(knl, ["j_outer", "j_inner"])
+    return knl
+
+# }}}
+
+
+WORKLOADS = {
+        "convolution": Workload(make_convolution, transform_convolution),
+        "stencil": Workload(make_stencil, transform_stencil),
+        "dg_volume": Workload(make_dg_volume, transform_dg_volume),
+        "dg_flux": Workload(make_dg_flux, transform_dg_flux),
+        "sem_tim2d": Workload(make_sem_tim2d, transform_sem_tim2d),
+        "gnuma_horiz": Workload(make_gnuma_horiz, transform_gnuma_horiz),
+        "nbody": Workload(make_nbody, transform_nbody),
+        }
+
+
+# {{{ cache control
+
+#: ``"disabled"`` runs with :func:`loopy.set_caching_enabled` turned off.
+#: ``"cold"`` runs with caching enabled on a kernel that has never been
+#: seen before (see :func:`get_kernel_name`), so that every cache lookup misses.
+#: ``"warm"`` runs with caching enabled after the benchmarked stage has been
+#: run once, with the in-memory caches cleared so that results come from disk.
+CACHE_MODES = ("disabled", "cold", "warm")
+
+
+def set_cache_mode(cache_mode: str) -> None:
+    if cache_mode not in CACHE_MODES:
+        raise ValueError(f"unknown cache mode '{cache_mode}'")
+
+    lp.set_caching_enabled(cache_mode != "disabled")
+    lp.clear_in_mem_caches()
+
+
+def get_kernel_name(workload: str, cache_mode: str) -> str:
+    """Return the name to give the kernel of *workload*. For the ``"cold"``
+    cache mode, this is unique, which forces misses in all of :mod:`loopy`'s
+    caches, since those are keyed on the (entire) kernel.
+    """
+    if cache_mode == "cold":
+        return f"{workload}_{uuid4().hex}"
+    else:
+        return workload
+
+# }}}
+
+# vim: foldmethod=marker
@@ -34,7 +34,13 @@ from loopy.frontend.fortran import (
     parse_transformed_fortran,
 )
 from loopy.kernel import KernelState, LoopKernel
-from loopy.kernel.creation import UniqueName, make_function, make_kernel
+from loopy.kernel.creation import (
+    KernelTemplate,
+    UniqueName,
+    make_function,
+    make_kernel,
+    make_kernel_template,
+)
 from loopy.kernel.data import (
     AddressSpace,
     ArrayArg,
@@ -67,6 +73,7 @@ from loopy.kernel.instruction import (
     MultiAssignmentBase,
     NoOpInstruction,
     OrderedAtomic,
+    PrefetchInstruction,
     UseStreamingStoreTag,
     VarAtomicity,
 )
@@ -134,6 +141,7 @@ from loopy.transform.callable import (
 from loopy.transform.concatenate import concatenate_arrays
 from loopy.transform.data import (
     add_prefetch,
+    add_software_prefetch,
     alias_temporaries,
     allocate_temporaries_for_base_storage,
     change_arg_to_image,
@@ -152,9 +160,11 @@ from loopy.transform.iname import (
     add_inames_for_unused_hw_axes,
     add_inames_to_insn,
     affine_map_inames,
+    auto_prioritize_loops,
     chunk_iname,
     duplicate_inames,
     find_unused_axis_tag,
+    fuse_loops,
     get_iname_duplication_options,
     has_schedulable_iname_nesting,
     join_inames,
@@ -183,6 +193,7 @@ from loopy.transform.instruction import (
     simplify_indices,
     tag_instructions,
 )
+from loopy.transform.layout import auto_tag_array_axes
 from loopy.transform.pack_and_unpack_args import pack_and_unpack_args_for_call
 from loopy.transform.padding import (
     add_padding,
@@ -198,7 +209,7 @@ from loopy.transform.privatize import (
     unprivatize_temporaries_with_inames,
 )
 from loopy.transform.realize_reduction import realize_reduction
-from loopy.transform.save import save_and_reload_temporaries
+from loopy.transform.save import auto_alias_temporaries, save_and_reload_temporaries
 from loopy.transform.subst import (
     assignment_to_subst,
     expand_subst,
@@ -206,6 +217,7 @@ from loopy.transform.subst import (
     find_one_rule_matching,
     find_rules_matching,
 )
+from loopy.transform.tiling import tile_inames, unroll_and_jam
 from loopy.translation_unit import TranslationUnit, for_each_kernel, make_program
 from loopy.type_inference import infer_unknown_types
 from loopy.types import LoopyType, NumpyType, ToLoopyTypeConvertible, to_loopy_type
@@ -247,6 +259,7 @@ __all__ = [
     "InstructionBase",
     "KernelArgument",
     "KernelState",
+    "KernelTemplate",
     "LegacyStringInstructionTag",
     "LinearSubscript",
     "LoopKernel",
@@ -265,6 +278,7 @@ __all__ = [
     "Options",
     "OrderedAtomic",
     "PreambleInfo",
+    "PrefetchInstruction",
     "PyOpenCLTarget",
     "Reduction",
     "ScalarCallable",
@@ -291,12 +305,16 @@ __all__ = [
     "add_nosync",
     "add_padding",
     "add_prefetch",
+    "add_software_prefetch",
     "affine_map_inames",
     "alias_temporaries",
     "allocate_temporaries_for_base_storage",
     "assignment_to_subst",
     "assume",
     "auto",
+    "auto_alias_temporaries",
+    "auto_prioritize_loops",
+    "auto_tag_array_axes",
     "auto_test_vs_ref",
     "buffer_array",
     "c_preprocess",
@@ -318,6 +336,7 @@ __all__ = [
     "fold_constants",
     "for_each_kernel",
     "fuse_kernels",
+    "fuse_loops",
     "gather_access_footprint_bytes",
     "gather_access_footprints",
     "generate_body",
@@ -346,6 +365,7 @@ __all__ = [
     "make_function",
     "make_kernel",
     "make_kernel",
+    "make_kernel_template",
     "make_program",
     "make_reduction_inames_unique",
     "map_domain",
@@ -396,9 +416,11 @@ __all__ = [
     "tag_data_axes",
     "tag_inames",
     "tag_instructions",
+    "tile_inames",
     "to_batched",
     "to_loopy_type",
     "unprivatize_temporaries_with_inames",
+    "unroll_and_jam",
     "untag_inames",
     ]
 
@@ -23,8 +23,12 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+import os
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from math import comb
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Sequence
 from warnings import warn
 
 import numpy as np
@@ -35,8 +39,11 @@ from loopy.kernel.array import get_strides
 
 
 if TYPE_CHECKING:
+    import pyopencl as cl
     import pyopencl.array as cla
 
+    from loopy.translation_unit import TranslationUnit
+
 
 AUTO_TEST_SKIP_RUN = False
 
@@ -64,27 +71,110 @@ def evaluate_shape(shape, context):
     return tuple(result)
 
 
-# {{{ create random argument arrays for testing
+# {{{ array backends
 
-def fill_rand(ary):
-    from pyopencl.clrandom import fill_rand
-    if ary.dtype.kind == "c":
-        real_dtype = ary.dtype.type(0).real.dtype
-        real_ary = ary.view(real_dtype)
+class _ArrayBackend:
+    """Allocates, fills and transfers the arrays used in automatic testing,
+    abstracting over where the kernel under test executes.
+    """
+
+    def empty(self, shape, dtype):
+        raise NotImplementedError
+
+    def fill_rand(self, ary):
+        raise NotImplementedError
+
+    def as_strided(self, ary, shape, strides):
+        raise NotImplementedError
+
+    def get(self, ary) -> np.ndarray:
+        raise NotImplementedError
+
+    def to_device(self, host_ary):
+        raise NotImplementedError
+
+
+class _PyOpenCLArrayBackend(_ArrayBackend):
+    def __init__(self, queue: cl.CommandQueue) -> None:
+        self.queue = queue
+
+    def empty(self, shape, dtype):
+        import pyopencl.array as cl_array
+        return cl_array.empty(self.queue, shape, dtype, order="C")
+
+    def fill_rand(self, ary):
+        from pyopencl.clrandom import fill_rand
+        if ary.dtype.kind == "c":
+            real_dtype = ary.dtype.type(0).real.dtype
+            real_ary = ary.view(real_dtype)
+
+            fill_rand(real_ary)
+        else:
+            fill_rand(ary)
+
+    def as_strided(self, ary, shape, strides):
+        import pyopencl.array as cl_array
+        return cl_array.as_strided(ary, shape, strides)
+
+    def get(self, ary):
+        return ary.get()
+
+    def to_device(self, host_ary):
+        import pyopencl.array as cl_array
+        return cl_array.to_device(self.queue, host_ary)
+
+
+class _NumpyArrayBackend(_ArrayBackend):
+    def __init__(self) -> None:
+        self.rng = np.random.default_rng()
+
+    def empty(self, shape, dtype):
+        return np.empty(shape, dtype)
 
-        fill_rand(real_ary)
+    def fill_rand(self, ary):
+        if ary.dtype.kind == "c":
+            real_dtype = ary.dtype.type(0).real.dtype
+            ary.view(real_dtype)[...] = self.rng.random(2*ary.size)
+        elif ary.dtype.kind in "iu":
+            ary[...] = self.rng.integers(0, 256, size=ary.shape)
+        elif ary.dtype.kind == "b":
+            ary[...] = self.rng.integers(0, 2, size=ary.shape)
+        else:
+            ary[...] = self.rng.random(ary.shape)
+
+    def as_strided(self, ary, shape, strides):
+        return np.lib.stride_tricks.as_strided(ary, shape, strides)
+
+    def get(self, ary):
+        return ary
+
+    def to_device(self, host_ary):
+        return host_ary.copy()
+
+
+def _get_array_backend(queue: cl.CommandQueue | None) -> _ArrayBackend:
+    if queue is None:
+        return _NumpyArrayBackend()
     else:
-        fill_rand(ary)
+        return _PyOpenCLArrayBackend(queue)
+
+
+def fill_rand(ary):
+    _PyOpenCLArrayBackend(ary.queue).fill_rand(ary)
+
+# }}}
 
 
+# {{{ create random argument arrays for testing
+
 @dataclass
 class TestArgInfo:
     name: str
-    ref_array: cla.Array
-    ref_storage_array: cla.Array
+    ref_array: cla.Array | np.ndarray
+    ref_storage_array: cla.Array | np.ndarray
 
-    ref_pre_run_array: cla.Array
-    ref_pre_run_storage_array: cla.Array
+    ref_pre_run_array: cla.Array | np.ndarray
+    ref_pre_run_storage_array: cla.Array | np.ndarray
 
     ref_shape: tuple[int, ...]
     ref_strides: tuple[int, ...]
@@ -94,8 +184,8 @@ class TestArgInfo:
 
     # The attributes below are being modified in make_args, hence this dataclass
     # cannot be frozen.
-    test_storage_array: cla.Array | None = None
-    test_array: cla.Array | None = None
+    test_storage_array: cla.Array | np.ndarray | None = None
+    test_array: cla.Array | np.ndarray | None = None
     test_shape: tuple[int, ...] | None = None
     test_strides: tuple[int, ...] | None = None
     test_numpy_strides: tuple[int, ...] | None = None
@@ -105,8 +195,11 @@ class TestArgInfo:
 # {{{ "reference" arguments
 
 def make_ref_args(kernel, queue, parameters):
-    import pyopencl as cl
-    import pyopencl.array as cl_array
+    """
+    :arg queue: a :class:`pyopencl.CommandQueue` on which to allocate the
+        arguments, or *None* to allocate them as :class:`numpy.ndarray`
+        instances in host memory.
+    """
     from pymbolic import evaluate
 
     from loopy.kernel.data import (
@@ -117,6 +210,8 @@ def make_ref_args(kernel, queue, parameters):
         ValueArg,
     )
 
+    backend = _get_array_backend(queue)
+
     ref_args = {}
     ref_arg_data = []
 
@@ -147,8 +242,11 @@ def make_ref_args(kernel, queue, parameters):
             is_output = arg.is_output
 
             if isinstance(arg, ImageArg):
-                storage_array = ary = cl_array.empty(
-                        queue, shape, dtype, order="C")
+                if queue is None:
+                    raise LoopyError("image argument '%s' requires an OpenCL "
+                            "context for automatic testing" % arg.name)
+
+                storage_array = ary = backend.empty(shape, dtype)
                 numpy_strides = None
                 alloc_size = None
                 strides = None
@@ -168,15 +266,17 @@ def make_ref_args(kernel, queue, parameters):
                 itemsize = dtype.itemsize
                 numpy_strides = [itemsize*s for s in strides]
 
-                storage_array = cl_array.empty(queue, alloc_size, dtype)
+                storage_array = backend.empty(alloc_size, dtype)
 
             if is_output and isinstance(arg, ImageArg):
                 raise LoopyError("write-mode images not supported in "
                         "automatic testing")
 
-            fill_rand(storage_array)
+            backend.fill_rand(storage_array)
 
             if isinstance(arg, ImageArg):
+                import pyopencl as cl
+
                 # must be contiguous
                 pre_run_ary = pre_run_storage_array = storage_array.copy()
 
@@ -185,8 +285,8 @@ def make_ref_args(kernel, queue, parameters):
             else:
                 pre_run_storage_array = storage_array.copy()
 
-                ary = cl_array.as_strided(storage_array, shape, numpy_strides)
-                pre_run_ary = cl_array.as_strided(
+                ary = backend.as_strided(storage_array, shape, numpy_strides)
+                pre_run_ary = backend.as_strided(
                         pre_run_storage_array, shape, numpy_strides)
                 ref_args[arg.name] = ary
 
@@ -220,12 +320,17 @@ def make_ref_args(kernel, queue, parameters):
 # {{{ "full-scale" arguments
 
 def make_args(kernel, queue, ref_arg_data, parameters):
-    import pyopencl as cl
-    import pyopencl.array as cl_array
+    """
+    :arg queue: a :class:`pyopencl.CommandQueue` on which to allocate the
+        arguments, or *None* to allocate them as :class:`numpy.ndarray`
+        instances in host memory.
+    """
     from pymbolic import evaluate
 
     from loopy.kernel.data import ArrayArg, ConstantArg, ImageArg, ValueArg
 
+    backend = _get_array_backend(queue)
+
     args = {}
     for arg, arg_desc in zip(kernel.args, ref_arg_data):
         if isinstance(arg, ValueArg):
@@ -246,6 +351,12 @@ def make_args(kernel, queue, ref_arg_data, parameters):
                 raise NotImplementedError("write-mode images not supported in "
                         "automatic testing")
 
+            if queue is None:
+                raise LoopyError("image argument '%s' requires an OpenCL "
+                        "context for automatic testing" % arg.name)
+
+            import pyopencl as cl
+
             shape = evaluate_shape(arg.shape, parameters)
             assert shape == arg_desc.ref_shape
 
@@ -265,10 +376,11 @@ def make_args(kernel, queue, ref_arg_data, parameters):
                     for alen, astrd in zip(shape, strides)) + 1
 
             # use contiguous array to transfer to host
-            host_ref_contig_array = arg_desc.ref_pre_run_storage_array.get()
+            host_ref_contig_array = backend.get(
+                    arg_desc.ref_pre_run_storage_array)
 
             # use device shape/strides
-            from pyopencl.compyte.array import as_strided
+            from numpy.lib.stride_tricks import as_strided
             host_ref_array = as_strided(host_ref_contig_array,
                     arg_desc.ref_shape, arg_desc.ref_numpy_strides)
 
@@ -290,9 +402,8 @@ def make_args(kernel, queue, ref_arg_data, parameters):
                     host_storage_array, shape, numpy_strides)
             host_array[...] = host_contig_array
 
-            host_contig_array = arg_desc.ref_storage_array.get()
-            storage_array = cl_array.to_device(queue, host_storage_array)
-            ary = cl_array.as_strided(storage_array, shape, numpy_strides)
+            storage_array = backend.to_device(host_storage_array)
+            ary = backend.as_strided(storage_array, shape, numpy_strides)
 
             args[arg.name] = ary
 
@@ -383,6 +494,302 @@ def _enumerate_cl_devices_for_ref_test(blacklist_ref_vendors, need_image_support
 # }}}
 
 
+# {{{ timing statistics
+
+@dataclass(frozen=True)
+class TimingResult:
+    """Per-invocation run times (in seconds) of a kernel, as gathered by
+    :func:`benchmark`.
+
+    .. attribute:: samples
+
+        A :class:`tuple` of per-invocation times, each averaged over
+        :attr:`rounds_per_sample` back-to-back invocations.
+
+    .. attribute:: warmup_samples
+
+        A :class:`tuple` of times of the individual warm-up invocations.
+        These are not included in the statistics below.
+
+    .. attribute:: rounds_per_sample
+    .. attribute:: confidence
+
+        The confidence level of :attr:`median_ci`.
+
+    .. autoattribute:: median
+    .. autoattribute:: mean
+    .. autoattribute:: quartiles
+    .. autoattribute:: iqr
+    .. autoattribute:: median_ci
+    .. autoattribute:: warmup_overhead
+
+    .. automethod:: as_dict
+    """
+
+    samples: tuple[float, ...]
+    warmup_samples: tuple[float, ...]
+    rounds_per_sample: int
+    confidence: float = 0.95
+
+    @property
+    def median(self) -> float:
+        return float(np.median(self.samples))
+
+    @property
+    def mean(self) -> float:
+        return float(np.mean(self.samples))
+
+    @property
+    def quartiles(self) -> tuple[float, float]:
+        """The first and third quartile of :attr:`samples`."""
+        q1, q3 = np.percentile(self.samples, [25, 75])
+        return float(q1), float(q3)
+
+    @property
+    def iqr(self) -> float:
+        """The interquartile range of :attr:`samples`."""
+        q1, q3 = self.quartiles
+        return q3 - q1
+
+    @property
+    def median_ci(self) -> tuple[float, float]:
+        """A distribution-free confidence interval for the median at the level
+        :attr:`confidence`, obtained from the order statistics of
+        :attr:`samples`. This makes no assumption of normality, which run
+        time distributions (with their long right tails) tend to violate.
+        """
+        sorted_samples = sorted(self.samples)
+        n = len(sorted_samples)
+        alpha = 1 - self.confidence
+
+        # Find the largest k for which P(B < k) <= alpha/2, where
+        # B ~ Binomial(n, 1/2) counts the samples below the median.
+        k = 0
+        cdf = 0
+        for i in range(n+1):
+            cdf += comb(n, i) / 2**n
+            if cdf > alpha/2:
+                break
+            k = i + 1
+
+        if k == 0:
+            # too few samples for the requested confidence
+            return sorted_samples[0], sorted_samples[-1]
+
+        return sorted_samples[k-1], sorted_samples[n-k]
+
+    @property
+    def warmup_overhead(self) -> float | None:
+        """The mean excess time of a warm-up invocation over :attr:`median`
+        (e.g. due to compilation, caches, or page faults), or *None* if there
+        were no warm-up invocations.
+        """
+        if not self.warmup_samples:
+            return None
+        return float(np.mean(self.warmup_samples)) - self.median
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of *self* consisting of only JSON-serializable
+        types.
+        """
+        q1, q3 = self.quartiles
+        ci_low, ci_high = self.median_ci
+        return {
+                "median": self.median,
+                "mean": self.mean,
+                "min": min(self.samples),
+                "max": max(self.samples),
+                "q1": q1,
+                "q3": q3,
+                "iqr": self.iqr,
+                "confidence": self.confidence,
+                "median_ci_low": ci_low,
+                "median_ci_high": ci_high,
+                "nsamples": len(self.samples),
+                "rounds_per_sample": self.rounds_per_sample,
+                "warmup_overhead": self.warmup_overhead,
+                "samples": list(self.samples),
+                "warmup_samples": list(self.warmup_samples),
+                }
+
+
+@contextmanager
+def _pinned_to_cpus(cpus: Sequence[int] | None) -> Iterator[None]:
+    """Restrict the calling thread (not the whole process) to *cpus* for the
+    duration of the context.
+    """
+    if cpus is None:
+        yield
+        return
+
+    if not hasattr(os, "sched_setaffinity"):
+        warn("CPU pinning is not supported on this platform, ignoring",
+                stacklevel=3)
+        yield
+        return
+
+    prev_cpus = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, prev_cpus)
+
+
+def benchmark(
+        run: Callable[[int], Mapping[str, float] | None], *,
+        warmup_rounds: int = 2,
+        min_samples: int = 10,
+        max_samples: int = 1000,
+        min_time: float = 0.3,
+        min_sample_time: float = 1e-3,
+        confidence: float = 0.95,
+        pin_cpus: Sequence[int] | None = None,
+        ) -> dict[str, TimingResult]:
+    """Time repeated invocations of a kernel, independent of how it is
+    executed.
+
+    :arg run: a callable that performs the given number of back-to-back
+        invocations and returns once they have completed. It may return a
+        mapping from names of additional clocks (e.g. ``"event"`` for OpenCL
+        profiling events) to the total elapsed time measured by that clock,
+        in seconds.
+    :arg warmup_rounds: the number of invocations timed individually before
+        taking samples. They are reported as
+        :attr:`TimingResult.warmup_samples`.
+    :arg min_samples: the minimum number of samples to take.
+    :arg max_samples: the maximum number of samples to take.
+    :arg min_time: keep taking samples (up to *max_samples*) until their
+        total run time reaches this many seconds.
+    :arg min_sample_time: invocations are batched so that each sample takes at
+        least this many seconds, to stay well above timer resolution.
+    :arg pin_cpus: if not *None*, a sequence of CPU indices to which the
+        calling thread is restricted during timing. Threads it starts while
+        timing (e.g. an OpenMP runtime's, if it is first used while timing)
+        inherit this restriction, other existing threads of the process are
+        not affected.
+
+    :returns: a :class:`dict` mapping ``"wall"`` and the names of the clocks
+        reported by *run* to :class:`TimingResult` instances.
+    """
+    if min_samples < 1:
+        raise ValueError("min_samples must be positive")
+
+    def timed_run(nrounds):
+        start = perf_counter()
+        clock_times = run(nrounds)
+        elapsed = perf_counter() - start
+
+        if clock_times is None:
+            clock_times = {}
+
+        return {"wall": elapsed, **clock_times}
+
+    with _pinned_to_cpus(pin_cpus):
+        warmup_samples: dict[str, list[float]] = {}
+        for _i in range(warmup_rounds):
+            for clock, elapsed in timed_run(1).items():
+                warmup_samples.setdefault(clock, []).append(elapsed)
+
+        rounds_per_sample = 1
+        while True:
+            calibration = timed_run(rounds_per_sample)
+            if calibration["wall"] >= min_sample_time:
+                break
+            rounds_per_sample *= 2
+
+        samples: dict[str, list[float]] = {}
+        total_time = 0
+        while (len(samples.get("wall", ())) < max_samples
+                and (len(samples.get("wall", ())) < min_samples
+                    or total_time < min_time)):
+            sample = timed_run(rounds_per_sample)
+            total_time += sample["wall"]
+
+            for clock, elapsed in sample.items():
+                samples.setdefault(clock, []).append(elapsed/rounds_per_sample)
+
+    return {
+            clock: TimingResult(
+                samples=tuple(clock_samples),
+                warmup_samples=tuple(warmup_samples.get(clock, ())),
+                rounds_per_sample=rounds_per_sample,
+                confidence=confidence)
+            for clock, clock_samples in samples.items()}
+
+
+def _format_timing(timing: TimingResult | None) -> str:
+    if timing is None:
+        return "<unavailable>"
+
+    ci_low, ci_high = timing.median_ci
+    return "{:g} s (IQR {:g} s, {:g}% CI [{:g}, {:g}] s)".format(
+            timing.median, timing.iqr, 100*timing.confidence, ci_low, ci_high)
+
+# }}}
+
+
+# {{{ kernel runners
+
+def _is_executable_c(t_unit: TranslationUnit) -> bool:
+    from loopy.target.c import ExecutableCTarget
+    return isinstance(t_unit.target, ExecutableCTarget)
+
+
+def _make_pyopencl_runner(
+        t_unit: TranslationUnit, entrypoint: str,
+        queue: cl.CommandQueue, args: Mapping[str, Any]
+        ) -> Callable[[int], Mapping[str, float]]:
+    import pyopencl as cl
+
+    executor = t_unit.executor(queue.context, entrypoint=entrypoint)
+
+    def run(nrounds):
+        evt_start = cl.enqueue_marker(queue)
+
+        events = []
+        for _i in range(nrounds):
+            if not AUTO_TEST_SKIP_RUN:
+                evt, _ = executor(queue, **args)
+                events.append(evt)
+            else:
+                events.append(cl.enqueue_marker(queue))
+
+        evt_end = cl.enqueue_marker(queue)
+
+        queue.finish()
+
+        result = {"event": 1e-9*(events[-1].profile.END
+                - events[0].profile.START)}
+
+        try:
+            result["event_marker"] = 1e-9*(evt_end.profile.START
+                    - evt_start.profile.START)
+        except cl.RuntimeError:
+            pass
+
+        return result
+
+    return run
+
+
+def _make_c_runner(
+        t_unit: TranslationUnit, entrypoint: str, args: Mapping[str, Any]
+        ) -> Callable[[int], None]:
+    executor = t_unit.executor(entrypoint=entrypoint)
+
+    def run(nrounds):
+        if AUTO_TEST_SKIP_RUN:
+            return
+
+        for _i in range(nrounds):
+            executor(**args)
+
+    return run
+
+# }}}
+
+
 # {{{ main automatic testing entrypoint
 
 def auto_test_vs_ref(
@@ -392,20 +799,38 @@ def auto_test_vs_ref(
         fills_entire_output=None, do_check=True, check_result=None,
         max_test_kernel_count=1,
         quiet=False, blacklist_ref_vendors=(), ref_entrypoint=None,
-        test_entrypoint=None):
+        test_entrypoint=None,
+        min_samples=10, max_samples=1000, min_timing_time=0.3,
+        confidence=0.95, pin_cpus=None):
     """Compare results of `ref_knl` to the kernels generated by
     scheduling *test_knl*.
 
+    If *test_prog* targets a :class:`~loopy.ExecutableCTarget`, the reference
+    and the test kernel are both run through the C executor on host
+    memory, and *ctx* is ignored (and may be *None*). Otherwise, both are
+    run through :mod:`pyopencl`, the reference on a CPU device if available,
+    the test kernel in *ctx*.
+
     :arg check_result: a callable with :class:`numpy.ndarray` arguments
         *(result, reference_result)* returning a a tuple (class:`bool`,
         message) indicating correctness/acceptability of the result
     :arg max_test_kernel_count: Stop testing after this many *test_knl*
+    :arg min_samples: see :func:`loopy.auto_test.benchmark`.
+    :arg max_samples: see :func:`loopy.auto_test.benchmark`.
+    :arg min_timing_time: see *min_time* in :func:`loopy.auto_test.benchmark`.
+    :arg confidence: see :func:`loopy.auto_test.benchmark`.
+    :arg pin_cpus: see :func:`loopy.auto_test.benchmark`.
+
+    :returns: a :class:`dict` of JSON-serializable data describing the
+        timing run. The entries ``elapsed_wall``, ``elapsed_event`` and
+        ``elapsed_event_marker`` hold the median time per invocation by the
+        respective clock (the latter two only for OpenCL, else *None*).
+        ``timing`` maps clock names to the output of
+        :meth:`loopy.auto_test.TimingResult.as_dict`.
     """
     if parameters is None:
         parameters = {}
 
-    import pyopencl as cl
-
     if test_prog is None:
         test_prog = ref_prog
         do_check = False
@@ -420,6 +845,17 @@ def auto_test_vs_ref(
             raise LoopyError("Unable to guess entrypoint for ref_prog.")
         test_entrypoint = next(iter(test_prog.entrypoints))
 
+    on_host = _is_executable_c(test_prog)
+
+    if on_host and not _is_executable_c(ref_prog):
+        from loopy.kernel import KernelState
+        if ref_prog.state > KernelState.INITIAL:
+            raise LoopyError("test_prog targets the C executor, so ref_prog "
+                    "must as well")
+
+        # keep the compiler and code generation settings of the test target
+        ref_prog = ref_prog.copy(target=test_prog.target)
+
     ref_prog = lp.preprocess_kernel(ref_prog)
     test_prog = lp.preprocess_kernel(test_prog)
 
@@ -446,8 +882,6 @@ def auto_test_vs_ref(
         warn("op_label should be a list", stacklevel=2)
         op_label = [op_label]
 
-    from time import time
-
     if check_result is None:
         check_result = _default_check_result
 
@@ -459,25 +893,12 @@ def auto_test_vs_ref(
     from loopy.type_inference import infer_unknown_types
     ref_prog = infer_unknown_types(ref_prog, expect_completion=True)
 
-    found_ref_device = False
+    ref_elapsed_event = None
 
-    ref_errors = []
-
-    from loopy.kernel.data import ImageArg
-    need_ref_image_support = any(isinstance(arg, ImageArg)
-                                 for arg in ref_prog[ref_entrypoint].args)
-
-    for dev in _enumerate_cl_devices_for_ref_test(
-            blacklist_ref_vendors, need_ref_image_support):
-
-        ref_ctx = cl.Context([dev])
-        ref_queue = cl.CommandQueue(ref_ctx,
-                properties=cl.command_queue_properties.PROFILING_ENABLE)
+    if on_host:
+        ref_queue = None
         ref_codegen_result = lp.generate_code_v2(ref_prog)
 
-        logger.info("{} (ref): trying {} for the reference calculation".format(
-            ref_entrypoint, dev))
-
         if not quiet and print_ref_code:
             print(75*"-")
             print("Reference Code:")
@@ -486,66 +907,117 @@ def auto_test_vs_ref(
                 ref_codegen_result.device_code()))
             print(75*"-")
 
-        try:
-            ref_args, ref_arg_data = \
-                    make_ref_args(ref_prog[ref_entrypoint], ref_queue, parameters)
-            ref_args["out_host"] = False
-        except cl.RuntimeError as e:
-            if e.code == cl.status_code.IMAGE_FORMAT_NOT_SUPPORTED:
-                import traceback
-                ref_errors.append("\n".join([
-                    75*"-",
-                    "On %s:" % dev,
-                    75*"-",
-                    traceback.format_exc(),
-                    75*"-"]))
+        ref_args, ref_arg_data = \
+                make_ref_args(ref_prog[ref_entrypoint], None, parameters)
 
-                continue
-            else:
-                raise
+        if do_check:
+            logger.info("%s (ref): run" % ref_entrypoint)
 
-        found_ref_device = True
+            ref_start = perf_counter()
 
-        if not do_check:
-            break
+            if not AUTO_TEST_SKIP_RUN:
+                ref_prog.executor(entrypoint=ref_entrypoint)(**ref_args)
 
-        ref_queue.finish()
+            ref_elapsed_wall = perf_counter()-ref_start
 
-        logger.info("{} (ref): using {} for the reference calculation".format(
-            ref_entrypoint, dev))
-        logger.info("%s (ref): run" % ref_entrypoint)
+            logger.info("%s (ref): run done" % ref_entrypoint)
 
-        ref_start = time()
+    else:
+        import pyopencl as cl
 
-        if not AUTO_TEST_SKIP_RUN:
-            ref_evt, _ = ref_prog(ref_queue, **ref_args)
-        else:
-            ref_evt = cl.enqueue_marker(ref_queue)
+        found_ref_device = False
+
+        ref_errors = []
+
+        from loopy.kernel.data import ImageArg
+        need_ref_image_support = any(isinstance(arg, ImageArg)
+                                     for arg in ref_prog[ref_entrypoint].args)
+
+        for dev in _enumerate_cl_devices_for_ref_test(
+                blacklist_ref_vendors, need_ref_image_support):
+
+            ref_ctx = cl.Context([dev])
+            ref_queue = cl.CommandQueue(ref_ctx,
+                    properties=cl.command_queue_properties.PROFILING_ENABLE)
+            ref_codegen_result = lp.generate_code_v2(ref_prog)
+
+            logger.info("{} (ref): trying {} for the reference calculation".format(
+                ref_entrypoint, dev))
+
+            if not quiet and print_ref_code:
+                print(75*"-")
+                print("Reference Code:")
+                print(75*"-")
+                print(get_highlighted_code(
+                    ref_codegen_result.device_code()))
+                print(75*"-")
+
+            try:
+                ref_args, ref_arg_data = \
+                        make_ref_args(ref_prog[ref_entrypoint], ref_queue,
+                                parameters)
+                ref_args["out_host"] = False
+            except cl.RuntimeError as e:
+                if e.code == cl.status_code.IMAGE_FORMAT_NOT_SUPPORTED:
+                    import traceback
+                    ref_errors.append("\n".join([
+                        75*"-",
+                        "On %s:" % dev,
+                        75*"-",
+                        traceback.format_exc(),
+                        75*"-"]))
+
+                    continue
+                else:
+                    raise
+
+            found_ref_device = True
+
+            if not do_check:
+                break
+
+            ref_queue.finish()
 
-        ref_queue.finish()
-        ref_stop = time()
-        ref_elapsed_wall = ref_stop-ref_start
+            logger.info("{} (ref): using {} for the reference calculation".format(
+                ref_entrypoint, dev))
+            logger.info("%s (ref): run" % ref_entrypoint)
 
-        logger.info("%s (ref): run done" % ref_entrypoint)
+            ref_start = perf_counter()
 
-        ref_evt.wait()
-        ref_elapsed_event = 1e-9*(ref_evt.profile.END-ref_evt.profile.START)
+            if not AUTO_TEST_SKIP_RUN:
+                ref_evt, _ = ref_prog.executor(
+                        ref_ctx, entrypoint=ref_entrypoint)(ref_queue, **ref_args)
+            else:
+                ref_evt = cl.enqueue_marker(ref_queue)
+
+            ref_queue.finish()
+            ref_stop = perf_counter()
+            ref_elapsed_wall = ref_stop-ref_start
 
-        break
+            logger.info("%s (ref): run done" % ref_entrypoint)
+
+            ref_evt.wait()
+            ref_elapsed_event = 1e-9*(ref_evt.profile.END-ref_evt.profile.START)
+
+            break
 
-    if not found_ref_device:
-        raise LoopyError("could not find a suitable device for the "
-                "reference computation.\n"
-                "These errors were encountered:\n"+"\n".join(ref_errors))
+        if not found_ref_device:
+            raise LoopyError("could not find a suitable device for the "
+                    "reference computation.\n"
+                    "These errors were encountered:\n"+"\n".join(ref_errors))
+
+    ref_backend = _get_array_backend(ref_queue)
 
     # }}}
 
     # {{{ compile and run parallel code
 
-    need_check = do_check
-
-    queue = cl.CommandQueue(ctx,
-            properties=cl.command_queue_properties.PROFILING_ENABLE)
+    if on_host:
+        queue = None
+    else:
+        import pyopencl as cl
+        queue = cl.CommandQueue(ctx,
+                properties=cl.command_queue_properties.PROFILING_ENABLE)
 
     from loopy.kernel import KernelState
     from loopy.target.pyopencl import PyOpenCLTarget
@@ -564,7 +1036,14 @@ def auto_test_vs_ref(
 
     args = make_args(test_prog[test_entrypoint],
             queue, ref_arg_data, parameters)
-    args["out_host"] = False
+
+    if on_host:
+        run = _make_c_runner(test_prog, test_entrypoint, args)
+    else:
+        args["out_host"] = False
+        run = _make_pyopencl_runner(test_prog, test_entrypoint, queue, args)
+
+    test_backend = _get_array_backend(queue)
 
     if not quiet:
         print(75*"-")
@@ -579,141 +1058,110 @@ def auto_test_vs_ref(
             print(test_prog_codegen_result.cl_program.binaries[0])
             print(75*"-")
 
-    logger.info("%s: run warmup" % (test_entrypoint))
-
-    for _i in range(warmup_rounds):
-        if not AUTO_TEST_SKIP_RUN:
-            test_prog(queue, **args)
-
-        if need_check and not AUTO_TEST_SKIP_RUN:
-            for arg_desc in ref_arg_data:
-                if arg_desc is None:
-                    continue
-                if not arg_desc.needs_checking:
-                    continue
+    if do_check and not AUTO_TEST_SKIP_RUN:
+        logger.info("%s: run for checking" % (test_entrypoint))
 
-                from pyopencl.compyte.array import as_strided
-                ref_ary = as_strided(
-                        arg_desc.ref_storage_array.get(),
-                        shape=arg_desc.ref_shape,
-                        strides=arg_desc.ref_numpy_strides).flatten()
-                test_ary = as_strided(
-                        arg_desc.test_storage_array.get(),
-                        shape=arg_desc.test_shape,
-                        strides=arg_desc.test_numpy_strides).flatten()
-                common_len = min(len(ref_ary), len(test_ary))
-                ref_ary = ref_ary[:common_len]
-                test_ary = test_ary[:common_len]
+        run(1)
 
-                error_is_small, error = check_result(test_ary, ref_ary)
-                if not error_is_small:
-                    raise AutomaticTestFailure(error)
-
-                need_check = False
-
-    events = []
-    queue.finish()
+        for arg_desc in ref_arg_data:
+            if arg_desc is None:
+                continue
+            if not arg_desc.needs_checking:
+                continue
 
-    logger.info("%s: warmup done" % (test_entrypoint))
+            from numpy.lib.stride_tricks import as_strided
+            ref_ary = as_strided(
+                    ref_backend.get(arg_desc.ref_storage_array),
+                    shape=arg_desc.ref_shape,
+                    strides=arg_desc.ref_numpy_strides).flatten()
+            test_ary = as_strided(
+                    test_backend.get(arg_desc.test_storage_array),
+                    shape=arg_desc.test_shape,
+                    strides=arg_desc.test_numpy_strides).flatten()
+            common_len = min(len(ref_ary), len(test_ary))
+            ref_ary = ref_ary[:common_len]
+            test_ary = test_ary[:common_len]
+
+            error_is_small, error = check_result(test_ary, ref_ary)
+            if not error_is_small:
+                raise AutomaticTestFailure(error)
 
     logger.info("%s: timing run" % (test_entrypoint))
 
-    timing_rounds = max(warmup_rounds, 1)
-
-    while True:
-        from time import time
-        start_time = time()
+    timings = benchmark(run,
+            warmup_rounds=warmup_rounds,
+            min_samples=min_samples,
+            max_samples=max_samples,
+            min_time=min_timing_time,
+            confidence=confidence,
+            pin_cpus=pin_cpus)
 
-        evt_start = cl.enqueue_marker(queue)
-
-        for _i in range(timing_rounds):
-            if not AUTO_TEST_SKIP_RUN:
-                evt, _ = test_prog(queue, **args)
-                events.append(evt)
-            else:
-                events.append(cl.enqueue_marker(queue))
-
-        evt_end = cl.enqueue_marker(queue)
-
-        queue.finish()
-        stop_time = time()
+    logger.info("%s: timing run done" % (test_entrypoint))
 
-        for evt in events:
-            evt.wait()
-        evt_start.wait()
-        evt_end.wait()
+    elapsed_wall = timings["wall"].median
 
-        elapsed_event = (1e-9*events[-1].profile.END
-                - 1e-9*events[0].profile.START) \
-                / timing_rounds
+    def median_or_none(clock):
         try:
-            elapsed_event_marker = ((1e-9*evt_end.profile.START
-                        - 1e-9*evt_start.profile.START)
-                    / timing_rounds)
-        except cl.RuntimeError:
-            elapsed_event_marker = None
-
-        elapsed_wall = (stop_time-start_time)/timing_rounds
-
-        if elapsed_wall * timing_rounds < 0.3:
-            timing_rounds *= 4
-        else:
-            break
+            return timings[clock].median
+        except KeyError:
+            return None
 
-    logger.info("%s: timing run done" % (test_entrypoint))
+    elapsed_event = median_or_none("event")
+    elapsed_event_marker = median_or_none("event_marker")
+    timing_rounds = timings["wall"].rounds_per_sample
 
-    rates = ""
-    for cnt, lbl in zip(op_count, op_label):
-        rates += " {:g} {}/s".format(cnt/elapsed_wall, lbl)
+    rates = {lbl: cnt/elapsed_wall for cnt, lbl in zip(op_count, op_label)}
 
     if not quiet:
-        def format_float_or_none(v):
-            if v is None:
-                return "<unavailable>"
-            else:
-                return "%g" % v
+        rates_str = "".join(
+                " {:g} {}/s".format(rate, lbl) for lbl, rate in rates.items())
 
-        print("elapsed: %s s event, %s s marker-event %s s wall "
-                "(%d rounds)%s" % (
-                    format_float_or_none(elapsed_event),
-                    format_float_or_none(elapsed_event_marker),
-                    format_float_or_none(elapsed_wall), timing_rounds, rates))
+        for clock, timing in timings.items():
+            print("elapsed ({}): {}".format(clock, _format_timing(timing)))
+        print("(%d samples of %d rounds)%s" % (
+                len(timings["wall"].samples), timing_rounds, rates_str))
 
     if do_check:
-        ref_rates = ""
-        for cnt, lbl in zip(op_count, op_label):
-            rates += " {:g} {}/s".format(cnt/elapsed_wall, lbl)
+        ref_elapsed = (ref_elapsed_event
+                if ref_elapsed_event is not None else ref_elapsed_wall)
+        ref_rates = {lbl: cnt/ref_elapsed for cnt, lbl in zip(op_count, op_label)}
 
         if not quiet:
-            print("elapsed: %s s event, %s s marker-event %s s wall "
-                    "(%d rounds)%s" % (
-                        format_float_or_none(elapsed_event),
-                        format_float_or_none(elapsed_event_marker),
-                        format_float_or_none(elapsed_wall), timing_rounds, rates))
-
-        if do_check:
-            ref_rates = ""
-            for cnt, lbl in zip(op_count, op_label):
-                ref_rates += " {:g} {}/s".format(cnt/ref_elapsed_event, lbl)
-            if not quiet:
-                print("ref: elapsed: {:g} s event, {:g} s wall{}".format(
-                        ref_elapsed_event, ref_elapsed_wall, ref_rates))
+            def format_float_or_none(v):
+                if v is None:
+                    return "<unavailable>"
+                else:
+                    return "%g" % v
+
+            print("ref: elapsed: {} s event, {} s wall{}".format(
+                    format_float_or_none(ref_elapsed_event),
+                    format_float_or_none(ref_elapsed_wall),
+                    "".join(" {:g} {}/s".format(rate, lbl)
+                        for lbl, rate in ref_rates.items())))
 
     # }}}
 
     result_dict = {}
+    result_dict["entrypoint"] = test_entrypoint
+    result_dict["target"] = type(test_prog.target).__name__
+    result_dict["parameters"] = {
+            name: value.item() if isinstance(value, np.generic) else value
+            for name, value in parameters.items()}
     result_dict["elapsed_event"] = elapsed_event
     result_dict["elapsed_event_marker"] = elapsed_event_marker
     result_dict["elapsed_wall"] = elapsed_wall
     result_dict["timing_rounds"] = timing_rounds
+    result_dict["timing"] = {
+            clock: timing.as_dict() for clock, timing in timings.items()}
+    result_dict["rates"] = rates
 
     if do_check:
         result_dict["ref_elapsed_event"] = ref_elapsed_event
         result_dict["ref_elapsed_wall"] = ref_elapsed_wall
+        result_dict["ref_rates"] = ref_rates
 
     return result_dict
 
-
 # }}}
 
 # vim: foldmethod=marker
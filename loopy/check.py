@@ -24,7 +24,6 @@ THE SOFTWARE.
 """
 
 import logging
-from collections import defaultdict
 from functools import reduce
 from typing import TYPE_CHECKING
 
@@ -875,12 +874,17 @@ class _AccessCheckMapper(WalkMapper):
 
 
 def _check_bounds_inner(kernel: LoopKernel, callables_table: CallablesTable) -> None:
-    from loopy.kernel.instruction import get_insn_domain
+    from loopy.kernel.instruction import PrefetchInstruction, get_insn_domain
 
     temp_var_names = set(kernel.temporary_variables)
     acm = _AccessCheckMapper(kernel, callables_table)
     kernel_assumptions_is_universe = kernel.assumptions.is_universe()
     for insn in kernel.instructions:
+        if isinstance(insn, PrefetchInstruction):
+            # prefetching past the end of an array is harmless (and
+            # unavoidable near the end of a loop)
+            continue
+
         domain = get_insn_domain(insn, kernel)
 
         # data-dependent bounds? can't do much
@@ -1107,85 +1111,17 @@ def _check_variable_access_ordered_inner(kernel: LoopKernel) -> None:
 
     # }}}
 
-    # {{{ compute rev_depends, depends_on
-
-    # depends_on: mapping from insn_ids to their dependencies
-    depends_on: dict[str, set[str]] = {
-        not_none(insn.id): set() for insn in kernel.instructions}
-    # rev_depends: mapping from insn_ids to their reverse deps.
-    rev_depends: dict[str, set[str]] = {
-        not_none(insn.id): set() for insn in kernel.instructions}
-
-    for insn in kernel.instructions:
-        depends_on[not_none(insn.id)].update(insn.depends_on)
-        for dep in insn.depends_on:
-            rev_depends[dep].add(not_none(insn.id))
-
-    # }}}
-
     # {{{ remove pairs from dep_reqs_to_vars for which dependencies exist
 
-    topological_order = _get_topological_order(kernel)
-
-    # TODO: Type this
-    def satisfy_dep_reqs_in_order(dep_reqs_to_vars, edges, order) -> None:
-        """
-        Considering a graph defined by *edges* (as ``key -> value``),
-        remove pairs of nodes from *dep_reqs_to_vars* for which edges
-        exist in the graph. In doing so, make use of the topological
-        order *order* (given as a sequence of *nodes*). For ``i<j``,
-        no direct or indirect edges from ``order[j]`` to ``order[i]``
-        exist. (All edges go from 'low index' to 'high index'.)
-        """
-
-        insn_to_req_deps = defaultdict(set)
-        insn_to_order = {insn: i for i, insn in enumerate(order)}
-
-        # Use dep_reqs_to_vars to construct insn_to_req_deps, listing
-        # path endpoints pred -> ... -> insn to be considered for elimination.
-        for insn, pred in dep_reqs_to_vars:
-            if insn_to_order[pred] > insn_to_order[insn]:
-                # If *pred* happens after *insn*, then there is no path
-                # *pred* -> ... -> *insn*.
-                continue
+    # raises DependencyCycleFound if there is a cycle
+    _get_topological_order(kernel)
+
+    insn_index = kernel.get_instruction_index()
 
-            insn_to_req_deps[pred].add(insn)
-
-        for pred, check_successors in insn_to_req_deps.items():
-            # for each *pred*, we will calculate all the direct/indirect
-            # instructions that can be reached.
-            seen_successors = set()
-            # first let us start with direct successors
-            to_check = edges[pred].copy()
-            while to_check:
-                successor = to_check.pop()
-                seen_successors.add(successor)
-
-                # Next we check if this successor was in *dep_reqs_to_vars*
-                # and remove the pair from there if it is
-                if successor in check_successors:
-                    dep_reqs_to_vars.pop((successor, pred))
-                    check_successors.remove(successor)
-                    if not check_successors:
-                        break
-
-                # next we iterate through the successors of successor.
-                for edge in edges[successor]:
-                    if edge not in seen_successors:
-                        to_check.add(edge)
-
-    # forward dep. graph traversal in reverse topological sort order
-    # (proceeds "end of program" -> "beginning of program")
-    satisfy_dep_reqs_in_order(dep_reqs_to_vars, depends_on,
-            topological_order[::-1])
-
-    # Run the same thing on the reversed graph, with the reverse topological_order.
-    # All edges above are 'low index to high index'.
-    # Reversing graph and order maintains this property.
-
-    # reverse dep. graph traversal in topological sort order
-    # (proceeds "beginning of program" -> "end of program")
-    satisfy_dep_reqs_in_order(dep_reqs_to_vars, rev_depends, topological_order)
+    for writer_id, req_dep_id in list(dep_reqs_to_vars):
+        if (insn_index.depends_on_recursively(writer_id, req_dep_id)
+                or insn_index.depends_on_recursively(req_dep_id, writer_id)):
+            del dep_reqs_to_vars[writer_id, req_dep_id]
 
     # }}}
 
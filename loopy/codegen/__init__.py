@@ -24,10 +24,12 @@ THE SOFTWARE.
 """
 
 import logging
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
+    ClassVar,
     Mapping,
     Sequence,
 )
@@ -48,7 +50,7 @@ from pytools.persistent_dict import WriteOncePersistentDict
 from loopy.diagnostic import LoopyError, warn
 from loopy.kernel.function_interface import CallableKernel
 from loopy.symbolic import CombineMapper
-from loopy.tools import LoopyKeyBuilder, caches
+from loopy.tools import LazilyUnpicklingFieldsMixin, LoopyKeyBuilder, caches
 from loopy.version import DATA_MODEL_VERSION
 
 
@@ -148,6 +150,9 @@ class CodeGenerationState:
     .. autoattribute:: callables_table
     .. autoattribute:: is_entrypoint
     .. autoattribute:: codegen_cache_manager
+    .. autoattribute:: device_program_generator
+    .. autoattribute:: strength_reduced_inames
+    .. autoattribute:: strength_reduced_offsets
     """
 
     kernel: LoopKernel
@@ -181,6 +186,30 @@ class CodeGenerationState:
     codegen_cache_manager: CodegenOperationCacheManager
     vectorization_info: VectorizationInfo | None = None
 
+    device_program_generator: Callable[
+        [CodeGenerationState, int], CodeGenerationResult] | None = None
+    """
+    If not *None*, called with the device code generation state and the
+    schedule index of each :class:`~loopy.schedule.CallKernel` instead of
+    :func:`~loopy.codegen.result.generate_host_or_device_program`. Used by
+    :mod:`loopy.codegen.parallel` to generate device programs out of order.
+    """
+
+    strength_reduced_inames: frozenset[str] = frozenset()
+    """
+    The inames of the enclosing loops that carry offset variables, see
+    :attr:`loopy.Options.strength_reduce_indices`.
+    """
+
+    strength_reduced_offsets: immutables.Map[
+        tuple[tuple[str, Expression], ...], str] = field(
+                default_factory=immutables.Map)
+    """
+    A mapping from tuples of ``(iname, coefficient)`` pairs, sorted by iname,
+    to the name of the offset variable holding the sum of the products of
+    the coefficients and the inames.
+    """
+
     # {{{ copy helpers
 
     def copy(self, **kwargs: Any) -> CodeGenerationState:
@@ -341,21 +370,12 @@ class PreambleInfo:
 
 # {{{ main code generation entrypoint
 
-def generate_code_for_a_single_kernel(kernel, callables_table, target,
-        is_entrypoint):
+def make_initial_codegen_state(kernel, callables_table, target, is_entrypoint,
+        device_program_generator=None):
     """
-    :returns: a :class:`CodeGenerationResult`
-
-    :param kernel: An instance of :class:`loopy.LoopKernel`.
+    :returns: the :class:`CodeGenerationState` at the start of the host
+        program of *kernel*.
     """
-
-    from loopy.kernel import KernelState
-    if kernel.state != KernelState.LINEARIZED:
-        raise LoopyError("cannot generate code for a kernel that has not been "
-                "scheduled")
-
-    codegen_plog = ProcessLogger(logger, f"{kernel.name}: generate code")
-
     # {{{ examine arg list
 
     allow_complex = False
@@ -365,22 +385,16 @@ def generate_code_for_a_single_kernel(kernel, callables_table, target,
 
     # }}}
 
-    seen_dtypes = set()
-    seen_functions = set()
-    seen_atomic_dtypes = set()
-
-    initial_implemented_domain = isl.BasicSet.from_params(kernel.assumptions)
-
     from loopy.codegen.tools import CodegenOperationCacheManager
 
-    codegen_state = CodeGenerationState(
+    return CodeGenerationState(
             kernel=kernel,
             target=target,
-            implemented_domain=initial_implemented_domain,
+            implemented_domain=isl.BasicSet.from_params(kernel.assumptions),
             implemented_predicates=frozenset(),
-            seen_dtypes=seen_dtypes,
-            seen_functions=seen_functions,
-            seen_atomic_dtypes=seen_atomic_dtypes,
+            seen_dtypes=set(),
+            seen_functions=set(),
+            seen_atomic_dtypes=set(),
             var_subst_map=immutables.Map(),
             allow_complex=allow_complex,
             var_name_generator=kernel.get_var_name_generator(),
@@ -393,8 +407,35 @@ def generate_code_for_a_single_kernel(kernel, callables_table, target,
             callables_table=callables_table,
             is_entrypoint=is_entrypoint,
             codegen_cache_manager=CodegenOperationCacheManager.from_kernel(kernel),
+            device_program_generator=device_program_generator,
             )
 
+
+def generate_code_for_a_single_kernel(kernel, callables_table, target,
+        is_entrypoint, device_program_generator=None):
+    """
+    :returns: a :class:`CodeGenerationResult`
+
+    :param kernel: An instance of :class:`loopy.LoopKernel`.
+    :param device_program_generator: See
+        :attr:`CodeGenerationState.device_program_generator`.
+    """
+
+    from loopy.kernel import KernelState
+    if kernel.state != KernelState.LINEARIZED:
+        raise LoopyError("cannot generate code for a kernel that has not been "
+                "scheduled")
+
+    codegen_plog = ProcessLogger(logger, f"{kernel.name}: generate code")
+
+    codegen_state = make_initial_codegen_state(
+            kernel, callables_table, target, is_entrypoint,
+            device_program_generator=device_program_generator)
+
+    seen_dtypes = codegen_state.seen_dtypes
+    seen_functions = codegen_state.seen_functions
+    seen_atomic_dtypes = codegen_state.seen_atomic_dtypes
+
     from loopy.codegen.result import generate_host_or_device_program
 
     codegen_result = generate_host_or_device_program(
@@ -486,7 +527,7 @@ def diverge_callee_entrypoints(program):
 
 
 @dataclass(frozen=True)
-class TranslationUnitCodeGenerationResult:
+class TranslationUnitCodeGenerationResult(LazilyUnpicklingFieldsMixin):
     """
     .. attribute:: host_program
 
@@ -511,6 +552,22 @@ class TranslationUnitCodeGenerationResult:
     host_preambles: Sequence[tuple[int, str]] = ()
     device_preambles: Sequence[tuple[int, str]] = ()
 
+    # Results retrieved from the code generation cache are mostly used for
+    # their device code, which is pickled along with them. The programs
+    # are then only unpickled if needed otherwise.
+    _lazily_unpickled_fields: ClassVar[frozenset[str]] = frozenset({
+            "host_programs",
+            "device_programs",
+            })
+
+    def __getstate__(self):
+        format_version, attribs, lazy_attribs = self._get_fields_state()
+        attribs["_cached_device_code"] = self.device_code()
+        return format_version, attribs, lazy_attribs
+
+    def __setstate__(self, state):
+        self._set_fields_state(state)
+
     def host_code(self):
         from loopy.codegen.result import process_preambles
         preamble_codes = process_preambles(getattr(self, "host_preambles", []))
@@ -522,14 +579,22 @@ class TranslationUnitCodeGenerationResult:
                               for hp in self.host_programs.values()))
 
     def device_code(self):
+        try:
+            return self._cached_device_code
+        except AttributeError:
+            pass
+
         from loopy.codegen.result import process_preambles
         preamble_codes = process_preambles(getattr(self, "device_preambles", []))
 
-        return (
+        result = (
                 "".join(preamble_codes)
                 + "\n"
                 + "\n\n".join(str(dp.ast) for dp in self.device_programs))
 
+        object.__setattr__(self, "_cached_device_code", result)
+        return result
+
     def all_code(self):
         from loopy.codegen.result import process_preambles
         preamble_codes = process_preambles(
@@ -602,12 +667,28 @@ def generate_code_v2(t_unit: TranslationUnit) -> CodeGenerationResult:
 
     # {{{ collect host/device programs
 
-    for func_id in sorted(key for key, val in t_unit.callables_table.items()
-                          if isinstance(val, CallableKernel)):
-        cgr = generate_code_for_a_single_kernel(t_unit[func_id],
-                                                t_unit.callables_table,
-                                                t_unit.target,
-                                                func_id in t_unit.entrypoints)
+    kernel_ids = sorted(key for key, val in t_unit.callables_table.items()
+                        if isinstance(val, CallableKernel))
+
+    from loopy.codegen.parallel import (
+        get_codegen_nprocs,
+        pregenerate_device_programs,
+    )
+    nprocs = get_codegen_nprocs([t_unit[func_id] for func_id in kernel_ids])
+    device_program_generators = None
+    if nprocs > 1:
+        device_program_generators = pregenerate_device_programs(
+                t_unit, kernel_ids, nprocs)
+
+    for func_id in kernel_ids:
+        cgr = generate_code_for_a_single_kernel(
+                t_unit[func_id],
+                t_unit.callables_table,
+                t_unit.target,
+                func_id in t_unit.entrypoints,
+                device_program_generator=(
+                    None if device_program_generators is None
+                    else device_program_generators[func_id]))
         if func_id in t_unit.entrypoints:
             host_programs[func_id] = cgr.host_program
         else:
@@ -24,8 +24,11 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+from copy import deepcopy
 from functools import partial
 
+import immutables
+
 import islpy as isl
 
 from loopy.codegen.result import merge_codegen_results, wrap_in_if
@@ -52,15 +55,27 @@ def generate_code_for_sched_index(codegen_state, sched_index):
         _, past_end_i = gather_schedule_block(kernel.linearization, sched_index)
         assert past_end_i <= codegen_state.schedule_index_end
 
+        # Each device program gets its own copy of the name generator, so
+        # that the names in it do not depend on the code generated for the
+        # other subkernels. This allows generating them independently, see
+        # loopy.codegen.parallel.
         new_codegen_state = codegen_state.copy(
                 is_generating_device_code=True,
                 gen_program_name=sched_item.kernel_name,
                 schedule_index_end=past_end_i-1,
+                var_name_generator=deepcopy(codegen_state.var_name_generator),
+                # offset variables of host loops are not visible in device code
+                strength_reduced_inames=frozenset(),
+                strength_reduced_offsets=immutables.Map(),
                 )
 
-        from loopy.codegen.result import generate_host_or_device_program
-        codegen_result = generate_host_or_device_program(
-                new_codegen_state, sched_index)
+        if codegen_state.device_program_generator is not None:
+            codegen_result = codegen_state.device_program_generator(
+                    new_codegen_state, sched_index)
+        else:
+            from loopy.codegen.result import generate_host_or_device_program
+            codegen_result = generate_host_or_device_program(
+                    new_codegen_state, sched_index)
 
         if codegen_state.is_entrypoint:
             glob_grid, loc_grid = kernel.get_grid_sizes_for_insn_ids_as_exprs(
@@ -84,6 +99,7 @@ def generate_code_for_sched_index(codegen_state, sched_index):
             InameImplementationTag,
             InOrderSequentialSequentialTag,
             LoopedIlpTag,
+            ThreadParallelTag,
             UnrolledIlpTag,
             UnrollHintTag,
             UnrollTag,
@@ -96,6 +112,7 @@ def generate_code_for_sched_index(codegen_state, sched_index):
 
         from loopy.codegen.loop import (
             generate_sequential_loop_dim_code,
+            generate_thread_parallel_loop,
             generate_unroll_loop,
             generate_vectorize_loop,
         )
@@ -104,6 +121,8 @@ def generate_code_for_sched_index(codegen_state, sched_index):
             func = generate_unroll_loop
         elif filter_iname_tags_by_type(tags, VectorizeTag):
             func = generate_vectorize_loop
+        elif filter_iname_tags_by_type(tags, ThreadParallelTag):
+            func = generate_thread_parallel_loop
         elif filter_iname_tags_by_type(tags, UnrollHintTag):
             unroll_tags = filter_iname_tags_by_type(tags, UnrollHintTag)
             hints = [codegen_state.ast_builder.emit_unroll_hint(tag.value)
@@ -99,6 +99,7 @@ def generate_instruction_code(codegen_state, insn):
         CallInstruction,
         CInstruction,
         NoOpInstruction,
+        PrefetchInstruction,
     )
 
     if isinstance(insn, Assignment):
@@ -107,6 +108,8 @@ def generate_instruction_code(codegen_state, insn):
         ast = generate_call_code(codegen_state, insn)
     elif isinstance(insn, CInstruction):
         ast = generate_c_instruction_code(codegen_state, insn)
+    elif isinstance(insn, PrefetchInstruction):
+        ast = generate_prefetch_instruction_code(codegen_state, insn)
     elif isinstance(insn, NoOpInstruction):
         ast = generate_nop_instruction_code(codegen_state, insn)
     else:
@@ -310,4 +313,15 @@ def generate_nop_instruction_code(codegen_state, insn):
     return codegen_state.ast_builder.emit_noop_with_comment(
         "no-op (insn=%s)" % (insn.id))
 
+
+def generate_prefetch_instruction_code(codegen_state, insn):
+    if codegen_state.vectorization_info is not None:
+        raise UnvectorizableError("prefetches cannot be vectorized")
+
+    result = codegen_state.ast_builder.emit_prefetch(codegen_state, insn.address)
+    if result is None:
+        return generate_nop_instruction_code(codegen_state, insn)
+
+    return result
+
 # vim: foldmethod=marker
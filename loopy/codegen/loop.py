@@ -30,8 +30,8 @@ from pymbolic.mapper.stringifier import PREC_NONE
 
 from loopy.codegen.control import build_loop_nest
 from loopy.codegen.result import merge_codegen_results
-from loopy.diagnostic import LoopyError, warn
-from loopy.symbolic import flatten
+from loopy.diagnostic import ExpressionNotAffineError, LoopyError, warn
+from loopy.symbolic import CoefficientCollector, WalkMapper, flatten
 
 
 # {{{ conditional-reducing slab decomposition
@@ -167,6 +167,12 @@ def generate_unroll_loop(codegen_state, sched_index):
 def generate_vectorize_loop(codegen_state, sched_index):
     kernel = codegen_state.kernel
 
+    if codegen_state.ast_builder.can_implement_simd_loops:
+        # The loop body is generated as scalar code, the target's compiler
+        # takes care of the vectorization (including the remainder).
+        return generate_sequential_loop_dim_code(codegen_state, sched_index,
+                hints=[codegen_state.ast_builder.emit_simd_hint()])
+
     iname = kernel.linearization[sched_index].iname
 
     bounds = kernel.get_iname_bounds(iname, constants_only=True)
@@ -220,6 +226,58 @@ def generate_vectorize_loop(codegen_state, sched_index):
 # }}}
 
 
+# {{{ thread-parallel loops
+
+def _get_thread_private_temporary_names(kernel, sched_index):
+    """Return the names of the private temporaries that are written within
+    the loop entered at *sched_index* without being indexed by (an iname
+    depending on) its iname.
+    These are declared outside of the loop, but each thread needs its own
+    copy of them.
+    """
+    from loopy.kernel.data import AddressSpace
+    from loopy.schedule import get_insn_ids_for_block_at
+    from loopy.symbolic import get_dependencies
+
+    # Writes indexed by inames whose bounds depend on the loop's iname are
+    # distinct across threads, too.
+    thread_dependent_inames = {kernel.linearization[sched_index].iname}
+    for dom in kernel.domains:
+        if thread_dependent_inames & set(dom.get_var_names(dim_type.param)):
+            thread_dependent_inames.update(dom.get_var_names(dim_type.set))
+
+    result = set()
+    for insn_id in get_insn_ids_for_block_at(kernel.linearization, sched_index):
+        insn = kernel.id_to_insn[insn_id]
+        for assignee_name, assignee in zip(
+                insn.assignee_var_names(), insn.assignees):
+            tv = kernel.temporary_variables.get(assignee_name)
+            if (tv is None
+                    or tv.address_space != AddressSpace.PRIVATE
+                    or tv.base_storage is not None):
+                continue
+
+            if not thread_dependent_inames & get_dependencies(assignee):
+                result.add(assignee_name)
+
+    return sorted(result)
+
+
+def generate_thread_parallel_loop(codegen_state, sched_index):
+    astb = codegen_state.ast_builder
+    if not astb.can_implement_thread_parallel_loops:
+        raise LoopyError("target '%s' does not support thread-parallel loops"
+                % type(codegen_state.kernel.target).__name__)
+
+    private_names = _get_thread_private_temporary_names(
+            codegen_state.kernel, sched_index)
+
+    return generate_sequential_loop_dim_code(codegen_state, sched_index,
+            hints=[astb.emit_thread_parallel_loop_hint(private_names)])
+
+# }}}
+
+
 def intersect_kernel_with_slab(kernel, slab, iname):
     from loopy.kernel.tools import DomainChanger
 
@@ -349,6 +407,139 @@ def set_up_hw_parallel_loops(codegen_state, schedule_index, next_func,
 # }}}
 
 
+# {{{ strength reduction of index arithmetic
+
+class _IndexCoefficientCollector(CoefficientCollector):
+    """Like :class:`loopy.symbolic.CoefficientCollector`, but treats
+    subexpressions that do not depend on *target_names* as constants.
+    """
+
+    def _map_opaque(self, expr, *args, **kwargs):
+        from loopy.symbolic import get_dependencies
+        if get_dependencies(expr) & self.target_names:
+            raise ExpressionNotAffineError(
+                    f"'{expr}' is not affine in '{self.target_names}'")
+
+        return {1: expr}
+
+    handle_unsupported_expression = _map_opaque
+    map_algebraic_leaf = _map_opaque
+    map_subscript = _map_opaque
+    map_quotient = _map_opaque
+
+
+class _SubscriptCollector(WalkMapper):
+    def __init__(self):
+        super().__init__()
+        self.subscripts = set()
+
+    def map_subscript(self, expr, *args):
+        self.subscripts.add(expr)
+        super().map_subscript(expr, *args)
+
+
+def split_strength_reduced_index(index, inames):
+    """Split the flattened array index *index* into the part that is linear
+    in *inames* and a remainder.
+
+    :returns: a tuple ``(terms, remainder)``, where *terms* is a tuple of
+        ``(iname, coefficient)`` pairs sorted by iname, or *None* if *index*
+        is not affine in *inames* or does not depend on them.
+    """
+    if not inames:
+        return None
+
+    try:
+        coeffs = _IndexCoefficientCollector(inames)(index)
+    except (ExpressionNotAffineError, RuntimeError):
+        return None
+
+    from pymbolic.primitives import is_zero
+    terms = tuple(sorted(
+            ((v.name, coeff) for v, coeff in coeffs.items()
+                if v != 1 and not is_zero(coeff)),
+            key=lambda term: term[0]))
+
+    if not terms or len({iname for iname, _ in terms}) != len(terms):
+        return None
+
+    return terms, coeffs.get(1, 0)
+
+
+def _get_offset_terms_for_loop(codegen_state, sched_index, inames):
+    """Return the set of offset variable keys (see
+    :attr:`loopy.codegen.CodeGenerationState.strength_reduced_offsets`)
+    needed by the array accesses in the loop entered at *sched_index*.
+    """
+    kernel = codegen_state.kernel
+    loop_iname = kernel.linearization[sched_index].iname
+
+    from pymbolic import evaluate
+    from pymbolic.primitives import Variable
+
+    from loopy.kernel.array import (
+        SeparateArrayArrayDimTag,
+        VectorArrayDimTag,
+        get_access_info,
+    )
+    from loopy.kernel.data import ArrayArg, ConstantArg, TemporaryVariable
+    from loopy.kernel.instruction import MultiAssignmentBase
+    from loopy.schedule import (
+        CallKernel,
+        ReturnFromKernel,
+        RunInstruction,
+        gather_schedule_block,
+    )
+    from loopy.symbolic import simplify_using_aff
+
+    block, _ = gather_schedule_block(kernel.linearization, sched_index)
+
+    collector = _SubscriptCollector()
+    in_kernel = False
+    for sched_item in block:
+        if isinstance(sched_item, CallKernel):
+            in_kernel = True
+        elif isinstance(sched_item, ReturnFromKernel):
+            in_kernel = False
+        elif isinstance(sched_item, RunInstruction) and not in_kernel:
+            insn = kernel.id_to_insn[sched_item.insn_id]
+            if isinstance(insn, MultiAssignmentBase):
+                for expr in [insn.expression, *insn.assignees]:
+                    collector(expr)
+
+    result = set()
+    for subscript in collector.subscripts:
+        if not isinstance(subscript.aggregate, Variable):
+            continue
+
+        name = subscript.aggregate.name
+        ary = kernel.arg_dict.get(name, kernel.temporary_variables.get(name))
+        if (not isinstance(ary, (ArrayArg, ConstantArg, TemporaryVariable))
+                or ary.dim_tags is None
+                or any(
+                    isinstance(dim_tag,
+                        (SeparateArrayArrayDimTag, VectorArrayDimTag))
+                    for dim_tag in ary.dim_tags)):
+            continue
+
+        access_info = get_access_info(kernel, ary,
+                tuple(simplify_using_aff(kernel, idx)
+                    for idx in subscript.index_tuple),
+                lambda expr: evaluate(expr, codegen_state.var_subst_map),
+                None)
+
+        if len(access_info.subscripts) != 1:
+            continue
+
+        split = split_strength_reduced_index(access_info.subscripts[0], inames)
+        if split is not None and loop_iname in dict(split[0]):
+            result.add(split[0])
+
+    return result
+
+# }}}
+
+
 # {{{ sequential loop
 
 def generate_sequential_loop_dim_code(codegen_state, sched_index, hints):
@@ -367,6 +558,24 @@ def generate_sequential_loop_dim_code(codegen_state, sched_index, hints):
 
     domain = kernel.get_inames_domain(loop_iname)
 
+    astb = codegen_state.ast_builder
+
+    from loopy.kernel.data import ThreadParallelTag, VectorizeTag
+
+    if (kernel.options.strength_reduce_indices
+            and astb.can_implement_offset_increments
+            and codegen_state.vectorization_info is None
+            # simd and thread-parallel loops must be in canonical form
+            and not kernel.iname_tags_of_type(
+                loop_iname, (VectorizeTag, ThreadParallelTag))):
+        sr_inames = codegen_state.strength_reduced_inames | {loop_iname}
+        offset_terms = sorted(
+                _get_offset_terms_for_loop(codegen_state, sched_index, sr_inames),
+                key=str)
+    else:
+        sr_inames = codegen_state.strength_reduced_inames
+        offset_terms = []
+
     result = []
 
     for slab_name, slab in slabs:
@@ -445,6 +654,56 @@ def generate_sequential_loop_dim_code(codegen_state, sched_index, hints):
                 .copy(kernel=intersect_kernel_with_slab(
                     kernel, slab, loop_iname)))
 
+        from loopy.isl_helpers import simplify_pw_aff
+        from loopy.symbolic import pw_aff_to_expr
+
+        is_single_trip = impl_ubound.is_equal(impl_lbound)
+        loop_lbound = pw_aff_to_expr(simplify_pw_aff(lbound, kernel.assumptions))
+
+        # {{{ set up offset variables
+
+        offset_inits = []
+        offset_increments = []
+
+        if offset_terms and not is_single_trip:
+            from pymbolic import var
+
+            from loopy.kernel.data import TemporaryVariable
+
+            new_offsets = {}
+            for terms in offset_terms:
+                name = codegen_state.var_name_generator(f"{loop_iname}_offset")
+                coeff = dict(terms)[loop_iname]
+                outer_terms = tuple(
+                        (iname, c) for iname, c in terms if iname != loop_iname)
+
+                outer_name = codegen_state.strength_reduced_offsets.get(
+                        outer_terms)
+                if outer_name is not None:
+                    outer_offset = var(outer_name)
+                else:
+                    outer_offset = sum(c*var(iname) for iname, c in outer_terms)
+
+                init_ecm = ecm.with_assignments({
+                    oname: TemporaryVariable(oname, kernel.index_dtype, shape=())
+                    for oname in codegen_state.strength_reduced_offsets.values()})
+                offset_inits.append(astb.emit_initializer(
+                        codegen_state, kernel.index_dtype, name,
+                        init_ecm(
+                            flatten(outer_offset + coeff*loop_lbound),
+                            PREC_NONE, "i"),
+                        is_const=False))
+                offset_increments.append((name, coeff))
+                new_offsets[terms] = name
+
+            new_codegen_state = new_codegen_state.copy(
+                    strength_reduced_inames=sr_inames,
+                    strength_reduced_offsets=(
+                        codegen_state.strength_reduced_offsets
+                        .update(new_offsets)))
+
+        # }}}
+
         inner = build_loop_nest(new_codegen_state, sched_index+1)
 
         # }}}
@@ -452,11 +711,7 @@ def generate_sequential_loop_dim_code(codegen_state, sched_index, hints):
         if cmt is not None:
             result.append(codegen_state.ast_builder.emit_comment(cmt))
 
-        astb = codegen_state.ast_builder
-
-        from loopy.symbolic import pw_aff_to_expr
-
-        if impl_ubound.is_equal(impl_lbound):
+        if is_single_trip:
             # single-trip, generate just a variable assignment, not a loop
             inner = merge_codegen_results(codegen_state, [
                 astb.emit_initializer(
@@ -476,16 +731,26 @@ def generate_sequential_loop_dim_code(codegen_state, sched_index, hints):
         else:
             inner_ast = inner.current_ast(codegen_state)
 
-            from loopy.isl_helpers import simplify_pw_aff
+            extra_loop_kwargs = {}
+            if offset_increments:
+                extra_loop_kwargs["offset_increments"] = offset_increments
 
-            result.append(
-                inner.with_new_ast(
+            loop = inner.with_new_ast(
                     codegen_state,
                     astb.emit_sequential_loop(
                         codegen_state, loop_iname, kernel.index_dtype,
-                        pw_aff_to_expr(simplify_pw_aff(lbound, kernel.assumptions)),
+                        loop_lbound,
                         pw_aff_to_expr(simplify_pw_aff(ubound, kernel.assumptions)),
-                        inner_ast, hints)))
+                        inner_ast, hints, **extra_loop_kwargs))
+
+            if offset_inits:
+                loop = merge_codegen_results(codegen_state, [*offset_inits, loop])
+                loop = loop.with_new_ast(
+                        codegen_state,
+                        astb.ast_block_scope_class(
+                            loop.current_ast(codegen_state)))
+
+            result.append(loop)
 
     return merge_codegen_results(codegen_state, result)
 
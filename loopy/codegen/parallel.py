@@ -0,0 +1,279 @@
+"""Concurrent generation of device programs."""
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+from pytools import ProcessLogger
+
+
+if TYPE_CHECKING:
+    from loopy.codegen import CodeGenerationState, SeenFunction
+    from loopy.codegen.result import CodeGenerationResult
+    from loopy.codegen.tools import CodegenOperationCacheManager
+    from loopy.kernel import LoopKernel
+    from loopy.translation_unit import CallablesTable, TranslationUnit
+    from loopy.types import LoopyType
+
+
+logger = logging.getLogger(__name__)
+
+
+__doc__ = """
+Generating the device program of a :class:`~loopy.schedule.CallKernel`
+depends only on the code generation state in effect on the host at that
+point of the linearization, and each device program gets its own variable
+name generator. Device code generation for all subkernels of all kernels in
+a translation unit can thus happen concurrently, once those states are
+known:
+
+#. The host side of each kernel is traversed once, recording the state at
+   each :class:`~loopy.schedule.CallKernel` (see
+   :class:`DeviceCodegenStateRecorder`). This is cheap.
+#. The device programs are generated in a pool of worker processes.
+#. Code generation proceeds as usual, except that the
+   :attr:`~loopy.codegen.CodeGenerationState.device_program_generator` hands
+   out the device programs from the pool (see :class:`PregeneratedDevicePrograms`),
+   which are merged into the host program by
+   :func:`~loopy.codegen.result.merge_codegen_results` in linearization order.
+
+As a result, the generated code does not depend on the number of processes
+or the order in which the workers finish.
+
+This is enabled by :attr:`loopy.Options.codegen_nprocs`.
+
+.. autofunction:: get_codegen_nprocs
+.. autofunction:: pregenerate_device_programs
+
+.. autoclass:: DeviceCodegenStateRecorder
+.. autoclass:: PregeneratedDevicePrograms
+"""
+
+
+# {{{ option processing
+
+def get_codegen_nprocs(kernels: Sequence[LoopKernel]) -> int:
+    """
+    :returns: the number of worker processes requested via
+        :attr:`loopy.Options.codegen_nprocs` by any of *kernels*.
+    """
+    result = 0
+    for knl in kernels:
+        nprocs = knl.options.codegen_nprocs
+        if nprocs is True or nprocs < 0:
+            nprocs = os.cpu_count() or 1
+
+        result = max(result, nprocs)
+
+    return result
+
+# }}}
+
+
+# {{{ host-side state recording
+
+@dataclass(frozen=True)
+class _DeviceProgramResult:
+    codegen_result: CodeGenerationResult
+    seen_dtypes: set[LoopyType]
+    seen_functions: set[SeenFunction]
+    seen_atomic_dtypes: set[LoopyType]
+
+
+def _strip_codegen_state(codegen_state: CodeGenerationState
+                         ) -> CodeGenerationState:
+    # The kernel and the callables are shipped to the workers only once, see
+    # _init_worker.
+    return codegen_state.copy(
+            kernel=None,
+            callables_table=None,
+            codegen_cache_manager=None,
+            device_program_generator=None,
+            seen_dtypes=set(),
+            seen_functions=set(),
+            seen_atomic_dtypes=set())
+
+
+class DeviceCodegenStateRecorder:
+    """A :attr:`~loopy.codegen.CodeGenerationState.device_program_generator`
+    that records the state in which device code generation for each
+    :class:`~loopy.schedule.CallKernel` starts, without generating any device
+    code.
+
+    .. attribute:: sched_index_to_codegen_state
+    """
+
+    def __init__(self) -> None:
+        self.sched_index_to_codegen_state: dict[int, CodeGenerationState] = {}
+
+    def __call__(self, codegen_state: CodeGenerationState,
+                 sched_index: int) -> CodeGenerationResult:
+        from loopy.codegen.result import CodeGenerationResult
+
+        # CallKernels are never nested in something that code generation
+        # would visit more than once.
+        assert sched_index not in self.sched_index_to_codegen_state
+        self.sched_index_to_codegen_state[sched_index] = (
+                _strip_codegen_state(codegen_state))
+
+        return CodeGenerationResult(
+                host_program=None,
+                device_programs=[],
+                implemented_domains={})
+
+
+class PregeneratedDevicePrograms:
+    """A :attr:`~loopy.codegen.CodeGenerationState.device_program_generator`
+    that hands out device programs generated by
+    :func:`pregenerate_device_programs`.
+    """
+
+    def __init__(self,
+                 sched_index_to_result: Mapping[int, _DeviceProgramResult]
+                 ) -> None:
+        self.sched_index_to_result = sched_index_to_result
+
+    def __call__(self, codegen_state: CodeGenerationState,
+                 sched_index: int) -> CodeGenerationResult:
+        result = self.sched_index_to_result[sched_index]
+
+        # The sets of seen types and functions are shared among all states
+        # of a kernel, so update them as in-process code generation would
+        # have.
+        codegen_state.seen_dtypes.update(result.seen_dtypes)
+        codegen_state.seen_functions.update(result.seen_functions)
+        codegen_state.seen_atomic_dtypes.update(result.seen_atomic_dtypes)
+
+        return result.codegen_result
+
+# }}}
+
+
+# {{{ worker process
+
+_WORKER_CALLABLES_TABLE: CallablesTable | None = None
+_WORKER_KERNEL_CACHE: dict[
+        str, tuple[LoopKernel, CodegenOperationCacheManager]] = {}
+
+
+def _init_worker(callables_table: CallablesTable) -> None:
+    global _WORKER_CALLABLES_TABLE
+    _WORKER_CALLABLES_TABLE = callables_table
+    _WORKER_KERNEL_CACHE.clear()
+
+
+def _generate_device_program(
+        func_id: str, sched_index: int, codegen_state: CodeGenerationState
+        ) -> _DeviceProgramResult:
+    assert _WORKER_CALLABLES_TABLE is not None
+
+    try:
+        kernel, cache_manager = _WORKER_KERNEL_CACHE[func_id]
+    except KeyError:
+        from loopy.codegen.tools import CodegenOperationCacheManager
+        kernel = _WORKER_CALLABLES_TABLE[func_id].subkernel
+        cache_manager = CodegenOperationCacheManager.from_kernel(kernel)
+        _WORKER_KERNEL_CACHE[func_id] = kernel, cache_manager
+
+    codegen_state = codegen_state.copy(
+            kernel=kernel,
+            callables_table=_WORKER_CALLABLES_TABLE,
+            codegen_cache_manager=cache_manager)
+
+    from loopy.codegen.result import generate_host_or_device_program
+    codegen_result = generate_host_or_device_program(codegen_state, sched_index)
+
+    return _DeviceProgramResult(
+            codegen_result=codegen_result,
+            seen_dtypes=codegen_state.seen_dtypes,
+            seen_functions=codegen_state.seen_functions,
+            seen_atomic_dtypes=codegen_state.seen_atomic_dtypes)
+
+# }}}
+
+
+# {{{ driver
+
+def pregenerate_device_programs(
+        t_unit: TranslationUnit, func_ids: Sequence[str], nprocs: int
+        ) -> Mapping[str, PregeneratedDevicePrograms] | None:
+    """Generate the device programs for all subkernels of the kernels
+    *func_ids* in *t_unit* in a pool of at most *nprocs* worker processes.
+
+    :returns: a mapping from each of *func_ids* to the
+        :attr:`~loopy.codegen.CodeGenerationState.device_program_generator`
+        to use for it, or *None* if there are fewer than two device programs
+        to generate, so that a pool would not pay off.
+    """
+    from loopy.codegen import make_initial_codegen_state
+    from loopy.codegen.control import build_loop_nest
+
+    jobs = []
+    for func_id in func_ids:
+        recorder = DeviceCodegenStateRecorder()
+        codegen_state = make_initial_codegen_state(
+                t_unit[func_id], t_unit.callables_table, t_unit.target,
+                func_id in t_unit.entrypoints,
+                device_program_generator=recorder)
+        build_loop_nest(codegen_state, 0)
+
+        jobs.extend(
+                (func_id, sched_index, device_codegen_state)
+                for sched_index, device_codegen_state
+                in sorted(recorder.sched_index_to_codegen_state.items()))
+
+    if len(jobs) < 2:
+        return None
+
+    nprocs = min(nprocs, len(jobs))
+    plog = ProcessLogger(logger,
+            f"generate {len(jobs)} device programs in {nprocs} processes")
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(
+            max_workers=nprocs,
+            initializer=_init_worker,
+            initargs=(t_unit.callables_table,)) as pool:
+        futures = [
+                pool.submit(_generate_device_program, *job)
+                for job in jobs]
+
+        results: dict[str, dict[int, _DeviceProgramResult]] = {
+                func_id: {} for func_id in func_ids}
+        for (func_id, sched_index, _), future in zip(jobs, futures):
+            results[func_id][sched_index] = future.result()
+
+    plog.done()
+
+    return {
+            func_id: PregeneratedDevicePrograms(sched_index_to_result)
+            for func_id, sched_index_to_result in results.items()}
+
+# }}}
+
+# vim: foldmethod=marker
@@ -24,13 +24,23 @@ THE SOFTWARE.
 """
 
 import logging
+import os
+from typing import TYPE_CHECKING, Any
 
 
 logger = logging.getLogger(__name__)
 
 from pytools import ProcessLogger
+from pytools.persistent_dict import WriteOncePersistentDict
 
 from loopy.diagnostic import LoopyError
+from loopy.tools import LoopyKeyBuilder, caches
+from loopy.version import DATA_MODEL_VERSION
+
+
+if TYPE_CHECKING:
+    from loopy.target import TargetBase
+    from loopy.translation_unit import TranslationUnit
 
 
 def c_preprocess(source, defines=None, filename=None, include_paths=None):
@@ -306,10 +316,165 @@ def _add_assignees_to_calls(knl, all_kernels):
     return knl.copy(instructions=new_insns)
 
 
+# {{{ per-subroutine translation
+
+def _translate_subroutine(source, filename, strict, seq_dependencies, target):
+    """Translate the last subroutine in the free-form Fortran *source*, which
+    also contains the subroutines it calls.
+
+    :returns: a tuple ``(t_unit, index_dtype)``, where *index_dtype* is the
+        type of the loop variables in *source*, or *None* if it has no loops.
+    """
+    from fparser import api
+    tree = api.parse(source, isfree=True, isstrict=strict,
+            analyze=False, ignore_comments=False)
+
+    from loopy.frontend.fortran.translator import F2LoopyTranslator
+    f2loopy = F2LoopyTranslator(filename, target=target)
+    f2loopy(tree)
+
+    t_unit = f2loopy.make_kernels(seq_dependencies=seq_dependencies)[-1]
+    return t_unit, f2loopy.index_dtype
+
+
+def _translate_subroutine_job(args):
+    return _translate_subroutine(*args)
+
+
+def _get_called_subroutine_names(node):
+    from fparser.one.statements import Call
+
+    result = set()
+    for child in getattr(node, "content", ()):
+        if isinstance(child, Call):
+            result.add(child.designator)
+        else:
+            result |= _get_called_subroutine_names(child)
+
+    return result
+
+
+def _get_subroutine_sources(tree):
+    """Return a list of sources, one per subroutine in the fparser *tree*,
+    each containing the subroutine preceded by the subroutines it calls,
+    or *None* if *tree* contains anything that cannot be translated one
+    subroutine at a time.
+    """
+    from fparser.one.block_statements import Comment, Subroutine
+
+    from loopy.frontend.fortran.translator import F2LoopyTranslator
+
+    subroutines = []
+    for node in tree.content:
+        if isinstance(node, Subroutine):
+            subroutines.append(node)
+        elif isinstance(node, Comment):
+            comment = node.content.strip()
+            # instruction tags may span subroutines
+            if (F2LoopyTranslator.begin_tag_re.match(comment)
+                    or F2LoopyTranslator.end_tag_re.match(comment)):
+                return None
+        else:
+            return None
+
+    sub_sources = [sub.tofortran() for sub in subroutines]
+    # indices of the subroutines needed to translate each subroutine
+    deps = []
+    name_to_index = {}
+    for i, sub in enumerate(subroutines):
+        sub_deps = {i}
+        for callee in _get_called_subroutine_names(sub):
+            if callee in name_to_index:
+                sub_deps |= deps[name_to_index[callee]]
+        deps.append(sub_deps)
+        name_to_index[sub.name] = i
+
+    return ["\n".join(sub_sources[j] for j in sorted(sub_deps))
+            for sub_deps in deps]
+
+
+fortran_subroutine_cache: WriteOncePersistentDict[
+    tuple[str, bool, bool, TargetBase | None], tuple[TranslationUnit, Any]
+] = WriteOncePersistentDict(
+        "loopy-fortran-subroutine-cache-v1-"+DATA_MODEL_VERSION,
+        key_builder=LoopyKeyBuilder(),
+        safe_sync=False)
+
+
+caches.append(fortran_subroutine_cache)
+
+
+def _translate_subroutines(sub_sources, filename, strict, seq_dependencies,
+                           target, nprocs):
+    """Translate the subroutines with sources *sub_sources*, reusing
+    translations cached on disk and translating the rest in a pool of at most
+    *nprocs* processes.
+
+    :returns: a list of tuples as returned by :func:`_translate_subroutine`.
+    """
+    from loopy import CACHING_ENABLED
+
+    results = [None] * len(sub_sources)
+    misses = []
+    for i, sub_source in enumerate(sub_sources):
+        if CACHING_ENABLED:
+            try:
+                results[i] = fortran_subroutine_cache[
+                        sub_source, strict, seq_dependencies, target]
+                continue
+            except KeyError:
+                pass
+
+        misses.append(i)
+
+    logger.debug("%s: %d of %d subroutines not found in cache",
+                 filename, len(misses), len(sub_sources))
+
+    jobs = [(sub_sources[i], filename, strict, seq_dependencies, target)
+            for i in misses]
+
+    if nprocs is True or nprocs < 0:
+        nprocs = os.cpu_count() or 1
+    nprocs = min(nprocs, len(jobs))
+
+    if nprocs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=nprocs) as pool:
+            translated = list(pool.map(_translate_subroutine_job, jobs))
+    else:
+        translated = [_translate_subroutine(*job) for job in jobs]
+
+    for i, result in zip(misses, translated):
+        results[i] = result
+        if CACHING_ENABLED:
+            fortran_subroutine_cache.store_if_not_present(
+                    (sub_sources[i], strict, seq_dependencies, target),
+                    result)
+
+    return results
+
+# }}}
+
+
 def parse_fortran(source, filename="<floopy code>", free_form=None, strict=None,
-        seq_dependencies=None, auto_dependencies=None, target=None):
+        seq_dependencies=None, auto_dependencies=None, target=None,
+        nprocs=1):
     """
+    :arg nprocs: the maximum number of processes in which to translate
+        subroutines. *True* or a negative value use one process per CPU.
+        Defaults to 1, i.e. serial translation.
+
+    Subroutines are translated one at a time, and their translations are
+    cached on disk (unless disabled by :func:`loopy.set_caching_enabled`),
+    keyed on their normalized source as printed by :mod:`fparser`. Only
+    subroutines that changed since they were last translated are translated
+    again, in parallel if *nprocs* allows it.
+
     :returns: a :class:`loopy.TranslationUnit`
+
+    .. versionchanged:: 2024.2
+
+        *nprocs* was added, translations are cached.
     """
 
     parse_plog = ProcessLogger(logger, "parsing fortran file '%s'" % filename)
@@ -345,11 +510,36 @@ def parse_fortran(source, filename="<floopy code>", free_form=None, strict=None,
         raise LoopyError("Fortran parser was unhappy with source code "
                 "and returned invalid data (Sorry!)")
 
-    from loopy.frontend.fortran.translator import F2LoopyTranslator
-    f2loopy = F2LoopyTranslator(filename, target=target)
-    f2loopy(tree)
+    sub_sources = _get_subroutine_sources(tree)
+    if sub_sources is None:
+        from loopy.frontend.fortran.translator import F2LoopyTranslator
+        f2loopy = F2LoopyTranslator(filename, target=target)
+        f2loopy(tree)
 
-    kernels = f2loopy.make_kernels(seq_dependencies=seq_dependencies)
+        kernels = f2loopy.make_kernels(seq_dependencies=seq_dependencies)
+    else:
+        translated = _translate_subroutines(
+                sub_sources, filename, strict, seq_dependencies, target,
+                nprocs)
+
+        # all subroutines share the type of the loop variables
+        index_dtypes = {index_dtype for _, index_dtype in translated
+                        if index_dtype is not None}
+        if len(index_dtypes) > 1:
+            raise LoopyError("types of loop variables do not agree across "
+                    "subroutines: "
+                    + ", ".join(sorted(str(dtype) for dtype in index_dtypes)))
+
+        kernels = []
+        for t_unit, index_dtype in translated:
+            if index_dtypes and index_dtype is None:
+                from loopy.types import to_loopy_type
+                index_dtype, = index_dtypes
+                knl, = (clbl.subkernel
+                        for clbl in t_unit.callables_table.values())
+                t_unit = t_unit.with_kernel(
+                        knl.copy(index_dtype=to_loopy_type(index_dtype)))
+            kernels.append(t_unit)
 
     from loopy.transform.callable import merge
     prog = merge(kernels)
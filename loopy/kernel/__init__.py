@@ -32,7 +32,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 from collections import defaultdict
-from dataclasses import dataclass, field, fields, replace
+from dataclasses import dataclass, field, replace
 from enum import IntEnum
 from functools import cached_property
 from sys import intern
@@ -73,7 +73,7 @@ from loopy.kernel.data import (
     _ArraySeparationInfo,
     filter_iname_tags_by_type,
 )
-from loopy.tools import update_persistent_hash
+from loopy.tools import LazilyUnpicklingFieldsMixin, update_persistent_hash
 from loopy.types import LoopyType, NumpyType
 
 
@@ -82,6 +82,7 @@ if TYPE_CHECKING:
 
     from loopy.kernel.function_interface import InKernelCallable
     from loopy.kernel.instruction import InstructionBase
+    from loopy.kernel.instruction_index import InstructionIndex
     from loopy.options import Options
     from loopy.schedule import ScheduleItem
     from loopy.target import TargetBase
@@ -110,7 +111,7 @@ class _BoundsRecord:
 
 
 @dataclass(frozen=True)
-class LoopKernel(Taggable):
+class LoopKernel(LazilyUnpicklingFieldsMixin, Taggable):
     """These correspond more or less directly to arguments of
     :func:`loopy.make_kernel`.
 
@@ -603,13 +604,10 @@ class LoopKernel(Taggable):
 
     @memoize_method
     def iname_to_insns(self):
-        result = {
-                iname: set() for iname in self.all_inames()}
-        for insn in self.instructions:
-            for iname in insn.within_inames:
-                result[iname].add(insn.id)
-
-        return result
+        insns_within = self.get_instruction_index().get_insns_within()
+        return {
+                iname: set(insns_within.get(iname, ()))
+                for iname in self.all_inames()}
 
     @memoize_method
     def _remove_inames_for_shared_hw_axes(self, cond_inames):
@@ -648,34 +646,40 @@ class LoopKernel(Taggable):
 
     # {{{ dependency wrangling
 
+    def get_instruction_index(self) -> InstructionIndex:
+        """Return the :class:`~loopy.kernel.instruction_index.InstructionIndex`
+        of :attr:`instructions`. If this kernel was copied from one whose index
+        was known, the index is derived from that one.
+        """
+        try:
+            return self._cached_instruction_index  # type: ignore[attr-defined]
+        except AttributeError:
+            pass
+
+        from loopy.kernel.instruction_index import InstructionIndex
+        try:
+            base_index = self._instruction_index_base  # type: ignore[attr-defined]
+        except AttributeError:
+            result = InstructionIndex(self.instructions)
+        else:
+            result = base_index.with_instructions(self.instructions)
+            object.__delattr__(self, "_instruction_index_base")
+
+        object.__setattr__(self, "_cached_instruction_index", result)
+
+        return result
+
     @memoize_method
     def recursive_insn_dep_map(self):
         """Returns a :class:`dict` mapping an instruction IDs *a*
         to all instruction IDs it directly or indirectly depends
         on.
         """
-
-        result = {}
-
-        def compute_deps(insn_id):
-            try:
-                return result[insn_id]
-            except KeyError:
-                pass
-
-            insn = self.id_to_insn[insn_id]
-            insn_result = set(insn.depends_on)
-
-            for dep in list(insn.depends_on):
-                insn_result.update(compute_deps(dep))
-
-            result[insn_id] = frozenset(insn_result)
-            return insn_result
-
-        for insn in self.instructions:
-            compute_deps(insn.id)
-
-        return result
+        index = self.get_instruction_index()
+        return {
+                insn.id: index.ids_from_bits(
+                    index.get_recursive_dependency_bits(insn.id))
+                for insn in self.instructions}
 
     # }}}
 
@@ -687,17 +691,15 @@ class LoopKernel(Taggable):
         :return: a dict that maps variable names to ids of insns that read that
           variable.
         """
-        result = {}
-
         admissible_vars = (
                 {arg.name for arg in self.args}
                 | set(self.temporary_variables.keys()))
 
-        for insn in self.instructions:
-            for var_name in insn.read_dependency_names() & admissible_vars:
-                result.setdefault(var_name, set()).add(insn.id)
-
-        return result
+        return {
+                var_name: set(insn_ids)
+                for var_name, insn_ids
+                in self.get_instruction_index().get_readers().items()
+                if var_name in admissible_vars}
 
     @memoize_method
     def writer_map(self):
@@ -705,13 +707,10 @@ class LoopKernel(Taggable):
         :return: a dict that maps variable names to ids of insns that write
             to that variable.
         """
-        result = {}
-
-        for insn in self.instructions:
-            for var_name in insn.assignee_var_names():
-                result.setdefault(var_name, set()).add(insn.id)
-
-        return result
+        return {
+                var_name: set(insn_ids)
+                for var_name, insn_ids
+                in self.get_instruction_index().get_writers().items()}
 
     @memoize_method
     def get_read_variables(self):
@@ -1254,23 +1253,33 @@ class LoopKernel(Taggable):
 
     # {{{ pickling
 
+    # Costly to unpickle (e.g. domains are re-parsed by isl), but not needed
+    # to run a kernel retrieved from an execution cache.
+    _lazily_unpickled_fields: ClassVar[frozenset[str]] = frozenset({
+            "domains",
+            "args",
+            "assumptions",
+            "temporary_variables",
+            "inames",
+            "substitutions",
+            "iname_slab_increments",
+            })
+
     def __getstate__(self):
-        result = {
-                fld.name: getattr(self, fld.name)
-                for fld in fields(self.__class__)
-                if hasattr(self, fld.name)
-                and not fld.name.startswith("_")}
+        format_version, result, lazy_result = self._get_fields_state()
 
         # Make the instructions lazily unpickling, to support faster
-        # cache retrieval for execution.
-        from loopy.kernel.instruction import _get_insn_eq_key, _get_insn_hash_key
+        # cache retrieval for execution. Instructions are compared by their
+        # persistent hash digest, so that the comparison keys stored
+        # alongside them are small and quick to unpickle.
+        from loopy.kernel.instruction import _get_insn_hash_key
         from loopy.tools import (
             LazilyUnpicklingListWithEqAndPersistentHashing as LazyList,
         )
 
         result["instructions"] = LazyList(
                 self.instructions,
-                eq_key_getter=_get_insn_eq_key,
+                eq_key_getter=_get_insn_hash_key,
                 persistent_hash_key_getter=_get_insn_hash_key)
 
         # Cache written variables to avoid having to unpickle instructions in
@@ -1283,13 +1292,13 @@ class LoopKernel(Taggable):
         LoopyKeyBuilder()(self)
 
         # pylint: disable=no-member
-        return (result, self._pytools_persistent_hash_digest)
+        return ((format_version, result, lazy_result),
+                self._pytools_persistent_hash_digest)
 
     def __setstate__(self, state):
-        attribs, p_hash_digest = state
+        fields_state, p_hash_digest = state
 
-        for name, val in attribs.items():
-            object.__setattr__(self, name, val)
+        self._set_fields_state(fields_state)
 
         if 0:
             # {{{ check that 'reconstituted' object has same hash
@@ -1382,6 +1391,19 @@ class LoopKernel(Taggable):
 
         object.__setattr__(result, "_cache_manager", self.cache_manager)
 
+        # The instruction index is derived lazily, see get_instruction_index.
+        try:
+            index = self._cached_instruction_index  # type: ignore[attr-defined]
+        except AttributeError:
+            base_index = getattr(self, "_instruction_index_base", None)
+            if base_index is not None:
+                object.__setattr__(result, "_instruction_index_base", base_index)
+        else:
+            object.__setattr__(result,
+                    "_instruction_index_base" if "instructions" in kwargs
+                    else "_cached_instruction_index",
+                    index)
+
         if "instructions" not in kwargs:
             # Avoid carrying over an invalid cache when instructions are
             # modified.
@@ -734,9 +734,17 @@ class ArrayBase(ImmutableRecord, Taggable):
 
     If an integer N is given, the array would be declared
     with ``__attribute__((aligned(N)))`` in code generation for
-    :class:`loopy.CFamilyTarget`.
+    :class:`loopy.CFamilyTarget`. For arguments on :class:`loopy.CTarget`,
+    the generated code passes this promise on to the compiler using
+    ``__builtin_assume_aligned``, and the executor of
+    :class:`loopy.ExecutableCTarget` checks it at call time (unless
+    :attr:`loopy.Options.skip_arg_checks` is set).
 
     .. versionadded:: 2018.1
+
+    .. versionchanged:: 2024.2
+
+        Used for arguments on :class:`loopy.CTarget`.
     """
 
     tags: frozenset[Tag]
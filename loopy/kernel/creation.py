@@ -36,6 +36,7 @@ from islpy import dim_type
 from pymbolic.mapper import CSECachingMapperMixin
 from pymbolic.primitives import Call, Slice, Subscript, Variable
 from pytools import ProcessLogger
+from pytools.persistent_dict import WriteOncePersistentDict
 
 from loopy.diagnostic import LoopyError, warn_with_kernel
 from loopy.kernel.array import FixedStrideArrayDimTag
@@ -49,8 +50,14 @@ from loopy.kernel.data import (
     auto,
 )
 from loopy.symbolic import IdentityMapper, SubArrayRef, WalkMapper
-from loopy.tools import Optional, intern_frozenset_of_ids
+from loopy.tools import (
+    LoopyKeyBuilder,
+    Optional,
+    caches,
+    intern_frozenset_of_ids,
+)
 from loopy.translation_unit import TranslationUnit, for_each_kernel
+from loopy.version import DATA_MODEL_VERSION
 
 
 logger = logging.getLogger(__name__)
@@ -464,7 +471,8 @@ SPECIAL_INSN_RE = re.compile(
         r"\s*"
         r"\.\.\."
         r"\s*"
-        r"(?P<kind>[a-z]+?)"
+        r"(?P<kind>[a-z]+)"
+        r"(?:\s+(?P<args>[^{\s][^{]*?))?"
         r"\s*?"
         r"(?:\{(?P<options>.+)\}\s*)?$")
 
@@ -641,11 +649,20 @@ def parse_special_insn(groups, insn_options):
                     else insn_id),
                 **insn_options)
 
-    from loopy.kernel.instruction import BarrierInstruction, NoOpInstruction
+    from loopy.kernel.instruction import (
+        BarrierInstruction,
+        NoOpInstruction,
+        PrefetchInstruction,
+    )
     special_insn_kind = groups["kind"]
     # check for bad options
     check_illegal_options(insn_options, special_insn_kind)
 
+    if (groups["args"] is None) != (special_insn_kind != "prefetch"):
+        raise LoopyError("special instruction '%s' %s an argument"
+                % (special_insn_kind,
+                   "requires" if special_insn_kind == "prefetch" else "takes no"))
+
     if special_insn_kind == "gbarrier":
         cls = BarrierInstruction
         kwargs["synchronization_kind"] = "global"
@@ -654,6 +671,9 @@ def parse_special_insn(groups, insn_options):
         kwargs["synchronization_kind"] = "local"
     elif special_insn_kind == "nop":
         cls = NoOpInstruction
+    elif special_insn_kind == "prefetch":
+        cls = PrefetchInstruction
+        kwargs["address"] = groups["args"]
     else:
         raise LoopyError(
             "invalid kind of special instruction: '%s'" % special_insn_kind)
@@ -2175,6 +2195,47 @@ def realize_slices_array_inputs_as_sub_array_refs(kernel):
 # }}}
 
 
+# {{{ make_function cache
+
+class _MakeFunctionKeyBuilder(LoopyKeyBuilder):
+    def update_for_function(self, key_hash, key):
+        # Lambdas and local functions are neither identified by their
+        # qualified name nor picklable.
+        if "<" in key.__qualname__:
+            raise TypeError(f"cannot build a persistent key for '{key!r}'")
+
+        super().update_for_function(key_hash, key)
+
+    def update_for_ellipsis(self, key_hash, key):
+        self.rec(key_hash, "...")
+
+
+def _normalize_for_cache_key(obj):
+    """Return a version of the *domains*, *instructions* or *kernel_data*
+    passed to :func:`make_function` with whitespace that does not affect
+    their parsing removed from strings.
+    """
+    if isinstance(obj, str):
+        return "\n".join(line.strip() for line in obj.split("\n")
+                         if line.strip())
+    elif isinstance(obj, (list, tuple)):
+        return tuple(_normalize_for_cache_key(item) for item in obj)
+    else:
+        return obj
+
+
+make_function_cache: WriteOncePersistentDict[tuple, TranslationUnit] = \
+        WriteOncePersistentDict(
+            "loopy-make-function-cache-v1-"+DATA_MODEL_VERSION,
+            key_builder=_MakeFunctionKeyBuilder(),
+            safe_sync=False)
+
+
+caches.append(make_function_cache)
+
+# }}}
+
+
 # {{{ make_function
 
 def make_function(domains, instructions, kernel_data=None, **kwargs):
@@ -2277,6 +2338,18 @@ def make_function(domains, instructions, kernel_data=None, **kwargs):
 
         See also :ref:`language-versioning`.
 
+    Unless disabled by :func:`loopy.set_caching_enabled`, the created
+    :class:`~loopy.TranslationUnit` is cached on disk, keyed on all of the
+    above arguments, so that creating the same kernel again (e.g. on the next
+    start of a program) skips parsing and inference. Arguments without a
+    persistent hash (such as lambdas passed as *symbol_manglers*) disable
+    caching for that call. Note that warnings issued during kernel creation
+    are not repeated when a kernel is retrieved from the cache.
+
+    .. versionchanged:: 2024.2
+
+        Results are cached on disk.
+
     .. versionchanged:: 2017.2.1
 
         *lang_version* added.
@@ -2290,10 +2363,6 @@ def make_function(domains, instructions, kernel_data=None, **kwargs):
         *seq_dependencies* added.
     """
 
-    creation_plog = ProcessLogger(
-            logger,
-            "%s: instantiate" % kwargs.get("name", "(unnamed)"))
-
     if kernel_data is None:
         kernel_data = [...]
     defines = kwargs.pop("defines", {})
@@ -2388,6 +2457,68 @@ def make_function(domains, instructions, kernel_data=None, **kwargs):
     if isinstance(silenced_warnings, str):
         silenced_warnings = silenced_warnings.split(";")
 
+    kwargs.update(
+            defines=defines,
+            default_order=default_order,
+            default_offset=default_offset,
+            silenced_warnings=silenced_warnings,
+            options=options,
+            target=target,
+            seq_dependencies=seq_dependencies,
+            fixed_parameters=fixed_parameters,
+            assumptions=assumptions)
+
+    from loopy import CACHING_ENABLED
+
+    if not CACHING_ENABLED:
+        return _make_function_uncached(domains, instructions, kernel_data,
+                                       **kwargs)
+
+    cache_key = (
+            _normalize_for_cache_key(domains),
+            _normalize_for_cache_key(instructions),
+            _normalize_for_cache_key(kernel_data),
+            lang_version,
+            kwargs)
+
+    try:
+        result = make_function_cache[cache_key]
+        logger.debug("%s: make_function cache hit",
+                     kwargs.get("name", "(unnamed)"))
+        # Targets may carry state that is not part of their persistent hash
+        # (e.g. the compiler of ExecutableCTarget), use the caller's.
+        return result.copy(target=target)
+    except KeyError:
+        pass
+    except TypeError as e:
+        # Some argument has no persistent hash, e.g. a lambda passed as a
+        # symbol mangler.
+        logger.debug("%s: not caching kernel creation: %s",
+                     kwargs.get("name", "(unnamed)"), e)
+        return _make_function_uncached(domains, instructions, kernel_data,
+                                       **kwargs)
+
+    result = _make_function_uncached(domains, instructions, kernel_data,
+                                     **kwargs)
+
+    from pickle import PicklingError
+    try:
+        make_function_cache.store_if_not_present(cache_key, result)
+    except (PicklingError, AttributeError, TypeError) as e:
+        # e.g. tags of a locally defined class
+        logger.debug("%s: not caching kernel creation: %s",
+                     kwargs.get("name", "(unnamed)"), e)
+
+    return result
+
+
+def _make_function_uncached(domains, instructions, kernel_data, *,
+        defines, default_order, default_offset, silenced_warnings, options,
+        target, seq_dependencies, fixed_parameters, assumptions, **kwargs):
+    creation_plog = ProcessLogger(
+            logger,
+            "%s: instantiate" % kwargs.get("name", "(unnamed)"))
+
     # {{{ separate temporary variables and arguments, take care of names with commas
 
     from loopy.kernel.data import ArrayBase, TemporaryVariable
@@ -2625,4 +2756,98 @@ make_kernel.__doc__ = make_function.__doc__
 
 # }}}
 
+
+# {{{ make_kernel_template
+
+class KernelTemplate:
+    """A kernel some of whose parameters are placeholders, to be fixed to
+    values upon :meth:`instantiate`. Obtained from
+    :func:`make_kernel_template`.
+
+    .. attribute:: t_unit
+
+        The :class:`~loopy.TranslationUnit` in which the placeholders are
+        :ref:`domain-parameters` or :class:`~loopy.ValueArg` arguments.
+
+    .. attribute:: placeholders
+
+        A :class:`frozenset` of the placeholder names.
+
+    .. automethod:: instantiate
+
+    .. versionadded:: 2024.2
+    """
+
+    def __init__(self, t_unit: TranslationUnit, placeholders: frozenset[str]):
+        self.t_unit = t_unit
+        self.placeholders = placeholders
+
+    def instantiate(self, **values: Any) -> TranslationUnit:
+        """Return the kernel with the placeholders named in *values* fixed to
+        their values, as by :func:`loopy.fix_parameters`. No strings are
+        parsed in the process.
+        """
+        unknown = set(values) - self.placeholders
+        if unknown:
+            raise LoopyError("not placeholders of the kernel template: "
+                             + ", ".join(sorted(unknown)))
+
+        from loopy.transform.parameter import fix_parameters
+        return fix_parameters(self.t_unit, **values)
+
+    def __repr__(self) -> str:
+        return (f"KernelTemplate({', '.join(self.t_unit.entrypoints)}, "
+                f"placeholders={sorted(self.placeholders)})")
+
+
+def make_kernel_template(domains, instructions, kernel_data=None, *,
+                         placeholders, **kwargs: Any) -> KernelTemplate:
+    """Like :func:`make_kernel`, but return a :class:`KernelTemplate` from
+    which variants of the kernel differing only in the values of
+    *placeholders* are obtained without parsing the kernel again. This is
+    meant to replace creating kernels through :func:`make_kernel` with
+    differing *defines* or *fixed_parameters*.
+
+    :arg placeholders: the names of the placeholders, as a comma-separated
+        string or an iterable. In *domains* and *instructions*, placeholders
+        are referred to by name, like any other parameter.
+
+    All other arguments are as for :func:`make_kernel`.
+
+    .. versionadded:: 2024.2
+    """
+    if isinstance(placeholders, str):
+        placeholders = [name.strip() for name in placeholders.split(",")
+                        if name.strip()]
+    placeholders = frozenset(placeholders)
+
+    if kwargs.get("lang_version") is None:
+        # make_function only looks for the language version in the globals of
+        # its caller (or of the caller of make_kernel), look in ours instead
+        import inspect
+
+        from loopy.version import LANGUAGE_VERSION_SYMBOLS
+        caller_globals = inspect.currentframe().f_back.f_globals
+        for ver_sym in LANGUAGE_VERSION_SYMBOLS:
+            if ver_sym in caller_globals:
+                kwargs["lang_version"] = caller_globals[ver_sym]
+                break
+
+    t_unit = make_function(domains, instructions, kernel_data, **kwargs)
+    name, = t_unit.callables_table
+    t_unit = t_unit.with_entrypoints(name)
+
+    kernel = t_unit[name]
+    params = kernel.all_params()
+    unused = {placeholder for placeholder in placeholders
+              if placeholder not in params
+              and placeholder not in kernel.arg_dict}
+    if unused:
+        raise LoopyError("placeholders are not parameters or arguments of "
+                         f"kernel '{name}': " + ", ".join(sorted(unused)))
+
+    return KernelTemplate(t_unit, placeholders)
+
+# }}}
+
 # vim: fdm=marker
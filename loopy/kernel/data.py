@@ -306,6 +306,17 @@ class InOrderSequentialSequentialTag(InameImplementationTag):
         return "ord"
 
 
+class ThreadParallelTag(InameImplementationTag):
+    """Realized as a loop whose iterations are distributed across CPU
+    threads. Applied by :func:`loopy.realize_reduction` to the ``g``-tagged
+    inames of reductions and scans on targets that
+    :attr:`~loopy.target.ASTBuilderBase.can_implement_thread_parallel_loops`.
+    """
+
+    def __str__(self):
+        return "thr"
+
+
 ToInameTagConvertible = Union[str, Tag, None]
 
 
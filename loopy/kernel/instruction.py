@@ -401,9 +401,16 @@ class InstructionBase(ImmutableRecord, Taggable):
         assert isinstance(groups, abc_Set)
         assert isinstance(conflicts_with_groups, abc_Set)
 
-        from loopy.tools import is_hashable
+        from loopy.tools import is_hashable, share_frozenset
         assert is_hashable(happens_after)
 
+        groups = share_frozenset(groups)
+        conflicts_with_groups = share_frozenset(conflicts_with_groups)
+        no_sync_with = share_frozenset(no_sync_with)
+        within_inames = share_frozenset(within_inames)
+        predicates = share_frozenset(predicates)
+        tags = share_frozenset(tags)
+
         ImmutableRecord.__init__(self,
                 id=id,
                 happens_after=happens_after,
@@ -571,7 +578,7 @@ class InstructionBase(ImmutableRecord, Taggable):
 
         from immutabledict import immutabledict
 
-        from loopy.tools import intern_frozenset_of_ids
+        from loopy.tools import intern_frozenset_of_ids, share_frozenset
 
         if self.id is not None:  # pylint:disable=access-member-before-definition
             self.id = intern(self.id)
@@ -583,6 +590,9 @@ class InstructionBase(ImmutableRecord, Taggable):
                 intern_frozenset_of_ids(self.conflicts_with_groups))
         self.within_inames = (
                 intern_frozenset_of_ids(self.within_inames))
+        self.no_sync_with = share_frozenset(self.no_sync_with)
+        self.predicates = share_frozenset(self.predicates)
+        self.tags = share_frozenset(self.tags)
 
     def _with_new_tags(self, tags: frozenset[Tag]):
         return self.copy(tags=tags)
@@ -1597,6 +1607,85 @@ class NoOpInstruction(_DataObliviousInstruction):
 # }}}
 
 
+# {{{ prefetch instruction
+
+class PrefetchInstruction(NoOpInstruction):
+    """A :class:`NoOpInstruction` that hints to the target that the array
+    element :attr:`address` will be accessed soon, so that it may be
+    brought into cache ahead of time. Targets that do not support
+    prefetching treat it as a no-op. See :func:`loopy.add_software_prefetch`.
+    In the textual instruction syntax, it is written as
+    ``... prefetch a[i+8]``.
+
+    .. attribute:: address
+
+        A :class:`pymbolic.primitives.Subscript` of the array element to
+        prefetch. The array itself does not count as read by this instruction
+        for the purpose of dependency tracking, as prefetching does not change
+        the meaning of the program.
+
+    .. versionadded:: 2024.2
+    """
+
+    fields = NoOpInstruction.fields | {"address"}
+
+    def __init__(self, address, id=None, happens_after=None,
+            depends_on_is_final=None,
+            groups=None, conflicts_with_groups=None,
+            no_sync_with=None,
+            within_inames_is_final=None, within_inames=None,
+            priority=None,
+            predicates=None, tags=None, depends_on=None):
+        super().__init__(
+                id=id,
+                happens_after=happens_after,
+                depends_on_is_final=depends_on_is_final,
+                groups=groups,
+                conflicts_with_groups=conflicts_with_groups,
+                no_sync_with=no_sync_with,
+                within_inames_is_final=within_inames_is_final,
+                within_inames=within_inames,
+                priority=priority,
+                predicates=predicates,
+                tags=tags,
+                depends_on=depends_on)
+
+        if isinstance(address, str):
+            from loopy.symbolic import parse
+            address = parse(address)
+
+        from pymbolic.primitives import Subscript
+        if not isinstance(address, Subscript):
+            raise LoopyError(f"prefetch address must be a subscript, "
+                    f"got '{address}'")
+
+        self.address = address
+
+    # {{{ abstract interface
+
+    def read_dependency_names(self):
+        from loopy.symbolic import get_dependencies
+        return super().read_dependency_names() | get_dependencies(
+                self.address.index_tuple)
+
+    def with_transformed_expressions(self, f, assignee_f=None):
+        return super().with_transformed_expressions(f, assignee_f).copy(
+                address=f(self.address))
+
+    # }}}
+
+    def __str__(self):
+        first_line = f"{self.id}: ... prefetch {self.address}"
+
+        options = self.get_str_options()
+        if options:
+            first_line += " {%s}" % (": ".join(options))
+
+        return first_line
+
+# }}}
+
+
 # {{{ barrier instruction
 
 class BarrierInstruction(_DataObliviousInstruction):
@@ -1672,10 +1761,6 @@ class BarrierInstruction(_DataObliviousInstruction):
 
 # {{{ key getters
 
-def _get_insn_eq_key(insn):
-    return insn._key_builder.key()
-
-
 def _get_insn_hash_key(insn):
     return insn._key_builder.hash_key()
 
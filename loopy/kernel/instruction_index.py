@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from itertools import compress
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from loopy.kernel.instruction import InstructionBase
+
+
+__doc__ = """
+.. autoclass:: InstructionIndex
+"""
+
+
+# {{{ bitset helpers
+
+_BINARY_DIGIT_TO_SELECTOR = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _get_selectors(bits: int) -> bytes:
+    """Return a :class:`bytes` object whose *i*-th entry is 1 if bit *i* of
+    *bits* is set and 0 otherwise, for use with :func:`itertools.compress`.
+    This keeps decoding bitsets out of Python loops.
+    """
+    return bin(bits)[:1:-1].encode("ascii").translate(_BINARY_DIGIT_TO_SELECTOR)
+
+# }}}
+
+
+# {{{ instruction index
+
+def _freeze_id_map(id_map: dict[str, set[str]]) -> dict[str, frozenset[str]]:
+    return {key: frozenset(ids) for key, ids in id_map.items()}
+
+
+def _add_to_id_map(id_map: dict[str, frozenset[str]],
+                   keys: Iterable[str], insn_id: str) -> None:
+    for key in keys:
+        id_map[key] = id_map.get(key, frozenset()) | {insn_id}
+
+
+def _remove_from_id_map(id_map: dict[str, frozenset[str]],
+                        keys: Iterable[str], insn_id: str) -> None:
+    for key in keys:
+        remaining = id_map[key] - {insn_id}
+        if remaining:
+            id_map[key] = remaining
+        else:
+            del id_map[key]
+
+
+class InstructionIndex:
+    """An index of the relations between the instructions of a
+    :class:`~loopy.LoopKernel` that are queried repeatedly during checking
+    and scheduling.
+
+    Each instruction is assigned a number, which allows representing sets of
+    instructions as :class:`int` bitsets. The transitive closure of the
+    dependency relation is stored this way, so that computing it and querying
+    it are operations on whole bitsets instead of on sets of strings.
+    The maps from variables to their readers and writers and from inames to
+    the instructions within them are sparse and stored as :class:`frozenset`
+    instances.
+
+    Indices are immutable. :meth:`with_instructions` derives the index of a
+    changed list of instructions, redoing the work only for instructions that
+    are not identical to ones in this index.
+
+    .. automethod:: with_instructions
+
+    .. automethod:: get_readers
+    .. automethod:: get_writers
+    .. automethod:: get_insns_within
+
+    .. automethod:: bits_from_ids
+    .. automethod:: ids_from_bits
+    .. automethod:: get_recursive_dependency_bits
+    .. automethod:: depends_on_recursively
+    .. automethod:: find_recursive_dependencies
+    """
+
+    def __init__(self, instructions: Sequence[InstructionBase]) -> None:
+        self._number_to_insn: list[InstructionBase | None] = []
+        self._number_to_id: list[str | None] = []
+        self._id_to_number: dict[str, int] = {}
+
+        readers: dict[str, set[str]] = {}
+        writers: dict[str, set[str]] = {}
+        inames: dict[str, set[str]] = {}
+
+        for insn in instructions:
+            assert insn.id is not None
+            self._id_to_number[insn.id] = len(self._number_to_insn)
+            self._number_to_insn.append(insn)
+            self._number_to_id.append(insn.id)
+
+            for var_name in insn.read_dependency_names():
+                readers.setdefault(var_name, set()).add(insn.id)
+            for var_name in insn.assignee_var_names():
+                writers.setdefault(var_name, set()).add(insn.id)
+            for iname in insn.within_inames:
+                inames.setdefault(iname, set()).add(insn.id)
+
+        self._readers = _freeze_id_map(readers)
+        self._writers = _freeze_id_map(writers)
+        self._inames = _freeze_id_map(inames)
+
+        self._recursive_dep_bits: list[int] | None = None
+
+    # {{{ maintenance
+
+    def _add(self, insn: InstructionBase) -> None:
+        assert insn.id is not None
+
+        number = self._id_to_number.get(insn.id)
+        if number is None:
+            number = len(self._number_to_insn)
+            self._id_to_number[insn.id] = number
+            self._number_to_insn.append(insn)
+            self._number_to_id.append(insn.id)
+        else:
+            self._number_to_insn[number] = insn
+
+        _add_to_id_map(self._readers, insn.read_dependency_names(), insn.id)
+        _add_to_id_map(self._writers, insn.assignee_var_names(), insn.id)
+        _add_to_id_map(self._inames, insn.within_inames, insn.id)
+
+    def _remove(self, insn: InstructionBase) -> None:
+        assert insn.id is not None
+
+        _remove_from_id_map(self._readers, insn.read_dependency_names(), insn.id)
+        _remove_from_id_map(self._writers, insn.assignee_var_names(), insn.id)
+        _remove_from_id_map(self._inames, insn.within_inames, insn.id)
+
+        self._number_to_insn[self._id_to_number[insn.id]] = None
+
+    def with_instructions(
+            self, instructions: Sequence[InstructionBase]) -> InstructionIndex:
+        """Return an index of *instructions*, reusing the entries of this
+        index for the instructions that occur (as the same object) in both.
+        """
+        id_to_insn = {insn.id: insn for insn in instructions}
+
+        removed = [
+                insn for insn in self._number_to_insn
+                if insn is not None and id_to_insn.get(insn.id) is not insn]
+        added = [
+                insn for insn in instructions
+                if (insn.id not in self._id_to_number
+                    or self._number_to_insn[self._id_to_number[insn.id]]
+                    is not insn)]
+
+        nremoved_ids = sum(1 for insn in removed if insn.id not in id_to_insn)
+        nunused = len(self._number_to_insn) - len(self._id_to_number)
+        if (len(removed) + len(added) > len(instructions) // 2
+                or 2*(nunused + nremoved_ids) > len(instructions)):
+            # Starting over is cheaper than patching most of the index, and
+            # it reclaims the numbers of removed instructions.
+            return InstructionIndex(instructions)
+
+        result = InstructionIndex.__new__(InstructionIndex)
+        result._number_to_insn = list(self._number_to_insn)
+        result._number_to_id = list(self._number_to_id)
+        result._id_to_number = dict(self._id_to_number)
+        result._readers = dict(self._readers)
+        result._writers = dict(self._writers)
+        result._inames = dict(self._inames)
+
+        for insn in removed:
+            result._remove(insn)
+        for insn in added:
+            result._add(insn)
+        for insn in removed:
+            if insn.id not in id_to_insn:
+                # Keep the number allocated, but unassigned, so that the
+                # bitsets of this index stay valid.
+                result._number_to_id[result._id_to_number.pop(insn.id)] = None
+
+        if all(insn.id in id_to_insn
+               and id_to_insn[insn.id].depends_on == insn.depends_on
+               for insn in removed) and len(added) == len(removed):
+            # No dependency edges changed.
+            result._recursive_dep_bits = self._recursive_dep_bits
+        else:
+            result._recursive_dep_bits = None
+
+        return result
+
+    # }}}
+
+    # {{{ variables and inames
+
+    def get_readers(self) -> Mapping[str, frozenset[str]]:
+        """Return a mapping from variable names to the IDs of the instructions
+        reading them.
+        """
+        return self._readers
+
+    def get_writers(self) -> Mapping[str, frozenset[str]]:
+        """Return a mapping from variable names to the IDs of the instructions
+        writing them.
+        """
+        return self._writers
+
+    def get_insns_within(self) -> Mapping[str, frozenset[str]]:
+        """Return a mapping from inames to the IDs of the instructions within
+        them.
+        """
+        return self._inames
+
+    # }}}
+
+    # {{{ dependencies
+
+    def bits_from_ids(self, insn_ids: Iterable[str]) -> int:
+        # Setting the bits one by one in an int would copy it for each.
+        buf = bytearray((len(self._number_to_id) + 7) // 8)
+        for insn_id in insn_ids:
+            number = self._id_to_number[insn_id]
+            buf[number >> 3] |= 1 << (number & 7)
+
+        return int.from_bytes(buf, "little")
+
+    def ids_from_bits(self, bits: int) -> frozenset[str]:
+        return frozenset(  # type: ignore[return-value]
+                compress(self._number_to_id, _get_selectors(bits)))
+
+    def _compute_recursive_dependency_bits(self) -> list[int]:
+        from pytools.graph import compute_sccs
+
+        id_to_number = self._id_to_number
+        dep_graph = {
+                insn.id: insn.depends_on
+                for insn in self._number_to_insn if insn is not None}
+
+        # Strongly connected components are returned such that each is
+        # preceded by the ones it depends on.
+        result = [0] * len(self._number_to_insn)
+        for scc in compute_sccs(dep_graph):
+            scc_bits = 0
+            for insn_id in scc:
+                for dep_id in dep_graph[insn_id]:
+                    dep_number = id_to_number[dep_id]
+                    scc_bits |= result[dep_number] | (1 << dep_number)
+
+            for insn_id in scc:
+                result[id_to_number[insn_id]] = scc_bits
+
+        return result
+
+    def get_recursive_dependency_bits(self, insn_id: str) -> int:
+        """Return the bitset of instructions that the instruction with ID
+        *insn_id* directly or indirectly depends on.
+        """
+        if self._recursive_dep_bits is None:
+            self._recursive_dep_bits = self._compute_recursive_dependency_bits()
+
+        return self._recursive_dep_bits[self._id_to_number[insn_id]]
+
+    def depends_on_recursively(self, insn_id: str, dep_id: str) -> bool:
+        """Return *True* if the instruction with ID *insn_id* directly or
+        indirectly depends on the one with ID *dep_id*.
+        """
+        return bool(self.get_recursive_dependency_bits(insn_id)
+                    >> self._id_to_number[dep_id] & 1)
+
+    def find_recursive_dependencies(
+            self, insn_ids: Iterable[str]) -> frozenset[str]:
+        """Return the IDs in *insn_ids* along with the IDs of all instructions
+        they directly or indirectly depend on.
+        """
+        insn_ids = list(insn_ids)
+        bits = self.bits_from_ids(insn_ids)
+        for insn_id in insn_ids:
+            bits |= self.get_recursive_dependency_bits(insn_id)
+
+        return self.ids_from_bits(bits)
+
+    # }}}
+
+# }}}
+
+# vim: foldmethod=marker
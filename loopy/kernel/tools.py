@@ -25,16 +25,19 @@ THE SOFTWARE.
 """
 
 import logging
+import os
 import sys
+from collections import OrderedDict
 from functools import reduce
 from sys import intern
-from typing import TYPE_CHECKING, AbstractSet, Mapping, Sequence
+from typing import TYPE_CHECKING, AbstractSet, Any, Mapping, Sequence
 
 import numpy as np
 
 import islpy as isl
 from islpy import dim_type
-from pytools import memoize_on_first_arg, natsorted
+from pytools import memoize_on_first_arg, natsorted, strtobool
+from pytools.persistent_dict import WriteOncePersistentDict
 
 from loopy.diagnostic import LoopyError, warn_with_kernel
 from loopy.kernel import LoopKernel
@@ -45,7 +48,9 @@ from loopy.kernel.instruction import (
     _DataObliviousInstruction,
 )
 from loopy.symbolic import CombineMapper
+from loopy.tools import LoopyKeyBuilder, caches
 from loopy.translation_unit import TranslationUnit, TUnitOrKernelT, for_each_kernel
+from loopy.version import DATA_MODEL_VERSION
 
 
 if TYPE_CHECKING:
@@ -360,23 +365,133 @@ def _get_dim_min(set_, idx):
     return set_.dim_min(idx)
 
 
-class SetOperationCacheManager:
-    def __init__(self):
-        # mapping: set hash -> [(set, result)]
-        self.cache = {}
+class SetOperationCache:
+    """A bounded cache of the results of :mod:`islpy` set operations, shared
+    by all kernels, which evicts the least recently used results first.
+
+    Results are keyed on the printed set, the operation and its arguments.
+    They are optionally also stored on disk (if caching is enabled, see
+    :func:`loopy.set_caching_enabled`).
+
+    .. attribute:: maxsize
+
+        The maximum number of results kept in memory.
+
+    .. attribute:: persistent
+
+        Whether results are looked up in and stored to the disk cache.
+
+    .. attribute:: hits
+    .. attribute:: persistent_hits
+
+        The number of results found in memory and on disk, respectively.
+
+    .. attribute:: misses
+
+    .. autoattribute:: hit_rate
+    .. automethod:: clear_in_mem_cache
+    .. automethod:: reset_stats
+
+    .. versionadded:: 2024.2
+    """
+
+    def __init__(self, maxsize: int = 4096, persistent: bool = False) -> None:
+        self.maxsize = maxsize
+        self.persistent = persistent
+
+        # mapping: (set type, printed set, operation name, args) -> result,
+        # in order of use. (The hashes of isl objects are not structural.)
+        self._cache: OrderedDict[tuple[str, str, str, tuple], Any] = (
+                OrderedDict())
+
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups, in memory or on disk, that were hits."""
+        nlookups = self.hits + self.persistent_hits + self.misses
+        if not nlookups:
+            return 0.0
+        return (self.hits + self.persistent_hits) / nlookups
+
+    def clear_in_mem_cache(self) -> None:
+        self._cache.clear()
+
+    def _add(self, key, result):
+        self._cache[key] = result
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
 
     def op(self, set_, op, args):
-        hashval = hash((set_, op, args))
-        bucket = self.cache.setdefault(hashval, [])
+        key = (type(set_).__name__, str(set_), op.__name__, args)
+        try:
+            result = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return result
 
-        for bkt_set, result in bucket:
-            if set_.plain_is_equal(bkt_set):
+        from loopy import CACHING_ENABLED
+        persistent = self.persistent and CACHING_ENABLED
+
+        if persistent:
+            try:
+                result = set_operation_disk_cache[key]
+            except KeyError:
+                pass
+            except TypeError:
+                # arguments cannot be keyed persistently
+                persistent = False
+            else:
+                self.persistent_hits += 1
+                self._add(key, result)
                 return result
 
+        self.misses += 1
         result = op(set_, *args)
-        bucket.append((set_, result))
+        self._add(key, result)
+
+        if persistent:
+            set_operation_disk_cache.store_if_not_present(key, result)
+
         return result
 
+
+set_operation_disk_cache: WriteOncePersistentDict[
+        tuple[str, str, str, tuple], Any] = (
+        WriteOncePersistentDict(
+            "loopy-set-operation-cache-v1-"+DATA_MODEL_VERSION,
+            key_builder=LoopyKeyBuilder(),
+            safe_sync=False))
+
+#: The :class:`SetOperationCache` used by :class:`SetOperationCacheManager`.
+#: Its size and persistence may be set through the environment variables
+#: ``LOOPY_SET_OPERATION_CACHE_SIZE`` and
+#: ``LOOPY_PERSISTENT_SET_OPERATION_CACHE``.
+set_operation_cache = SetOperationCache(
+        maxsize=int(os.environ.get("LOOPY_SET_OPERATION_CACHE_SIZE", "4096")),
+        persistent=strtobool(
+            os.environ.get("LOOPY_PERSISTENT_SET_OPERATION_CACHE", "false")))
+
+caches.append(set_operation_disk_cache)
+caches.append(set_operation_cache)
+
+
+class SetOperationCacheManager:
+    """Performs set operations on behalf of a kernel, caching their results
+    in :data:`set_operation_cache`.
+    """
+
+    def op(self, set_, op, args):
+        return set_operation_cache.op(set_, op, args)
+
     def dim_min(self, set_, *args):
         if set_.plain_is_empty():
             raise LoopyError("domain '%s' is empty" % set_)
@@ -701,7 +816,14 @@ def is_domain_dependent_on_inames(kernel: LoopKernel,
 
 # {{{ rank inames by stride
 
-def get_auto_axis_iname_ranking_by_stride(kernel, insn):
+def get_aggregate_iname_strides(kernel, insn, inames):
+    """Return a :class:`dict` mapping each iname in *inames* occurring in an
+    index of a (non-image) array argument accessed by *insn* to the sum over
+    these accesses of the (smallest) stride with which the iname advances
+    through the argument. Strides are evaluated using the
+    :attr:`~loopy.ValueArg.approximately` values of the kernel's
+    parameters.
+    """
     from loopy.kernel.data import ImageArg, ValueArg
 
     approximate_arg_values = {}
@@ -743,20 +865,10 @@ def get_auto_axis_iname_ranking_by_stride(kernel, insn):
 
     # }}}
 
-    # {{{ figure out automatic-axis inames
-
-    from loopy.kernel.data import AutoLocalInameTagBase
-    auto_axis_inames = {
-        iname for iname in insn.within_inames
-        if kernel.iname_tags_of_type(iname, AutoLocalInameTagBase)}
-
-    # }}}
-
-    # {{{ figure out which iname should get mapped to local axis 0
-
     # maps inames to "aggregate stride"
     aggregate_strides = {}
 
+    from pymbolic import evaluate
     from pymbolic.primitives import Variable
 
     from loopy.symbolic import CoefficientCollector
@@ -781,9 +893,9 @@ def get_auto_axis_iname_ranking_by_stride(kernel, insn):
                 if isinstance(dim_tag, FixedStrideArrayDimTag):
                     ary_strides.append(dim_tag.stride)
 
-        # {{{ construct iname_to_stride_expr
+        # {{{ construct iname_to_stride
 
-        iname_to_stride_expr = {}
+        iname_to_stride = {}
         for iexpr_i, stride in zip(index_expr, ary_strides):
             if stride is None:
                 continue
@@ -791,20 +903,36 @@ def get_auto_axis_iname_ranking_by_stride(kernel, insn):
             for var, coeff in coeffs.items():
                 # This is a nested if instead of 'and' for pylint's benefit.
                 if isinstance(var, Variable):
-                    if var.name in auto_axis_inames:
+                    if var.name in inames:
                         # excludes '1', i.e.  the constant
-                        new_stride = coeff*stride
-                        old_stride = iname_to_stride_expr.get(var.name, None)
+                        new_stride = evaluate(coeff*stride, approximate_arg_values)
+                        old_stride = iname_to_stride.get(var.name, None)
                         if old_stride is None or new_stride < old_stride:
-                            iname_to_stride_expr[var.name] = new_stride
+                            iname_to_stride[var.name] = new_stride
 
         # }}}
 
-        from pymbolic import evaluate
-        for iname, stride_expr in iname_to_stride_expr.items():
-            stride = evaluate(stride_expr, approximate_arg_values)
+        for iname, stride in iname_to_stride.items():
             aggregate_strides[iname] = aggregate_strides.get(iname, 0) + stride
 
+    return aggregate_strides
+
+
+def get_auto_axis_iname_ranking_by_stride(kernel, insn):
+    # {{{ figure out automatic-axis inames
+
+    from loopy.kernel.data import AutoLocalInameTagBase
+    auto_axis_inames = {
+        iname for iname in insn.within_inames
+        if kernel.iname_tags_of_type(iname, AutoLocalInameTagBase)}
+
+    # }}}
+
+    # {{{ figure out which iname should get mapped to local axis 0
+
+    aggregate_strides = get_aggregate_iname_strides(
+            kernel, insn, auto_axis_inames)
+
     if aggregate_strides:
         very_large_stride = int(np.iinfo(np.int32).max)
 
@@ -1255,22 +1383,8 @@ def get_visual_iname_order_embedding(kernel):
 # {{{ find_recursive_dependencies
 
 def find_recursive_dependencies(kernel, insn_ids):
-    queue = list(insn_ids)
-
-    result = set(insn_ids)
-
-    while queue:
-        new_queue = []
-
-        for insn_id in queue:
-            insn = kernel.id_to_insn[insn_id]
-            additional = insn.depends_on - result
-            result.update(additional)
-            new_queue.extend(additional)
-
-        queue = new_queue
-
-    return result
+    return set(
+            kernel.get_instruction_index().find_recursive_dependencies(insn_ids))
 
 # }}}
 
@@ -1597,6 +1711,11 @@ def stringify_instruction_list(kernel: LoopKernel) -> list[str]:
             rhs = "... %sbarrier" % insn.synchronization_kind[0]
             trailing = []
 
+        elif isinstance(insn, lp.PrefetchInstruction):
+            lhs = ""
+            rhs = f"... prefetch {insn.address}"
+            trailing = []
+
         elif isinstance(insn, lp.NoOpInstruction):
             lhs = ""
             rhs = "... nop"
@@ -99,6 +99,34 @@ class Options(ImmutableRecord):
         Like :attr:`trace_assignments`, but also trace the
         assigned values.
 
+    .. attribute:: codegen_nprocs
+
+        An :class:`int`. If greater than one, generate the device
+        programs of independent subkernels and callee kernels concurrently
+        in a pool of (at most) this many worker processes. *True* or a
+        negative value use one process per CPU. The generated code does not
+        depend on this option, which is therefore disregarded when comparing
+        or hashing options.
+
+        Defaults to the value of the environment variable
+        ``LOOPY_CODEGEN_NPROCS``, or 0 (i.e. serial code generation) if
+        that is not set.
+
+        .. versionadded:: 2024.2
+
+    .. attribute:: strength_reduce_indices
+
+        If *True*, the flattened index of every affine array access within
+        a sequential loop is split into a part carried by an offset
+        variable, which is computed once before the loop where it becomes
+        invariant and incremented along with the loop's iname, and the
+        remainder, which is recomputed per access. This amounts to
+        loop-invariant code motion and strength reduction of index
+        arithmetic. Only has an effect on C-family targets. Defaults to
+        *False*.
+
+        .. versionadded:: 2024.2
+
     .. attribute:: check_dep_resolution
 
         Whether loopy should issue an error if a dependency
@@ -215,6 +243,11 @@ class Options(ImmutableRecord):
             "edit_cl": ("edit_code", None),
             }
 
+    # Fields that do not affect the generated code
+    _uncompared_fields: ClassVar[frozenset[str]] = frozenset({
+            "codegen_nprocs",
+            })
+
     def __init__(
             # All Boolean flags in here should default to False for the
             # string-based interface of make_options (below) to make sense.
@@ -246,6 +279,10 @@ class Options(ImmutableRecord):
                 annotate_inames=kwargs.get("annotate_inames", False),
                 trace_assignments=kwargs.get("trace_assignments", False),
                 trace_assignment_values=kwargs.get("trace_assignment_values", False),
+                codegen_nprocs=kwargs.get("codegen_nprocs",
+                    int(os.environ.get("LOOPY_CODEGEN_NPROCS", "0"))),
+                strength_reduce_indices=kwargs.get(
+                    "strength_reduce_indices", False),
 
                 skip_arg_checks=kwargs.get("skip_arg_checks",
                     sys.flags.optimize
@@ -307,12 +344,33 @@ class Options(ImmutableRecord):
         for f in self.__class__.fields:
             setattr(self, f, getattr(self, f) or getattr(other, f))
 
+    def _get_compared_field_values(self):
+        return tuple(
+                getattr(self, field_name)
+                for field_name in sorted(self.__class__.fields)
+                if field_name not in self._uncompared_fields)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        return (self.__class__ == other.__class__
+                and (self._get_compared_field_values()
+                     == other._get_compared_field_values()))
+
+    def __hash__(self):
+        # This attribute may vanish during pickling.
+        if getattr(self, "_cached_hash", None) is None:
+            self._cached_hash = hash(
+                    (type(self), *self._get_compared_field_values()))
+
+        return self._cached_hash
+
     def update_persistent_hash(self, key_hash, key_builder):
         """Custom hash computation function for use with
         :class:`pytools.persistent_dict.PersistentDict`.
         """
-        for field_name in sorted(self.__class__.fields):
-            key_builder.rec(key_hash, getattr(self, field_name))
+        for value in self._get_compared_field_values():
+            key_builder.rec(key_hash, value)
 
     @property
     def _fore(self):
@@ -80,46 +80,49 @@ _SchedItemSelfT = TypeVar("_SchedItemSelfT", bound="ScheduleItem")
 
 # {{{ schedule items
 
-@dataclass(frozen=True)
+# Linearizations of large kernels hold many of these, so they are slotted to
+# avoid carrying a per-instance __dict__.
+
+@dataclass(frozen=True, slots=True)
 class ScheduleItem:
     def copy(self: _SchedItemSelfT, **kwargs: Any) -> _SchedItemSelfT:
         return replace(self, **kwargs)
 
 
 class BeginBlockItem(ScheduleItem):
-    pass
+    __slots__ = ()
 
 
 class EndBlockItem(ScheduleItem):
-    pass
+    __slots__ = ()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EnterLoop(BeginBlockItem):
     iname: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LeaveLoop(EndBlockItem):
     iname: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunInstruction(ScheduleItem):
     insn_id: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CallKernel(BeginBlockItem):
     kernel_name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReturnFromKernel(EndBlockItem):
     kernel_name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Barrier(ScheduleItem):
     """
     .. attribute:: comment
@@ -462,6 +465,7 @@ def format_insn(kernel, insn_id):
         BarrierInstruction,
         MultiAssignmentBase,
         NoOpInstruction,
+        PrefetchInstruction,
     )
     if isinstance(insn, MultiAssignmentBase):
         return "{}{}{} = {}{}{}  {{id={}}""}".format(
@@ -477,6 +481,10 @@ def format_insn(kernel, insn_id):
                 format_insn_id(kernel, insn_id),
                 Fore.MAGENTA, insn.synchronization_kind[0], mem_kind,
                 Style.RESET_ALL)
+    elif isinstance(insn, PrefetchInstruction):
+        return "[{}] {}... prefetch {}{}".format(
+                format_insn_id(kernel, insn_id),
+                Fore.MAGENTA, insn.address, Style.RESET_ALL)
     elif isinstance(insn, NoOpInstruction):
         return "[{}] {}... nop{}".format(
                 format_insn_id(kernel, insn_id),
@@ -1907,8 +1915,8 @@ class DependencyTracker:
         if self.reverse:
             source, target = target, source
 
-        target_deps = self.kernel.recursive_insn_dep_map()[target.id]
-        if source.id in target_deps:
+        if self.kernel.get_instruction_index().depends_on_recursively(
+                target.id, source.id):
             if self.reverse:
                 dep_descr = "{tgt} rev-depends on {src}"
             else:
@@ -1371,6 +1371,10 @@ class AccessFootprintGatherer(CombineMapper):
     def map_variable(self, expr):
         return {}
 
+    def map_reduction(self, expr):
+        # The reduction inames must be part of self.domain.
+        return self.rec(expr.expr)
+
     def map_subscript(self, expr):
         subscript = expr.index
 
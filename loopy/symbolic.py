@@ -35,6 +35,7 @@ from typing import (
     ClassVar,
     Concatenate,
     Generic,
+    Hashable,
     Mapping,
     Sequence,
     TypeAlias,
@@ -138,6 +139,14 @@ Expression Manipulation Helpers
 
 .. autofunction:: simplify_using_aff
 
+Expression Interning
+^^^^^^^^^^^^^^^^^^^^
+
+.. autofunction:: intern_expr
+.. autofunction:: clear_interned_expressions
+.. autofunction:: set_interning_enabled
+.. autoclass:: InterningMode
+
 References
 ^^^^^^^^^^
 
@@ -1303,12 +1312,56 @@ class RuleAwareIdentityMapper(IdentityMapper[Concatenate[ExpansionState, P]]):
 
     Subclasses of this must be careful to not touch identifiers that
     are in :attr:`ExpansionState.arg_context`.
+
+    .. automethod:: get_subst_rule_cache_key
     """
 
     def __init__(self, rule_mapping_context: SubstitutionRuleMappingContext) -> None:
         self.rule_mapping_context = rule_mapping_context
         super().__init__()
 
+        self._subst_rule_cache: dict[Hashable, Expression] = {}
+
+    def get_subst_rule_cache_key(
+                self, name: str, tags, arguments: tuple[Expression, ...],
+                expn_state: ExpansionState
+            ) -> Hashable | None:
+        """Return a key under which the result of :meth:`map_subst_rule` for
+        an invocation of the rule *name* with (mapped) *arguments* is cached,
+        or *None* to not cache it, which is the default.
+
+        The key must capture everything the result depends on, possibly
+        including the instruction and the expansion stack in *expn_state*,
+        and :meth:`map_subst_rule` must not have side effects other than
+        registering rules with :attr:`rule_mapping_context`. Since rules are
+        looked up in the :attr:`rule_mapping_context` of the mapper, which is
+        fixed, the cache lives as long as the mapper.
+        """
+        return None
+
+    def _map_subst_rule_cached(
+                self, name: str, tags, arguments: tuple[Expression, ...],
+                expn_state: ExpansionState,
+                *args: P.args, **kwargs: P.kwargs
+            ) -> Expression:
+        key = None
+        if not args and not kwargs:
+            key = self.get_subst_rule_cache_key(
+                    name, tags, arguments, expn_state)
+
+        if key is None:
+            return self.map_subst_rule(
+                    name, tags, arguments, expn_state, *args, **kwargs)
+
+        try:
+            return self._subst_rule_cache[key]
+        except KeyError:
+            pass
+
+        result = self.map_subst_rule(name, tags, arguments, expn_state)
+        self._subst_rule_cache[key] = result
+        return result
+
     def map_variable(
                 self, expr: Variable, expn_state: ExpansionState,
                 *args: P.args, **kwargs: P.kwargs
@@ -1317,7 +1370,8 @@ class RuleAwareIdentityMapper(IdentityMapper[Concatenate[ExpansionState, P]]):
         if name not in self.rule_mapping_context.old_subst_rules:
             return super().map_variable(expr, expn_state, *args, **kwargs)
         else:
-            return self.map_subst_rule(name, tags, (), expn_state, *args, **kwargs)
+            return self._map_subst_rule_cached(
+                    name, tags, (), expn_state, *args, **kwargs)
 
     def map_call(
                 self, expr: p.Call, expn_state: ExpansionState,
@@ -1331,7 +1385,7 @@ class RuleAwareIdentityMapper(IdentityMapper[Concatenate[ExpansionState, P]]):
         if name not in self.rule_mapping_context.old_subst_rules:
             return super().map_call(expr, expn_state, *args, **kwargs)
         else:
-            return self.map_subst_rule(name, tags,
+            return self._map_subst_rule_cached(name, tags,
                                          self.rec(expr.parameters,
                                                   expn_state,
                                                   *args,
@@ -1393,13 +1447,18 @@ class RuleAwareIdentityMapper(IdentityMapper[Concatenate[ExpansionState, P]]):
         from loopy.kernel.data import InstructionBase
         assert insn is None or isinstance(insn, InstructionBase)
 
-        return super().__call__(expr,
+        result = super().__call__(expr,
                 ExpansionState(
                     kernel=kernel,
                     instruction=insn,
                     stack=(),
                     arg_context=immutables.Map()))
 
+        if INTERNING_ENABLED:
+            result = intern_expr(result)
+
+        return result
+
     def map_instruction(self, kernel, insn):
         return insn
 
@@ -1450,6 +1509,12 @@ class RuleAwareIdentityMapper(IdentityMapper[Concatenate[ExpansionState, P]]):
                            temporary_variables=new_tvs)
 
 
+def _matches_every_stack(within) -> bool:
+    from loopy.match import StackAllMatchComponent, StackMatch
+    return (isinstance(within, StackMatch)
+            and isinstance(within.root_component, StackAllMatchComponent))
+
+
 class RuleAwareSubstitutionMapper(RuleAwareIdentityMapper[[]]):
     """
     Mapper to substitute expressions and record any divergence of substitution
@@ -1487,6 +1552,12 @@ class RuleAwareSubstitutionMapper(RuleAwareIdentityMapper[[]]):
         else:
             return self._within(kernel, instruction, stack)
 
+    def get_subst_rule_cache_key(self, name, tags, arguments, expn_state):
+        if not _matches_every_stack(self._within):
+            return None
+
+        return (name, tags, arguments, expn_state.arg_context)
+
     def map_variable(self, expr: Variable, expn_state: ExpansionState) -> Expression:
         if (expr.name in expn_state.arg_context
                 or not self.within(
@@ -1510,6 +1581,12 @@ class RuleAwareSubstitutionRuleExpander(RuleAwareIdentityMapper[[]]):
         self.rules = rules
         self.within = within
 
+    def get_subst_rule_cache_key(self, name, tags, arguments, expn_state):
+        if not _matches_every_stack(self.within):
+            return None
+
+        return (name, tags, arguments, expn_state.arg_context)
+
     def map_subst_rule(
                 self, name: str, tags, arguments, expn_state: ExpansionState
             ) -> Expression:
@@ -1765,9 +1842,126 @@ class LoopyParser(ParserBase):
 
 
 def parse(expr_str):
-    return VarToTaggedVarMapper()(
+    result = VarToTaggedVarMapper()(
             FunctionToPrimitiveMapper()(LoopyParser()(expr_str)))
 
+    if INTERNING_ENABLED:
+        result = intern_expr(result)
+
+    return result
+
+# }}}
+
+
+# {{{ expression interning
+
+INTERNING_ENABLED = False
+
+_INTERNED_EXPRESSIONS: dict[Hashable, p.ExpressionNode] = {}
+
+
+def set_interning_enabled(flag: bool) -> None:
+    """Set whether expressions created by :func:`parse` and by
+    :class:`RuleAwareIdentityMapper` are interned by :func:`intern_expr`.
+    Interning is disabled by default.
+
+    .. versionadded:: 2024.2
+    """
+    global INTERNING_ENABLED
+    INTERNING_ENABLED = flag
+
+
+class InterningMode:
+    """A context manager for setting whether expressions are interned, see
+    :func:`set_interning_enabled`.
+
+    .. versionadded:: 2024.2
+    """
+
+    def __init__(self, new_flag: bool) -> None:
+        self.new_flag = new_flag
+
+    def __enter__(self) -> None:
+        global INTERNING_ENABLED
+        self.previous_mode = INTERNING_ENABLED
+        INTERNING_ENABLED = self.new_flag
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        global INTERNING_ENABLED
+        INTERNING_ENABLED = self.previous_mode
+        del self.previous_mode
+
+
+def _get_interning_key(value: object) -> Hashable:
+    if isinstance(value, p.ExpressionNode):
+        # *value* is interned already.
+        return (type(value), id(value))
+    elif isinstance(value, tuple):
+        return (tuple, tuple(_get_interning_key(child) for child in value))
+    elif isinstance(value, (float, complex, np.inexact)):
+        # distinguishes 0. and -0.
+        return (type(value), value, repr(value))
+    else:
+        # Equal constants of different types, such as 2 and 2.0, do not
+        # lead to the same code.
+        return (type(value), value)
+
+
+class ExpressionInterner(IdentityMapper[[]]):
+    """Maps each expression node to the canonical instance among the nodes
+    structurally equal to it in *table*, adding it to *table* if there is
+    none.
+
+    Since children are interned before their parents, nodes are looked up in
+    *table* by the identities of their children. Constants are looked up by
+    their value and their type, as equal constants of different types (such
+    as ``2`` and ``2.0``) are not interchangeable.
+    """
+
+    def __init__(
+            self,
+            table: dict[Hashable, p.ExpressionNode] | None = None
+            ) -> None:
+        super().__init__()
+        if table is None:
+            table = {}
+        self.table = table
+
+    def __call__(self, expr: Expression) -> Expression:
+        result = super().__call__(expr)
+        if isinstance(result, p.ExpressionNode):
+            key = (type(result), tuple(
+                _get_interning_key(getattr(result, name))
+                for name in result.init_arg_names))
+            result = self.table.setdefault(key, result)
+        return result
+
+    rec = __call__
+
+
+def intern_expr(expr: ArithmeticOrExpressionT) -> ArithmeticOrExpressionT:
+    """Return an expression equal to *expr* in which all subexpressions are
+    interned, i.e. are the same object as all equal subexpressions previously
+    interned by this function. Equal interned expressions compare equal by
+    identity, which makes comparing them and looking them up in the caches
+    of mappers cheap.
+
+    Interned expressions are kept alive until
+    :func:`clear_interned_expressions` is called.
+
+    .. versionadded:: 2024.2
+    """
+    return cast("ArithmeticOrExpressionT",
+                ExpressionInterner(_INTERNED_EXPRESSIONS)(expr))
+
+
+def clear_interned_expressions() -> None:
+    """Forget all expressions interned by :func:`intern_expr`.
+
+    .. versionadded:: 2024.2
+    """
+    _INTERNED_EXPRESSIONS.clear()
+
 # }}}
 
 
@@ -1801,6 +1995,9 @@ class ArrayAccessFinder(CombineMapper[AbstractSet[p.Subscript], []]):
     def map_algebraic_leaf(self, expr) -> AbstractSet[p.Subscript]:
         return set()
 
+    def map_resolved_function(self, expr) -> AbstractSet[p.Subscript]:
+        return set()
+
     def map_subscript(self, expr) -> AbstractSet[p.Subscript]:
         assert isinstance(expr.aggregate, p.Variable)
 
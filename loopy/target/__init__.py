@@ -267,6 +267,52 @@ class ASTBuilderBase(Generic[ASTType]):
     def emit_unroll_hint(self, value):
         raise NotImplementedError()
 
+    @property
+    def can_implement_offset_increments(self):
+        """Whether :meth:`emit_sequential_loop` accepts an *offset_increments*
+        keyword argument, a sequence of ``(name, increment)`` tuples of
+        variables to be incremented along with the loop's iname, see
+        :attr:`loopy.Options.strength_reduce_indices`.
+        """
+        return False
+
+    @property
+    def can_implement_simd_loops(self):
+        """Whether loops over :class:`~loopy.kernel.data.VectorizeTag`-tagged
+        inames may be emitted as sequential loops carrying the hint from
+        :meth:`emit_simd_hint`, instead of being mapped onto vector types.
+        """
+        return False
+
+    def emit_simd_hint(self):
+        raise NotImplementedError()
+
+    @property
+    def can_implement_thread_parallel_loops(self):
+        """Whether loops over
+        :class:`~loopy.kernel.data.ThreadParallelTag`-tagged inames may be
+        emitted as sequential loops carrying the hint from
+        :meth:`emit_thread_parallel_loop_hint`, whose iterations are then
+        distributed across threads. See :func:`loopy.realize_reduction`.
+        """
+        return False
+
+    def emit_thread_parallel_loop_hint(self, private_names):
+        """
+        :arg private_names: the names of the variables declared outside of
+            the loop that must be private to each thread.
+        """
+        raise NotImplementedError()
+
+    def emit_prefetch(self, codegen_state, address):
+        """
+        :arg address: a :class:`pymbolic.primitives.Subscript` of the array
+            element to prefetch.
+        :returns: a statement prefetching *address*, or *None* if the target
+            does not support prefetching.
+        """
+        return None
+
     @property
     def can_implement_conditionals(self):
         return False
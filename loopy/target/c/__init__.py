@@ -25,7 +25,7 @@ THE SOFTWARE.
 """
 
 import re
-from typing import TYPE_CHECKING, Any, Sequence, cast
+from typing import TYPE_CHECKING, AbstractSet, Any, Sequence, cast
 
 import numpy as np
 
@@ -129,8 +129,17 @@ class DTypeRegistryWrapper:
 class InfOrNanInExpressionRecorder(IdentityMapper):
     def __init__(self):
         self.saw_inf_or_nan = False
+        self.saw_integer_limit = False
         super().__init__()
 
+    def map_variable(self, expr):
+        # as used by the neutral elements of min/max reductions
+        if expr.name in ["INFINITY", "HUGE_VAL"]:
+            self.saw_inf_or_nan = True
+        elif expr.name in ["INT_MAX", "INT_MIN", "LONG_MAX", "LONG_MIN"]:
+            self.saw_integer_limit = True
+        return super().map_variable(expr)
+
     def map_constant(self, expr):
         if (np.isinf(expr) or np.isnan(expr) or np.isnan(expr)):
             self.saw_inf_or_nan = True
@@ -163,6 +172,8 @@ def c99_preamble_generator(preamble_info):
 
     if inf_or_nan_recorder.saw_inf_or_nan:
         yield ("10_math", "#include <math.h>")
+    if inf_or_nan_recorder.saw_integer_limit:
+        yield ("10_limits", "#include <limits.h>")
 
     # }}}
 
@@ -491,6 +502,14 @@ def c_symbol_mangler(kernel, name):
     if name in ["INT_MAX", "INT_MIN"]:
         return NumpyType(np.dtype(np.int32)), name
 
+    # neutral elements of min/max reductions, see loopy.library.reduction
+    if name == "INFINITY":
+        return NumpyType(np.dtype(np.float32)), name
+    if name == "HUGE_VAL":
+        return NumpyType(np.dtype(np.float64)), name
+    if name in ["LONG_MAX", "LONG_MIN"]:
+        return NumpyType(np.dtype(np.int64)), name
+
     return None
 
 # }}}
@@ -875,16 +894,11 @@ class CFamilyASTBuilder(ASTBuilderBase[Generable]):
 
         if codegen_state.is_entrypoint:
             name: Declarator = Value("void", name_str)
-
-            # subkernel launches occur only as part of entrypoint kernels for now
-            from loopy.schedule.tools import get_subkernel_arg_info
-            skai = get_subkernel_arg_info(kernel, subkernel_name)
-            passed_names = skai.passed_names
-            written_names = skai.written_names
         else:
             name = Value("static void", name_str)
-            passed_names = [arg.name for arg in kernel.args]
-            written_names = kernel.get_written_variables()
+
+        passed_names, written_names = self._get_passed_and_written_names(
+                codegen_state, subkernel_name)
 
         return [], FunctionDeclarationWrapper(
                 FunctionDeclaration(
@@ -894,6 +908,20 @@ class CFamilyASTBuilder(ASTBuilderBase[Generable]):
                             is_written=arg_name in written_names)
                         for arg_name in passed_names]))
 
+    def _get_passed_and_written_names(
+            self, codegen_state: CodeGenerationState, subkernel_name: str
+            ) -> tuple[Sequence[str], AbstractSet[str]]:
+        kernel = codegen_state.kernel
+
+        if codegen_state.is_entrypoint:
+            # subkernel launches occur only as part of entrypoint kernels for now
+            from loopy.schedule.tools import get_subkernel_arg_info
+            skai = get_subkernel_arg_info(kernel, subkernel_name)
+            return skai.passed_names, skai.written_names
+        else:
+            return ([arg.name for arg in kernel.args],
+                    kernel.get_written_variables())
+
     def get_kernel_call(self, codegen_state: CodeGenerationState,
             subkernel_name: str,
             gsize: tuple[Expression, ...],
@@ -1272,8 +1300,12 @@ class CFamilyASTBuilder(ASTBuilderBase[Generable]):
                     CExpression(self.get_c_expression_to_code_mapper(),
                                 in_knl_callable_as_call))
 
+    @property
+    def can_implement_offset_increments(self):
+        return True
+
     def emit_sequential_loop(self, codegen_state, iname, iname_dtype,
-            lbound, ubound, inner, hints):
+            lbound, ubound, inner, hints, offset_increments=()):
         ecm = codegen_state.expression_to_code_mapper
 
         from cgen import For, InlineInitializer
@@ -1291,7 +1323,10 @@ class CFamilyASTBuilder(ASTBuilderBase[Generable]):
                         "<=",
                         ubound),
                     PREC_NONE, "i"),
-                "++%s" % iname,
+                ", ".join([
+                    "++%s" % iname,
+                    *(f"{name} += {ecm(increment, PREC_NONE, 'i')}"
+                        for name, increment in offset_increments)]),
                 inner)
 
         if hints:
@@ -1389,8 +1424,35 @@ class CTarget(CFamilyTarget):
     """This target may emit code using all features of C99.
     For a target base supporting "least-common-denominator" C,
     see :class:`CFamilyTarget`.
+
+    :arg omp_simd: If *True*, loops over inames tagged ``vec`` are emitted
+        as ``#pragma omp simd`` loops over the full iname bounds. Loop
+        bounds need not be constant, and the remainder iterations are
+        masked by the compiler. Since the loop body stays scalar code,
+        calls to math functions can be mapped to their vector variants
+        where the C library declares them (e.g. glibc's ``libmvec`` with
+        ``-ffast-math``). If *False* (the default), ``vec`` loops fall back
+        to unrolling, as C has no vector types.
+
+        .. versionadded:: 2024.2
+
+    :arg openmp: If *True*, reductions and scans over inames tagged ``g``
+        are realized using CPU threads, as ``#pragma omp parallel for``
+        loops computing per-thread partial results followed by a combine
+        phase, see :func:`loopy.realize_reduction`. Other ``g``-tagged
+        inames remain unsupported.
+
+        .. versionadded:: 2024.2
     """
 
+    hash_fields = (*CFamilyTarget.hash_fields, "omp_simd", "openmp")
+    comparison_fields = (*CFamilyTarget.comparison_fields, "omp_simd", "openmp")
+
+    def __init__(self, fortran_abi=False, omp_simd=False, openmp=False):
+        self.omp_simd = omp_simd
+        self.openmp = openmp
+        super().__init__(fortran_abi=fortran_abi)
+
     def get_device_ast_builder(self):
         return CASTBuilder(self)
 
@@ -1412,6 +1474,66 @@ class CASTBuilder(CFamilyASTBuilder):
         return (
                 [*super().preamble_generators(), c99_preamble_generator])
 
+    @property
+    def can_implement_simd_loops(self):
+        return self.target.omp_simd
+
+    def emit_simd_hint(self):
+        from cgen import Pragma
+        return Pragma("omp simd")
+
+    @property
+    def can_implement_thread_parallel_loops(self):
+        return self.target.openmp
+
+    def emit_thread_parallel_loop_hint(self, private_names):
+        from cgen import Pragma
+        if private_names:
+            return Pragma("omp parallel for private(%s)"
+                    % ", ".join(private_names))
+        else:
+            return Pragma("omp parallel for")
+
+    def emit_prefetch(self, codegen_state, address):
+        from cgen import ExpressionStatement
+        from pymbolic import var
+
+        ecm = codegen_state.expression_to_code_mapper
+        return ExpressionStatement(CExpression(
+                self.get_c_expression_to_code_mapper(),
+                var("__builtin_prefetch")(
+                    var("&")(ecm(address, PREC_NONE, type_context=None).expr))))
+
+    def get_temporary_decls(self, codegen_state, schedule_index):
+        result = super().get_temporary_decls(codegen_state, schedule_index)
+
+        # {{{ tell the compiler about the alignment of array arguments
+
+        kernel = codegen_state.kernel
+        passed_names, _ = self._get_passed_and_written_names(
+                codegen_state, kernel.linearization[schedule_index].kernel_name)
+
+        from cgen import Assign, Line
+
+        alignment_assumptions = []
+        for name in passed_names:
+            if name in kernel.all_inames():
+                continue
+
+            var_descr = kernel.get_var_descriptor(name)
+            if (isinstance(var_descr, (ArrayArg, TemporaryVariable))
+                    and var_descr.alignment):
+                # C allows assigning the 'void *' to any object pointer.
+                alignment_assumptions.append(Assign(name,
+                    f"__builtin_assume_aligned({name}, {var_descr.alignment})"))
+
+        if alignment_assumptions:
+            result = [*result, *alignment_assumptions, Line()]
+
+        # }}}
+
+        return result
+
 # }}}
 
 
@@ -1425,8 +1547,10 @@ class ExecutableCTarget(CTarget):
     """
     An executable CFamilyTarget that uses (by default) JIT compilation of C-code
     """
-    def __init__(self, compiler=None, fortran_abi=False):
-        super().__init__(fortran_abi=fortran_abi)
+    def __init__(self, compiler=None, fortran_abi=False, omp_simd=False,
+            openmp=False):
+        super().__init__(fortran_abi=fortran_abi, omp_simd=omp_simd,
+                openmp=openmp)
         from loopy.target.c.c_execution import CCompiler
         self.compiler = compiler or CCompiler()
 
@@ -36,6 +36,7 @@ from codepy.toolchain import GCCToolchain, ToolchainGuessError, guess_toolchain
 
 from pytools import memoize_method
 from pytools.codegen import CodeGenerator, Indentation
+from pytools.persistent_dict import WriteOncePersistentDict
 from pytools.prefork import ExecError
 
 from loopy.kernel.array import ArrayBase
@@ -44,7 +45,9 @@ from loopy.target.execution import (
     ExecutorBase,
     get_highlighted_code,
 )
+from loopy.tools import LoopyKeyBuilder, caches
 from loopy.types import LoopyType
+from loopy.version import DATA_MODEL_VERSION
 
 
 if TYPE_CHECKING:
@@ -153,9 +156,14 @@ class CExecutionWrapperGenerator(ExecutionWrapperGeneratorBase):
         strides = get_strides(arg)
         order = "'C'" if (arg.shape == () or strides[-1] == 1) else "'F'"
 
-        gen(f"{arg.name} = _lpy_np.empty({strify(sym_shape)}, "
-                f"{self.python_dtype_str(gen, arg.dtype.numpy_dtype)}, "
-                f"order={order})")
+        if arg.alignment:
+            gen(f"{arg.name} = _lpy_tools.empty_aligned({strify(sym_shape)}, "
+                    f"{self.python_dtype_str(gen, arg.dtype.numpy_dtype)}, "
+                    f"order={order}, n={arg.alignment})")
+        else:
+            gen(f"{arg.name} = _lpy_np.empty({strify(sym_shape)}, "
+                    f"{self.python_dtype_str(gen, arg.dtype.numpy_dtype)}, "
+                    f"order={order})")
 
         expected_strides = tuple(
                 var("_lpy_expected_strides_%s" % i)
@@ -184,6 +192,9 @@ class CExecutionWrapperGenerator(ExecutionWrapperGeneratorBase):
         Add default C-imports to preamble
         """
         gen.add_to_preamble("import numpy as _lpy_np")
+        # a module rather than the function, so that the (pickled) wrapper
+        # keeps the function's globals
+        gen.add_to_preamble("import loopy.tools as _lpy_tools")
         gen.add_to_preamble(DEF_EVEN_DIV_FUNCTION)
 
     def initialize_system_args(self, gen):
@@ -232,6 +243,16 @@ class CExecutionWrapperGenerator(ExecutionWrapperGeneratorBase):
     def get_arg_pass(self, arg):
         return arg.name
 
+    def generate_alignment_check(self, gen, arg):
+        # The generated code tells the compiler that the data is aligned,
+        # see CASTBuilder.get_temporary_decls.
+        gen(f"if {arg.name}.ctypes.data % {arg.alignment}:")
+        with Indentation(gen):
+            gen(f"raise ValueError(\"Argument '{arg.name}' is not aligned "
+                    f"to {arg.alignment} bytes (address: 0x%x). Try allocating "
+                    "it with loopy.tools.empty_aligned().\" "
+                    f"% {arg.name}.ctypes.data)")
+
 # }}}
 
 
@@ -324,9 +345,13 @@ class CCompiler:
         """Build temporary filename path in tempdir."""
         return os.path.join(self.tempdir, name)
 
-    def build(self, name, code, debug=False, wait_on_error=None,
-              debug_recompile=True, extra_build_options: Sequence[str] = ()):
-        """Compile code, build and load shared library."""
+    def build_shared_library(self, name, code, debug=False, wait_on_error=None,
+              debug_recompile=True, extra_build_options: Sequence[str] = ()
+              ) -> str:
+        """Compile code and build a shared library, returning its file name.
+
+        .. versionadded:: 2024.2
+        """
         logger.debug(code)
         c_fname = self._tempname("code." + self.source_suffix)
 
@@ -344,7 +369,31 @@ class CCompiler:
         else:
             logger.debug(f"Kernel {name} retrieved from cache")
 
-        # and return compiled
+        return ext_file
+
+    def build(self, name, code, debug=False, wait_on_error=None,
+              debug_recompile=True, extra_build_options: Sequence[str] = ()):
+        """Compile code, build and load shared library."""
+        return ctypes.CDLL(self.build_shared_library(
+            name, code, debug, wait_on_error, debug_recompile,
+            extra_build_options))
+
+    def load_shared_library(self, name: str, binary: bytes):
+        """Load a shared library from *binary*, the contents of a file
+        returned by :meth:`build_shared_library`.
+
+        .. versionadded:: 2024.2
+        """
+        from hashlib import sha256
+
+        # The library's contents go into its file name, as libraries loaded
+        # from a path that was loaded before are not reloaded.
+        ext_file = self._tempname("%s-%s%s" % (
+            name, sha256(binary).hexdigest()[:16], self.toolchain.so_ext))
+        if not os.path.exists(ext_file):
+            with open(ext_file, "wb") as outf:
+                outf.write(binary)
+
         return ctypes.CDLL(ext_file)
 
 # }}}
@@ -395,7 +444,17 @@ if hasattr(np, "complex256"):
 
 # {{{ _args_to_ctypes
 
-def _args_to_ctypes(kernel: LoopKernel, passed_names: Sequence[str]):
+def _get_arg_types(
+        kernel: LoopKernel, passed_names: Sequence[str]
+        ) -> tuple[tuple[LoopyType, bool], ...]:
+    """Return a tuple of *(dtype, is_array)* for each of *passed_names*."""
+    return tuple(
+            (kernel.arg_dict[arg_name].dtype,
+             isinstance(kernel.arg_dict[arg_name], ArrayBase))
+            for arg_name in passed_names)
+
+
+def _args_to_ctypes(arg_types: Sequence[tuple[LoopyType, bool]]):
     def _dtype_to_ctype(dtype):
         """Map NumPy dtype to equivalent ctypes type."""
         if dtype.is_complex():
@@ -407,16 +466,25 @@ def _args_to_ctypes(kernel: LoopKernel, passed_names: Sequence[str]):
         return basetype
 
     arg_info = []
-    for arg_name in passed_names:
-        arg = kernel.arg_dict[arg_name]
-
-        ctype = _dtype_to_ctype(arg.dtype)
-        if isinstance(arg, ArrayBase):
+    for dtype, is_array in arg_types:
+        ctype = _dtype_to_ctype(dtype)
+        if is_array:
             ctype = ctypes.POINTER(ctype)
         arg_info.append(ctype)
 
     return arg_info
 
+
+def _get_build_options(kernel: LoopKernel) -> tuple[str, ...]:
+    build_options = list(kernel.options.build_options)
+    if kernel.target.openmp:
+        build_options.append("-fopenmp")
+    elif kernel.target.omp_simd:
+        # honor '#pragma omp simd' without linking an OpenMP runtime
+        build_options.append("-fopenmp-simd")
+
+    return tuple(build_options)
+
 # }}}
 
 
@@ -436,14 +504,36 @@ class CompiledCKernel:
         # get code and build
         self.code = dev_code
         self.comp = comp if comp is not None else CCompiler()
-        self.dll = self.comp.build(devprog.name, self.code,
-                                   extra_build_options=kernel.options.build_options)
+
+        self._load(devprog.name,
+                   self.comp.build(devprog.name, self.code,
+                                   extra_build_options=_get_build_options(kernel)),
+                   _get_arg_types(kernel, passed_names))
+
+    @classmethod
+    def from_artifact(cls, artifact: CExecutableArtifact, name: str,
+            comp: CCompiler | None = None) -> CompiledCKernel:
+        """Load the kernel *name* of *artifact*, without needing the kernel
+        it was generated from.
+        """
+        result = cls.__new__(cls)
+        result.code = artifact.code
+        result.comp = comp if comp is not None else CCompiler()
+
+        binary = artifact.shared_libraries[artifact.kernel_names.index(name)]
+        result._load(name, result.comp.load_shared_library(name, binary),
+                     artifact.arg_types)
+        return result
+
+    def _load(self, name: str, dll: ctypes.CDLL,
+            arg_types: Sequence[tuple[LoopyType, bool]]) -> None:
+        self.dll = dll
 
         # get the function declaration for interface with ctypes
-        self._fn = getattr(self.dll, devprog.name)
+        self._fn = getattr(self.dll, name)
         # kernels are void by defn.
         self._fn.restype = None
-        self._fn.argtypes = _args_to_ctypes(kernel, passed_names)
+        self._fn.argtypes = _args_to_ctypes(arg_types)
 
     def __call__(self, *args):
         """Execute kernel with given args mapped to ctypes equivalents."""
@@ -465,11 +555,62 @@ class CompiledCKernel:
 
 @dataclass(frozen=True)
 class _KernelInfo:
-    t_unit: TranslationUnit
     c_kernels: Sequence[CompiledCKernel]
     invoker: Callable[..., Any]
 
 
+# {{{ executable artifact cache
+
+@dataclass(frozen=True)
+class CExecutableArtifact:
+    """Everything :class:`CExecutor` needs to run a translation unit, so that
+    warm calls need neither its kernels nor code generation.
+
+    .. attribute:: code
+
+        The device and host code.
+
+    .. attribute:: kernel_names
+
+        The names of the device programs in :attr:`code`.
+
+    .. attribute:: shared_libraries
+
+        The contents of the shared libraries built from :attr:`code`, one
+        for each of :attr:`kernel_names`.
+
+    .. attribute:: arg_types
+
+        A tuple of *(dtype, is_array)* for each argument passed to the
+        device programs.
+
+    .. attribute:: invoker
+
+        The generated Python function launching the device programs.
+
+    .. versionadded:: 2024.2
+    """
+    code: str
+    kernel_names: tuple[str, ...]
+    shared_libraries: tuple[bytes, ...]
+    arg_types: tuple[tuple[LoopyType, bool], ...]
+    invoker: Callable[..., Any]
+
+
+c_executable_artifact_cache: WriteOncePersistentDict[
+    tuple[str, Any, TranslationUnit, str, Map[str, LoopyType] | None],
+    CExecutableArtifact
+] = WriteOncePersistentDict(
+        "loopy-c-executable-artifact-cache-v1-"+DATA_MODEL_VERSION,
+        key_builder=LoopyKeyBuilder(),
+        safe_sync=False)
+
+
+caches.append(c_executable_artifact_cache)
+
+# }}}
+
+
 # {{{ CExecutor
 
 class CExecutor(ExecutorBase):
@@ -498,9 +639,9 @@ class CExecutor(ExecutorBase):
     def get_wrapper_generator(self):
         return CExecutionWrapperGenerator()
 
-    @memoize_method
-    def translation_unit_info(self,
-            arg_to_dtype: Map[str, LoopyType] | None = None) -> _KernelInfo:
+    def get_executable_artifact_uncached(
+            self, arg_to_dtype: Map[str, LoopyType] | None
+            ) -> CExecutableArtifact:
         t_unit = self.get_typed_and_scheduled_translation_unit(arg_to_dtype)
 
         from loopy.codegen import generate_code_v2
@@ -508,38 +649,86 @@ class CExecutor(ExecutorBase):
 
         dev_code = codegen_result.device_code()
         host_code = codegen_result.host_code()
-        all_code = "\n".join([dev_code, "", host_code])
-
-        if t_unit[self.entrypoint].options.write_code:
-            output = all_code
-            if t_unit[self.entrypoint].options.allow_terminal_colors:
-                output = get_highlighted_code(output)
-
-            if t_unit[self.entrypoint].options.write_code is True:
-                print(output)
-            else:
-                with open(t_unit[self.entrypoint].options.write_code, "w") as outf:
-                    outf.write(output)
 
         if t_unit[self.entrypoint].options.edit_code:
             from pytools import invoke_editor
             dev_code = invoke_editor(dev_code, "code.c")
-            # update code from editor
-            all_code = "\n".join([dev_code, "", host_code])
-
-        c_kernels = []
 
         from loopy.schedule.tools import get_kernel_arg_info
-        kai = get_kernel_arg_info(t_unit[self.entrypoint])
-        for dp in codegen_result.device_programs:
-            c_kernels.append(CompiledCKernel(
-                t_unit[self.entrypoint], dp, kai.passed_names, all_code,
-                self.compiler))
+        knl = t_unit[self.entrypoint]
+        kai = get_kernel_arg_info(knl)
+
+        code = "\n".join([dev_code, "", host_code])
+        kernel_names = tuple(dp.name for dp in codegen_result.device_programs)
+
+        shared_libraries = []
+        for name in kernel_names:
+            with open(self.compiler.build_shared_library(
+                    name, code, extra_build_options=_get_build_options(knl)),
+                    "rb") as inf:
+                shared_libraries.append(inf.read())
+
+        return CExecutableArtifact(
+                code=code,
+                kernel_names=kernel_names,
+                shared_libraries=tuple(shared_libraries),
+                arg_types=_get_arg_types(knl, kai.passed_names),
+                invoker=self.get_invoker(t_unit, self.entrypoint, codegen_result))
+
+    def get_executable_artifact(
+            self, arg_to_dtype: Map[str, LoopyType] | None
+            ) -> CExecutableArtifact:
+        from loopy import CACHING_ENABLED
+
+        # Edited code must not be remembered.
+        use_cache = (CACHING_ENABLED
+                and not self.t_unit[self.entrypoint].options.edit_code)
+
+        # The shared libraries are only valid for the compiler that built them.
+        cache_key = (type(self).__name__, self.compiler.toolchain.abi_id(),
+                self.t_unit, self.entrypoint, arg_to_dtype)
+
+        if use_cache:
+            try:
+                artifact = c_executable_artifact_cache[cache_key]
+            except KeyError:
+                pass
+            else:
+                for name in artifact.kernel_names:
+                    logger.debug(f"Kernel {name} retrieved from cache")
+                return artifact
+
+        logger.debug("%s: executable artifact cache miss" % self.entrypoint)
+
+        artifact = self.get_executable_artifact_uncached(arg_to_dtype)
+
+        if use_cache:
+            c_executable_artifact_cache.store_if_not_present(cache_key, artifact)
+
+        return artifact
+
+    @memoize_method
+    def translation_unit_info(self,
+            arg_to_dtype: Map[str, LoopyType] | None = None) -> _KernelInfo:
+        artifact = self.get_executable_artifact(arg_to_dtype)
+
+        options = self.t_unit[self.entrypoint].options
+        if options.write_code:
+            output = artifact.code
+            if options.allow_terminal_colors:
+                output = get_highlighted_code(output)
+
+            if options.write_code is True:
+                print(output)
+            else:
+                with open(options.write_code, "w") as outf:
+                    outf.write(output)
 
         return _KernelInfo(
-                t_unit=t_unit,
-                c_kernels=c_kernels,
-                invoker=self.get_invoker(t_unit, self.entrypoint, codegen_result))
+                c_kernels=[
+                    CompiledCKernel.from_artifact(artifact, name, self.compiler)
+                    for name in artifact.kernel_names],
+                invoker=artifact.invoker)
 
     def __call__(self, *args, **kwargs):
         """
@@ -294,8 +294,7 @@ class ExpressionToCExpressionMapper(IdentityMapper):
                 result = self.make_subscript(
                         ary,
                         make_var(access_info.array_name),
-                        simplify_using_aff(
-                            self.kernel, self.rec(subscript, "i")))
+                        self.map_flattened_index(subscript))
 
             if access_info.vector_index is not None:
                 return self.codegen_state.ast_builder.add_vector_access(
@@ -306,6 +305,28 @@ class ExpressionToCExpressionMapper(IdentityMapper):
         else:
             raise AssertionError()
 
+    def map_flattened_index(self, index):
+        from loopy.symbolic import simplify_using_aff
+
+        if self.codegen_state.strength_reduced_offsets:
+            from loopy.codegen.loop import split_strength_reduced_index
+            split = split_strength_reduced_index(
+                    index, self.codegen_state.strength_reduced_inames)
+
+            if split is not None:
+                terms, remainder = split
+                offset_name = self.codegen_state.strength_reduced_offsets.get(terms)
+
+                if offset_name is not None:
+                    from pymbolic.primitives import is_zero
+                    if is_zero(remainder):
+                        return var(offset_name)
+
+                    return var(offset_name) + simplify_using_aff(
+                            self.kernel, self.rec(remainder, "i"))
+
+        return simplify_using_aff(self.kernel, self.rec(index, "i"))
+
     def map_linear_subscript(self, expr, type_context):
         from pymbolic.primitives import Variable
         if not isinstance(expr.aggregate, Variable):
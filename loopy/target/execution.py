@@ -401,6 +401,14 @@ class ExecutionWrapperGeneratorBase(ABC):
     def get_arg_pass(self, arg):
         raise NotImplementedError()
 
+    def generate_alignment_check(  # noqa: B027
+            self, gen: CodeGenerator, arg: ArrayArg) -> None:
+        """
+        Generate code checking that the data of the array passed for *arg*
+        obeys :attr:`loopy.ArrayArg.alignment`, if the target is able to
+        check this. Does nothing by default.
+        """
+
     def get_strides_check_expr(self, shape, strides, expected_strides):
         assert len(shape) == len(strides) == len(expected_strides)
 
@@ -617,6 +625,9 @@ class ExecutionWrapperGeneratorBase(ABC):
                                     '")' % arg.name)
                             gen("")
 
+                    if arg.alignment:
+                        self.generate_alignment_check(gen, arg)
+
             # }}}
 
             if possibly_made_by_loopy and not options.skip_arg_checks:
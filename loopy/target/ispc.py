@@ -482,6 +482,11 @@ class ISPCASTBuilder(CFamilyASTBuilder):
         from cgen import Assign
         return Assign(ecm(lhs, prec=PREC_NONE, type_context=None), rhs_code)
 
+    @property
+    def can_implement_offset_increments(self):
+        # offsets would need to be declared 'uniform'
+        return False
+
     def emit_sequential_loop(self, codegen_state, iname, iname_dtype,
             lbound, ubound, inner, hints):
         ecm = codegen_state.expression_to_code_mapper
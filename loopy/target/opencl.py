@@ -694,6 +694,25 @@ class OpenCLCASTBuilder(CFamilyASTBuilder):
         # The 'int' avoids an 'L' suffix for long ints.
         return access_expr.attr("s%s" % hex(int(index))[2:])
 
+    def emit_prefetch(self, codegen_state, address):
+        ary = codegen_state.kernel.get_var_descriptor(address.aggregate.name)
+        if ary.address_space != AddressSpace.GLOBAL:
+            # prefetch() only applies to global memory
+            return None
+
+        from cgen import ExpressionStatement
+        from pymbolic import var
+        from pymbolic.mapper.stringifier import PREC_NONE
+
+        from loopy.target.c import CExpression
+
+        ecm = codegen_state.expression_to_code_mapper
+        return ExpressionStatement(CExpression(
+                self.get_c_expression_to_code_mapper(),
+                var("prefetch")(
+                    var("&")(ecm(address, PREC_NONE, type_context=None).expr),
+                    1)))
+
     def emit_barrier(self, synchronization_kind, mem_kind, comment):
         """
         :arg kind: ``"local"`` or ``"global"``
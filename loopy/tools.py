@@ -27,16 +27,15 @@ import collections.abc as abc
 import logging
 from functools import cached_property
 from sys import intern
+from typing import ClassVar, Protocol
+from weakref import WeakValueDictionary
 
 import numpy as np
 from immutables import Map
 
 import islpy as isl
 from pytools import ProcessLogger, memoize_method
-from pytools.persistent_dict import (
-    KeyBuilder as KeyBuilderBase,
-    WriteOncePersistentDict,
-)
+from pytools.persistent_dict import KeyBuilder as KeyBuilderBase
 
 from .symbolic import (
     RuleAwareIdentityMapper,
@@ -508,6 +507,79 @@ class LazilyUnpicklingListWithEqAndPersistentHashing(LazilyUnpicklingList):
 # }}}
 
 
+# {{{ lazily unpickling fields
+
+class LazilyUnpicklingFieldsMixin:
+    """A mixin for frozen :mod:`dataclasses` whose fields named in
+    :attr:`_lazily_unpickled_fields` are pickled individually and only
+    unpickled on first access.
+
+    Such fields must not have a default, since defaults are class attributes,
+    which would shadow the not yet unpickled value. Subclasses implement
+    pickling by way of :meth:`_get_fields_state` and :meth:`_set_fields_state`,
+    which also check :attr:`_pickle_format_version`.
+    """
+
+    # Bumped whenever the layout of the pickled state changes.
+    _pickle_format_version: ClassVar[int] = 1
+    _lazily_unpickled_fields: ClassVar[frozenset[str]] = frozenset()
+
+    def _get_fields_state(self):
+        from dataclasses import fields
+        from pickle import dumps
+
+        # Fields that were never unpickled need not be pickled again.
+        pickled_fields = self.__dict__.get("_pickled_fields", {})
+
+        attribs = {}
+        lazy_attribs = {}
+        for fld in fields(self):
+            if fld.name.startswith("_"):
+                continue
+
+            if fld.name in pickled_fields:
+                lazy_attribs[fld.name] = pickled_fields[fld.name]
+            elif not hasattr(self, fld.name):
+                continue
+            elif fld.name in self._lazily_unpickled_fields:
+                lazy_attribs[fld.name] = dumps(getattr(self, fld.name))
+            else:
+                attribs[fld.name] = getattr(self, fld.name)
+
+        return self._pickle_format_version, attribs, lazy_attribs
+
+    def _set_fields_state(self, state):
+        format_version, attribs, lazy_attribs = state
+
+        if format_version != self._pickle_format_version:
+            from loopy.diagnostic import LoopyError
+            raise LoopyError(f"cannot unpickle {type(self).__name__} stored "
+                    f"in format version {format_version}, "
+                    f"expected {self._pickle_format_version}")
+
+        for name, val in attribs.items():
+            object.__setattr__(self, name, val)
+
+        object.__setattr__(self, "_pickled_fields", dict(lazy_attribs))
+
+    def __getattr__(self, name):
+        # Only called if normal attribute lookup fails, i.e. for fields that
+        # are still pickled.
+        try:
+            pickled = self.__dict__["_pickled_fields"].pop(name)
+        except KeyError:
+            raise AttributeError(
+                    f"'{type(self).__name__}' object has no attribute '{name}'"
+                    ) from None
+
+        from pickle import loads
+        value = loads(pickled)
+        object.__setattr__(self, name, value)
+        return value
+
+# }}}
+
+
 # {{{ optional object
 
 class _no_value:  # noqa
@@ -596,7 +668,24 @@ def is_interned(s):
 
 
 def intern_frozenset_of_ids(fs):
-    return frozenset(intern(s) for s in fs)
+    return share_frozenset(frozenset(intern(s) for s in fs))
+
+
+_SHARED_FROZENSETS: WeakValueDictionary[frozenset, frozenset] = (
+        WeakValueDictionary())
+
+
+def share_frozenset(fs):
+    """Return a :class:`frozenset` equal to *fs*, reusing an existing instance
+    if one is alive. Instructions of large kernels mostly carry the same few
+    sets (e.g. of inames or of tags), so this saves storing a copy for each of
+    them. Objects other than :class:`frozenset` instances are returned
+    unchanged.
+    """
+    if type(fs) is not frozenset:
+        return fs
+
+    return _SHARED_FROZENSETS.setdefault(fs, fs)
 
 
 # {{{ t_unit_to_python
@@ -712,6 +801,8 @@ def _kernel_to_python(kernel, is_entrypoint=False, var_name="kernel"):
         ${','.join([str(a) for a in insn.assignees])} = ${insn.expression} {${opts}}
         % elif isinstance(insn, lp.BarrierInstruction):
         ... ${insn.synchronization_kind[0]}barrier {${opts}}
+        % elif isinstance(insn, lp.PrefetchInstruction):
+        ... prefetch ${insn.address} {${opts}}
         % elif isinstance(insn, lp.NoOpInstruction):
         ... nop {${opts}}
         % else:
@@ -834,7 +925,12 @@ def t_unit_to_python(t_unit, var_name="t_unit",
 
 # {{{ cache management
 
-caches: list[WriteOncePersistentDict] = []
+class _InMemCache(Protocol):
+    def clear_in_mem_cache(self) -> None:
+        ...
+
+
+caches: list[_InMemCache] = []
 
 
 def clear_in_mem_caches() -> None:
@@ -448,4 +448,184 @@ class NoOpArrayToBufferMap(ArrayToBufferMapBase):
         return domain
 # }}}
 
+# {{{ rolling storage
+
+
+@dataclass(frozen=True)
+class RollingStorageAxis:
+    """Describes a storage axis of a buffer that is indexed modulo
+    :attr:`window`, so that the buffer only holds the part of the footprint
+    needed by :attr:`window` consecutive iterations of the sequential loop
+    over :attr:`iname`. The base index of this axis advances by one per
+    iteration of that loop, so each iteration only needs to fill in (or
+    drain) one plane of the buffer.
+
+    .. attribute:: axis
+
+        The index of the storage axis among all storage axes.
+
+    .. attribute:: iname
+    .. attribute:: window
+    .. attribute:: first_iteration
+    .. attribute:: last_iteration
+    """
+
+    axis: int
+    iname: str
+    window: int
+    first_iteration: Expression
+    last_iteration: Expression
+
+    def storage_index(self, index: Expression) -> Expression:
+        """Return the index into the buffer for the absolute *index* along
+        the storage axis.
+        """
+        from pymbolic.primitives import Remainder
+        return Remainder(index, self.window)
+
+    def get_fill_predicate(self, storage_iname: str) -> Expression:
+        """Return a predicate that holds if the (0-based) *storage_iname*
+        refers to a plane that is first needed in the current iteration.
+        """
+        from pymbolic.primitives import Comparison, LogicalOr
+        return LogicalOr((
+            Comparison(var(self.iname), "==", self.first_iteration),
+            Comparison(var(storage_iname), "==", self.window - 1)))
+
+    def get_drain_predicate(self, storage_iname: str) -> Expression:
+        """Return a predicate that holds if the (0-based) *storage_iname*
+        refers to a plane that is last needed in the current iteration.
+        """
+        from pymbolic.primitives import Comparison, LogicalOr
+        return LogicalOr((
+            Comparison(var(self.iname), "==", self.last_iteration),
+            Comparison(var(storage_iname), "==", 0)))
+
+
+def find_rolling_storage_axis(kernel, abm: ArrayToBufferMapBase,
+        iname: str) -> RollingStorageAxis:
+    """Return a :class:`RollingStorageAxis` for the one storage axis of *abm*
+    whose base index advances by one per iteration of *iname*. Raise a
+    :exc:`loopy.diagnostic.LoopyError` if there is no such axis or if the
+    buffer may not roll along *iname*.
+    """
+    from loopy.diagnostic import LoopyError
+    from loopy.kernel.data import ConcurrentTag
+    from loopy.symbolic import CoefficientCollector, aff_from_expr
+
+    if iname not in kernel.all_inames():
+        raise LoopyError(f"rolling iname '{iname}' is not a known iname")
+
+    if kernel.iname_tags_of_type(iname, ConcurrentTag):
+        raise LoopyError(f"rolling iname '{iname}' must be a sequential loop")
+
+    if not isinstance(abm, ArrayToBufferMap):
+        raise LoopyError(f"buffer has no storage axes to roll along '{iname}'")
+
+    rolling_axes = [
+            i for i, base_index in enumerate(abm.storage_base_indices)
+            if abm.non1_storage_axis_flags[i]
+            and iname in get_dependencies(base_index)]
+
+    if len(rolling_axes) != 1:
+        raise LoopyError(f"exactly one storage axis must move along '{iname}' "
+                f"to roll the buffer along it, found {len(rolling_axes)}")
+
+    axis, = rolling_axes
+    base_index = abm.storage_base_indices[axis]
+
+    if (get_dependencies(base_index) & kernel.all_inames()) != {iname}:
+        raise LoopyError(f"base index '{base_index}' of storage axis {axis} "
+                f"depends on inames other than '{iname}'")
+    if CoefficientCollector([iname])(base_index).get(var(iname)) != 1:
+        raise LoopyError(f"base index '{base_index}' of storage axis {axis} "
+                f"does not advance by one per iteration of '{iname}'")
+
+    non1_axis = sum(abm.non1_storage_axis_flags[:axis])
+    window = abm.non1_storage_shape[non1_axis]
+    if not isinstance(window, int):
+        raise LoopyError(f"length '{window}' of storage axis {axis} "
+                "must be a constant to roll the buffer")
+
+    # {{{ check that the footprint along the axis is the same for each iteration
+
+    storage_axis_name = abm.storage_axis_names[axis]
+    domain = abm.aug_domain
+    domain = domain.project_out_except(
+            [name for name in (iname, storage_axis_name)
+             if name in domain.get_var_dict(dim_type.set)],
+            [dim_type.set])
+
+    sax_dim_type, sax_idx = domain.get_var_dict()[storage_axis_name]
+    full_window = domain.eliminate(sax_dim_type, sax_idx, 1)
+    for bound in [var(storage_axis_name), window - 1 - var(storage_axis_name)]:
+        full_window = full_window.add_constraint(
+                isl.Constraint.inequality_from_aff(
+                    aff_from_expr(full_window.space, bound)))
+
+    if not full_window.is_subset(domain):
+        raise LoopyError(f"footprint along storage axis {axis} varies across "
+                f"iterations of '{iname}', cannot roll the buffer")
+
+    # }}}
+
+    first_iteration, last_iteration = _get_rolling_iname_bounds(kernel, iname)
+
+    return RollingStorageAxis(
+            axis=axis,
+            iname=iname,
+            window=window,
+            first_iteration=first_iteration,
+            last_iteration=last_iteration)
+
+
+def _get_rolling_iname_bounds(kernel, iname):
+    """Return the first and last iteration of the loop over *iname* as
+    expressions in the parameters and the inames of the loops around it.
+    """
+    from loopy.diagnostic import LoopyError
+    from loopy.symbolic import pw_aff_to_expr
+
+    domain = kernel.get_inames_domain(frozenset([iname]))
+
+    # Keep the other inames as parameters, so that the bounds of non-rectangular
+    # domains are those of the current iteration of the outer loops.
+    other_inames = [name for name in domain.get_var_names(dim_type.set)
+                    if name != iname]
+    for name in other_inames:
+        dt, idx = domain.get_var_dict()[name]
+        domain = domain.move_dims(
+                dim_type.param, domain.dim(dim_type.param), dt, idx, 1)
+
+    assumptions, domain = isl.align_two(kernel.assumptions, domain)
+    domain = domain & assumptions
+    iname_idx = domain.get_var_dict()[iname][1]
+
+    leaf_domain = kernel.domains[kernel.get_home_domain_index(iname)]
+    outer_inames = set(leaf_domain.get_var_names(dim_type.param)) | {
+            prio[i]
+            for prio in kernel.loop_priority if iname in prio
+            for i in range(prio.index(iname))}
+
+    result = []
+    for bound in [domain.dim_min(iname_idx), domain.dim_max(iname_idx)]:
+        bound = bound.gist(domain.params()).coalesce()
+        bound_inames = {
+                bound.get_dim_name(dim_type.param, i)
+                for i in range(bound.dim(dim_type.param))
+                if bound.involves_dims(dim_type.param, i, 1)
+                } & set(other_inames)
+        if not bound_inames <= outer_inames:
+            raise LoopyError(f"bounds of rolling iname '{iname}' depend on "
+                    f"inames {', '.join(sorted(bound_inames - outer_inames))}, "
+                    "which are not known to be nested outside of it "
+                    "(use loopy.prioritize_loops)")
+
+        result.append(pw_aff_to_expr(bound))
+
+    return tuple(result)
+
+# }}}
+
+
 # vim: foldmethod=marker
@@ -44,6 +44,7 @@ from loopy.transform.array_buffer_map import (
     AccessDescriptor,
     ArrayToBufferMap,
     NoOpArrayToBufferMap,
+    find_rolling_storage_axis,
 )
 from loopy.translation_unit import TranslationUnit
 
@@ -55,12 +56,14 @@ logger = logging.getLogger(__name__)
 
 class ArrayAccessReplacer(RuleAwareIdentityMapper):
     def __init__(self, rule_mapping_context,
-            var_name, within, array_base_map, buf_var):
+            var_name, within, array_base_map, buf_var,
+            rolling_storage_axis=None):
         super().__init__(rule_mapping_context)
 
         self.within = within
 
         self.array_base_map = array_base_map
+        self.rolling_storage_axis = rolling_storage_axis
 
         self.var_name = var_name
         self.modified_insn_ids = set()
@@ -116,8 +119,12 @@ class ArrayAccessReplacer(RuleAwareIdentityMapper):
 
             ax_index = index[i]
             from loopy.symbolic import simplify_via_aff
-            ax_index = simplify_via_aff(
-                    ax_index - abm.storage_base_indices[i])
+            rolling = self.rolling_storage_axis
+            if rolling is not None and rolling.axis == i:
+                ax_index = rolling.storage_index(simplify_via_aff(ax_index))
+            else:
+                ax_index = simplify_via_aff(
+                        ax_index - abm.storage_base_indices[i])
 
             access_subscript.append(ax_index)
 
@@ -138,7 +145,7 @@ class ArrayAccessReplacer(RuleAwareIdentityMapper):
 def buffer_array_for_single_kernel(kernel, callables_table, var_name,
         buffer_inames, init_expression=None, store_expression=None,
         within=None, default_tag="l.auto", temporary_scope=None,
-        fetch_bounding_box=False):
+        fetch_bounding_box=False, storage_mode="full", rolling_iname=None):
     """Replace accesses to *var_name* with ones to a temporary, which is
     created and acts as a buffer. To perform this transformation, the access
     footprint to *var_name* is determined and a temporary of a suitable
@@ -172,6 +179,16 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
         (resulting in an error), setting this argument to *True* will force a
         rectangular (and hence convex) superset of the footprint to be
         fetched.
+    :arg storage_mode: Either ``"full"`` (the default), to buffer the entire
+        footprint, or ``"rolling"``, to only buffer the part of the footprint
+        used by a window of consecutive iterations of the loop over
+        *rolling_iname*, indexed modulo the window size. Each iteration then
+        only reads the entries that newly enter the window and writes back
+        those that leave it.
+    :arg rolling_iname: The iname of the sequential loop along which to roll
+        the buffer if *storage_mode* is ``"rolling"``. It is removed from
+        *buffer_inames* if present there. See :func:`loopy.precompute` for
+        the requirements on this loop.
     """
 
     if isinstance(kernel, TranslationUnit):
@@ -207,7 +224,14 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
             raise RuntimeError("sweep iname '%s' is not a known iname"
                     % iname)
 
-    buffer_inames = list(buffer_inames)
+    if storage_mode not in ["full", "rolling"]:
+        raise LoopyError(f"invalid storage_mode: '{storage_mode}'")
+
+    if (storage_mode == "rolling") != (rolling_iname is not None):
+        raise LoopyError("rolling_iname must be given if and only if "
+                "storage_mode is 'rolling'")
+
+    buffer_inames = [iname for iname in buffer_inames if iname != rolling_iname]
     buffer_inames_set = frozenset(buffer_inames)
 
     from loopy.match import parse_stack_match
@@ -298,6 +322,7 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
 
     non1_init_inames = []
     non1_store_inames = []
+    rolling_storage_axis = None
 
     if var_shape:
         # {{{ find domain to be changed
@@ -320,6 +345,10 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
         abm = ArrayToBufferMap(kernel, domch.domain, buffer_inames,
                 access_descriptors, len(var_shape))
 
+        if rolling_iname is not None:
+            rolling_storage_axis = find_rolling_storage_axis(
+                    kernel, abm, rolling_iname)
+
         for i in range(len(var_shape)):
             if abm.non1_storage_axis_flags[i]:
                 non1_init_inames.append(init_inames[i])
@@ -344,6 +373,10 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
 
         abm = NoOpArrayToBufferMap()
 
+        if rolling_iname is not None:
+            rolling_storage_axis = find_rolling_storage_axis(
+                    kernel, abm, rolling_iname)
+
     # }}}
 
     # {{{ set up temp variable
@@ -370,26 +403,38 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
 
     # {{{ generate init instruction
 
-    buf_var_init = buf_var
-    if non1_init_inames:
-        buf_var_init = buf_var_init.index(
-                tuple(var(iname) for iname in non1_init_inames))
-
     init_base = var(var_name)
 
     init_subscript = []
+    buf_init_subscript = []
+    init_predicates = frozenset()
     init_iname_idx = 0
     if var_shape:
         for i in range(len(var_shape)):
             ax_subscript = abm.storage_base_indices[i]
             if abm.non1_storage_axis_flags[i]:
-                ax_subscript += var(non1_init_inames[init_iname_idx])
+                init_iname = non1_init_inames[init_iname_idx]
+                ax_subscript += var(init_iname)
                 init_iname_idx += 1
+
+                if (rolling_storage_axis is not None
+                        and rolling_storage_axis.axis == i):
+                    buf_init_subscript.append(
+                            rolling_storage_axis.storage_index(ax_subscript))
+                    init_predicates = frozenset([
+                        rolling_storage_axis.get_fill_predicate(init_iname)])
+                else:
+                    buf_init_subscript.append(var(init_iname))
+
             init_subscript.append(ax_subscript)
 
     if init_subscript:
         init_base = init_base.index(tuple(init_subscript))
 
+    buf_var_init = buf_var
+    if buf_init_subscript:
+        buf_var_init = buf_var_init.index(tuple(buf_init_subscript))
+
     if init_expression is None:
         init_expression = init_base
     else:
@@ -407,6 +452,7 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
                 within_inames=(
                     frozenset(within_inames)
                     | frozenset(non1_init_inames)),
+                predicates=init_predicates,
                 depends_on=frozenset(),
                 depends_on_is_final=True)
 
@@ -415,7 +461,7 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
     rule_mapping_context = SubstitutionRuleMappingContext(
             kernel.substitutions, kernel.get_var_name_generator())
     aar = ArrayAccessReplacer(rule_mapping_context, var_name,
-            within, abm, buf_var)
+            within, abm, buf_var, rolling_storage_axis)
     kernel = rule_mapping_context.finish_kernel(aar.map_kernel(kernel))
 
     did_write = False
@@ -448,21 +494,33 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
 
     # {{{ generate store instruction
 
-    buf_var_store = buf_var
-    if non1_store_inames:
-        buf_var_store = buf_var_store.index(
-                tuple(var(iname) for iname in non1_store_inames))
-
     store_subscript = []
+    buf_store_subscript = []
+    store_predicates = frozenset()
     store_iname_idx = 0
     if var_shape:
         for i in range(len(var_shape)):
             ax_subscript = abm.storage_base_indices[i]
             if abm.non1_storage_axis_flags[i]:
-                ax_subscript += var(non1_store_inames[store_iname_idx])
+                store_iname = non1_store_inames[store_iname_idx]
+                ax_subscript += var(store_iname)
                 store_iname_idx += 1
+
+                if (rolling_storage_axis is not None
+                        and rolling_storage_axis.axis == i):
+                    buf_store_subscript.append(
+                            rolling_storage_axis.storage_index(ax_subscript))
+                    store_predicates = frozenset([
+                        rolling_storage_axis.get_drain_predicate(store_iname)])
+                else:
+                    buf_store_subscript.append(var(store_iname))
+
             store_subscript.append(ax_subscript)
 
+    buf_var_store = buf_var
+    if buf_store_subscript:
+        buf_var_store = buf_var_store.index(tuple(buf_store_subscript))
+
     store_target = var(var_name)
     if store_subscript:
         store_target = store_target.index(tuple(store_subscript))
@@ -484,6 +542,7 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
                     no_sync_with=frozenset([(init_insn_id, "any")]),
                     assignee=store_target,
                     expression=store_expression,
+                    predicates=store_predicates,
                     within_inames=(
                         frozenset(within_inames)
                         | frozenset(non1_store_inames)))
@@ -495,10 +554,12 @@ def buffer_array_for_single_kernel(kernel, callables_table, var_name,
     new_insns.append(init_instruction)
     if did_write:
         # new_insns_with_redirected_deps: if an insn depends on a modified
-        # insn, then it should also depend on the store insn.
+        # insn, then it should also depend on the store insn (unless it is
+        # modified itself, in which case it uses the buffer).
         new_insns_with_redirected_deps = [
             insn.copy(depends_on=(insn.depends_on | {store_instruction.id}))
-            if insn.depends_on & aar.modified_insn_ids
+            if (insn.depends_on & aar.modified_insn_ids
+                and insn.id not in aar.modified_insn_ids)
             else insn
             for insn in new_insns
         ] + [store_instruction]
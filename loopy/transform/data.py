@@ -436,6 +436,126 @@ def add_prefetch(t_unit,
 # }}}
 
 
+# {{{ add_software_prefetch
+
+@for_each_kernel
+def add_software_prefetch(kernel, var_name, iname, distance, within=None):
+    """Insert a :class:`loopy.PrefetchInstruction` ahead of each instruction
+    (matching *within*) that reads the array *var_name* in the loop over
+    *iname*. It prefetches the elements that the instruction will read
+    *distance* iterations of *iname* later.
+
+    This helps streaming kernels on CPUs whose performance is limited by
+    memory latency rather than bandwidth. *iname* should be the innermost
+    sequential loop around the reads, and *distance* should be large enough
+    for the loop body to take longer than a memory access.
+
+    :class:`loopy.CTarget` emits the prefetches as ``__builtin_prefetch``
+    and :class:`loopy.OpenCLTarget` as ``prefetch`` (for global arrays only).
+    Other targets drop them.
+
+    Reads of *var_name* inside substitution rules are not found, and neither
+    are reads whose indices depend on reduction inames.
+
+    :arg distance: a positive :class:`int`, the number of iterations of
+        *iname* to prefetch ahead.
+
+    .. versionadded:: 2024.2
+    """
+    assert isinstance(kernel, LoopKernel)
+
+    # {{{ sanity checks
+
+    if var_name not in kernel.get_written_variables() | kernel.get_read_variables():
+        raise LoopyError(f"variable '{var_name}' not used in kernel "
+                f"'{kernel.name}'")
+
+    if not kernel.get_var_descriptor(var_name).shape:
+        raise LoopyError(f"cannot prefetch scalar '{var_name}'")
+
+    if iname not in kernel.all_inames():
+        raise LoopyError(f"iname '{iname}' not found in kernel '{kernel.name}'")
+
+    from loopy.kernel.data import ConcurrentTag
+    if kernel.iname_tags_of_type(iname, ConcurrentTag):
+        raise LoopyError(f"iname '{iname}' is not sequential, "
+                "prefetching ahead in it is not meaningful")
+
+    if not isinstance(distance, int) or distance <= 0:
+        raise LoopyError(f"prefetch distance must be a positive integer, "
+                f"got '{distance}'")
+
+    # }}}
+
+    from pymbolic import var
+    from pymbolic.primitives import Subscript, Variable
+
+    from loopy.kernel.instruction import MultiAssignmentBase, PrefetchInstruction
+    from loopy.match import parse_match
+    from loopy.symbolic import SubstitutionMapper, WalkMapper, get_dependencies
+
+    within = parse_match(within)
+
+    class SubscriptCollector(WalkMapper):
+        def __init__(self):
+            super().__init__()
+            self.subscripts = []
+
+        def map_subscript(self, expr, *args):
+            if (isinstance(expr.aggregate, Variable)
+                    and expr.aggregate.name == var_name):
+                self.subscripts.append(expr)
+            super().map_subscript(expr, *args)
+
+    from pymbolic.mapper.substitutor import make_subst_func
+    shift_iname = SubstitutionMapper(
+            make_subst_func({iname: var(iname) + distance}))
+
+    insn_id_gen = kernel.get_instruction_id_generator()
+
+    new_insns = []
+    prefetch_insns = []
+    for insn in kernel.instructions:
+        if not (isinstance(insn, MultiAssignmentBase)
+                and iname in insn.within_inames
+                and var_name in insn.read_dependency_names()
+                and within(kernel, insn)):
+            new_insns.append(insn)
+            continue
+
+        collector = SubscriptCollector()
+        collector(insn.expression)
+
+        available_names = insn.within_inames | kernel.outer_params()
+        addresses = []
+        for subscript in collector.subscripts:
+            address = shift_iname(subscript)
+            if (get_dependencies(address.index_tuple) <= available_names
+                    and address not in addresses):
+                addresses.append(address)
+
+        prefetch_ids = []
+        for address in addresses:
+            assert isinstance(address, Subscript)
+            prefetch_id = insn_id_gen(f"{var_name}_prefetch")
+            prefetch_insns.append(PrefetchInstruction(
+                    address,
+                    id=prefetch_id,
+                    within_inames=insn.within_inames))
+            prefetch_ids.append(prefetch_id)
+
+        new_insns.append(insn.copy(
+                depends_on=insn.depends_on | frozenset(prefetch_ids)))
+
+    if not prefetch_insns:
+        raise LoopyError(f"no reads of '{var_name}' with indices depending "
+                f"only on the loop nest found in the loop over '{iname}'")
+
+    return kernel.copy(instructions=prefetch_insns + new_insns)
+
+# }}}
+
+
 # {{{ change variable kinds
 
 @for_each_kernel
@@ -70,10 +70,14 @@ __doc__ = """
 
 .. autofunction:: prioritize_loops
 
+.. autofunction:: auto_prioritize_loops
+
 .. autofunction:: rename_iname
 
 .. autofunction:: rename_inames
 
+.. autofunction:: fuse_loops
+
 .. autofunction:: remove_unused_inames
 
 .. autofunction:: split_reduction_inward
@@ -121,6 +125,58 @@ def prioritize_loops(kernel, loop_priority):
 
     return kernel.copy(loop_priority=kernel.loop_priority.union([loop_priority]))
 
+
+@for_each_kernel
+def auto_prioritize_loops(kernel):
+    """Add a loop priority (see :func:`prioritize_loops`) that nests the
+    sequential loops of *kernel* by decreasing stride, so that the accesses
+    to array arguments in the innermost loops are as close to unit-stride as
+    possible.
+
+    The stride of an iname is the sum of its strides in all array accesses,
+    as used for automatic local axis assignment, evaluated using the
+    *approximately* values of the kernel's :class:`~loopy.ValueArg`
+    parameters. Inames that do not occur in array indices are
+    nested outermost. Parallel inames, reduction inames and inames already
+    named in a loop priority of *kernel* are not considered. Since loop
+    priorities are advisory, nestings required by the dependencies of
+    *kernel* take precedence.
+
+    .. versionadded:: 2024.2
+    """
+    assert isinstance(kernel, LoopKernel)
+
+    from loopy.kernel.data import ConcurrentTag
+    from loopy.kernel.instruction import MultiAssignmentBase
+    from loopy.kernel.tools import get_aggregate_iname_strides
+
+    prioritized_inames = frozenset().union(*kernel.loop_priority)
+
+    def is_candidate(iname):
+        return (iname not in prioritized_inames
+                and not kernel.iname_tags_of_type(iname, ConcurrentTag))
+
+    strides = {}
+    for insn in kernel.instructions:
+        inames = {iname for iname in insn.within_inames if is_candidate(iname)}
+        for iname in inames:
+            strides.setdefault(iname, 0)
+
+        if not isinstance(insn, MultiAssignmentBase):
+            continue
+
+        for iname, stride in get_aggregate_iname_strides(
+                kernel, insn, inames).items():
+            strides[iname] += abs(stride)
+
+    if len(strides) < 2:
+        return kernel
+
+    loop_priority = sorted(strides,
+            key=lambda iname: (-(strides[iname] or float("inf")), iname))
+
+    return prioritize_loops(kernel, loop_priority)
+
 # }}}
 
 
@@ -2374,6 +2430,39 @@ def add_inames_for_unused_hw_axes(kernel, within=None):
 
 # {{{ rename_inames
 
+def _inames_have_same_domain(kernel: LoopKernel, iname_a: str, iname_b: str
+                             ) -> bool:
+    dom = kernel.get_inames_domain(frozenset((iname_a, iname_b)))
+
+    var_dict = dom.get_var_dict()
+    _, a_idx = var_dict[iname_a]
+    _, b_idx = var_dict[iname_b]
+
+    par_idx = dom.dim(dim_type.param)
+    dom_a = dom.move_dims(
+            dim_type.param, par_idx, dim_type.set, a_idx, 1)
+    dom_a = dom_a.move_dims(dim_type.set,
+                            dom_a.dim(dim_type.set),
+                            dim_type.param, par_idx, 1)
+    dom_a = dom_a.project_out(dim_type.set,
+                              b_idx
+                              if b_idx < a_idx
+                              else b_idx - 1,
+                              1)
+
+    par_idx = dom.dim(dim_type.param)
+    dom_b = dom.move_dims(dim_type.param, par_idx,
+                          dim_type.set, b_idx, 1)
+    dom_b = dom_b.move_dims(dim_type.set, dom_b.dim(dim_type.set),
+                            dim_type.param, par_idx, 1)
+    dom_b = dom_b.project_out(dim_type.set,
+                              a_idx
+                              if a_idx < b_idx
+                              else a_idx - 1, 1)
+
+    return dom_a <= dom_b and dom_b <= dom_a
+
+
 @for_each_kernel
 @remove_any_newly_unused_inames
 def rename_inames(
@@ -2446,43 +2535,11 @@ def rename_inames(
 
     if raise_on_domain_mismatch:
         for old_iname in old_inames:
-            # {{{ check that the domains match up
-
-            dom = kernel.get_inames_domain(frozenset((old_iname, new_iname)))
-
-            var_dict = dom.get_var_dict()
-            _, old_idx = var_dict[old_iname]
-            _, new_idx = var_dict[new_iname]
-
-            par_idx = dom.dim(dim_type.param)
-            dom_old = dom.move_dims(
-                    dim_type.param, par_idx, dim_type.set, old_idx, 1)
-            dom_old = dom_old.move_dims(dim_type.set,
-                                        dom_old.dim(dim_type.set),
-                                        dim_type.param, par_idx, 1)
-            dom_old = dom_old.project_out(dim_type.set,
-                                          new_idx
-                                          if new_idx < old_idx
-                                          else new_idx - 1,
-                                          1)
-
-            par_idx = dom.dim(dim_type.param)
-            dom_new = dom.move_dims(dim_type.param, par_idx,
-                                    dim_type.set, new_idx, 1)
-            dom_new = dom_new.move_dims(dim_type.set, dom_new.dim(dim_type.set),
-                                        dim_type.param, par_idx, 1)
-            dom_new = dom_new.project_out(dim_type.set,
-                                          old_idx
-                                          if old_idx < new_idx
-                                          else old_idx - 1, 1)
-
-            if not (dom_old <= dom_new and dom_new <= dom_old):
+            if not _inames_have_same_domain(kernel, old_iname, new_iname):
                 raise LoopyError(
                         "inames {old} and {new} do not iterate over the same domain"
                         .format(old=old_iname, new=new_iname))
 
-            # }}}
-
     from pymbolic import var
     subst_dict = {old_iname: var(new_iname) for old_iname in old_inames}
 
@@ -2552,4 +2609,212 @@ def rename_iname(
 # }}}
 
 
+# {{{ fuse_loops
+
+def _get_loop_access_map(kernel, insn, var_name, iname):
+    """Return an :class:`islpy.Map` from *iname* to the elements of *var_name*
+    accessed by *insn*, or *None* if this cannot be determined.
+    """
+    from loopy.kernel.instruction import MultiAssignmentBase
+    from loopy.symbolic import BatchedAccessMapMapper
+
+    if not isinstance(insn, MultiAssignmentBase):
+        return None
+
+    amapper = BatchedAccessMapMapper(kernel, {var_name})
+    for expr in [*insn.assignees, insn.expression, *insn.predicates]:
+        amapper(expr, insn.within_inames)
+
+    if amapper.bad_subscripts[var_name]:
+        return None
+
+    result = None
+    for amap in amapper.access_maps[var_name].values():
+        amap = amap.project_out_except([iname], [dim_type.in_])
+        if result is None:
+            result = amap
+        else:
+            result = (result.align_params(amap.space)
+                      | amap.align_params(result.space))
+
+    # *None* if only accessed without a subscript
+    return result
+
+
+def _get_loop_fusion_blocker(kernel, iname_a, iname_b):
+    """Return a message describing why the loops over *iname_a* and *iname_b*
+    may not be fused, or *None* if fusing them preserves all dependencies.
+    """
+    from loopy.kernel.data import ConcurrentTag
+
+    if iname_a == iname_b:
+        return f"'{iname_a}' is given twice"
+
+    iname_to_insns = kernel.iname_to_insns()
+    insns_a = iname_to_insns[iname_a]
+    insns_b = iname_to_insns[iname_b]
+
+    if not insns_a or not insns_b:
+        return "loop has no instructions"
+    if insns_a & insns_b:
+        return "loops are nested"
+    if any({iname_a, iname_b} & insn.reduction_inames()
+            for insn in kernel.instructions):
+        return "reduction inames cannot be fused"
+    if kernel.inames[iname_a].tags != kernel.inames[iname_b].tags:
+        return "iname tags differ"
+    if not _inames_have_same_domain(kernel, iname_a, iname_b):
+        return "inames do not iterate over the same domain"
+
+    index = kernel.get_instruction_index()
+
+    # {{{ instructions that need to run between the two loops
+
+    def get_loop_bits(insn_ids):
+        # (instructions in the loop, instructions the loop depends on)
+        dep_bits = 0
+        for insn_id in insn_ids:
+            dep_bits |= index.get_recursive_dependency_bits(insn_id)
+        return index.bits_from_ids(insn_ids), dep_bits
+
+    loop_bits_a = get_loop_bits(insns_a)
+    loop_bits_b = get_loop_bits(insns_b)
+
+    for insn in kernel.instructions:
+        if insn.id in insns_a or insn.id in insns_b:
+            continue
+
+        insn_bits = index.bits_from_ids([insn.id])
+        insn_dep_bits = index.get_recursive_dependency_bits(insn.id)
+        for (before_bits, _), (_, after_dep_bits) in [
+                (loop_bits_a, loop_bits_b), (loop_bits_b, loop_bits_a)]:
+            if insn_dep_bits & before_bits and after_dep_bits & insn_bits:
+                return (f"instruction '{insn.id}' must run after loop "
+                        "over one iname and before the loop over the other")
+
+    # }}}
+
+    # {{{ check that no dependency is reversed by the fusion
+
+    written_vars = kernel.get_written_variables()
+    is_concurrent = kernel.iname_tags_of_type(iname_a, ConcurrentTag)
+
+    for id_a in sorted(insns_a):
+        insn_a = kernel.id_to_insn[id_a]
+        for id_b in sorted(insns_b):
+            insn_b = kernel.id_to_insn[id_b]
+
+            if index.depends_on_recursively(id_b, id_a):
+                b_after_a = True
+            elif index.depends_on_recursively(id_a, id_b):
+                b_after_a = False
+            else:
+                continue
+
+            writes_a = set(insn_a.assignee_var_names())
+            writes_b = set(insn_b.assignee_var_names())
+            conflicting_vars = written_vars & (
+                    (writes_a & insn_b.dependency_names())
+                    | (writes_b & insn_a.dependency_names())
+                    | (writes_a & writes_b))
+
+            for var_name in sorted(conflicting_vars):
+                amap_a = _get_loop_access_map(kernel, insn_a, var_name, iname_a)
+                amap_b = _get_loop_access_map(kernel, insn_b, var_name, iname_b)
+
+                if amap_a is None or amap_b is None:
+                    return (f"cannot determine the accesses to '{var_name}' "
+                            f"in '{id_a}' and '{id_b}'")
+
+                amap_a = amap_a.align_params(amap_b.space)
+                amap_b = amap_b.align_params(amap_a.space)
+
+                # offsets from iterations of loop 'a' to those of loop 'b'
+                # accessing the same elements
+                deltas = (amap_a.apply_range(amap_b.reverse())
+                          .deltas()
+                          .set_dim_name(dim_type.set, 0, "delta"))
+                affs = isl.affs_from_space(deltas.space)
+
+                if is_concurrent:
+                    bad_deltas = affs["delta"].ne_set(affs[0])
+                elif b_after_a:
+                    bad_deltas = affs["delta"].lt_set(affs[0])
+                else:
+                    bad_deltas = affs["delta"].gt_set(affs[0])
+
+                if not (deltas & bad_deltas).is_empty():
+                    return (f"fusion would reverse the dependency between "
+                            f"'{id_a}' and '{id_b}' on '{var_name}'")
+
+    # }}}
+
+    return None
+
+
+@for_each_kernel
+def fuse_loops(kernel: LoopKernel,
+               candidates: str | Iterable[Sequence[str]] = "auto"
+               ) -> LoopKernel:
+    """Fuse loops within *kernel* by merging inames that iterate over the same
+    domain into a single iname, so that the instructions in them are executed
+    in the same loop.
+
+    Two inames can be fused if they are not nested, have identical tags and
+    domains, and if no dependency between the instructions in the loops is
+    violated by the fusion. The latter is determined from the access relations
+    of the variables written in either of the loops. (For loops whose iname
+    is tagged as parallel, the accesses must coincide in every iteration.)
+
+    :arg candidates: Either ``"auto"`` to greedily fuse every pair of inames
+        that can be fused, or an iterable of sequences of inames. The inames
+        in each sequence are merged into its first entry, and a
+        :class:`~loopy.diagnostic.LoopyError` is raised if they cannot be
+        fused.
+
+    .. versionadded:: 2024.2
+    """
+    assert isinstance(kernel, LoopKernel)
+
+    if candidates == "auto":
+        while True:
+            within_inames = sorted(frozenset().union(
+                    *(insn.within_inames for insn in kernel.instructions)))
+
+            for iname_a, iname_b in (
+                    (a, b)
+                    for i, a in enumerate(within_inames)
+                    for b in within_inames[i+1:]):
+                if _get_loop_fusion_blocker(kernel, iname_a, iname_b) is None:
+                    kernel = rename_iname(kernel, iname_b, iname_a,
+                                          existing_ok=True)
+                    break
+            else:
+                return kernel
+
+    if isinstance(candidates, str):
+        raise LoopyError(f"invalid value for 'candidates': '{candidates}'")
+
+    for inames in candidates:
+        if isinstance(inames, str):
+            inames = [iname.strip() for iname in inames.split(",")]
+
+        iname_a, *other_inames = inames
+        for iname_b in other_inames:
+            if not {iname_a, iname_b} <= kernel.all_inames():
+                raise LoopyError(f"cannot fuse '{iname_a}' and '{iname_b}': "
+                                 "iname does not exist")
+
+            blocker = _get_loop_fusion_blocker(kernel, iname_a, iname_b)
+            if blocker is not None:
+                raise LoopyError(f"cannot fuse '{iname_a}' and '{iname_b}': "
+                                 f"{blocker}")
+
+            kernel = rename_iname(kernel, iname_b, iname_a, existing_ok=True)
+
+    return kernel
+
+# }}}
+
+
 # vim: foldmethod=marker
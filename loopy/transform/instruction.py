@@ -414,12 +414,12 @@ def add_nosync(kernel, scope, source, sink, bidirectional=False, force=False,
     from collections import defaultdict
     nosync_to_add = defaultdict(set)
 
-    rec_dep_map = kernel.recursive_insn_dep_map()
+    index = kernel.get_instruction_index()
     for sink in sinks:
         for source in sources:
 
             needs_nosync = force or (
-                    source in rec_dep_map[sink]
+                    index.depends_on_recursively(sink, source)
                     or insns_in_conflicting_groups(source, sink))
 
             if not needs_nosync:
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+from itertools import permutations
+from typing import TYPE_CHECKING
+
+from pymbolic import evaluate, var
+
+from loopy.diagnostic import LoopyError
+from loopy.kernel.array import FixedStrideArrayDimTag
+from loopy.kernel.data import ArrayArg, ValueArg
+
+
+if TYPE_CHECKING:
+    from loopy.translation_unit import TranslationUnit
+
+
+logger = logging.getLogger(__name__)
+
+
+__doc__ = """
+.. currentmodule:: loopy
+
+.. autofunction:: auto_tag_array_axes
+"""
+
+
+# {{{ traffic model
+
+def _get_layout_dim_tags(ary):
+    """Return the layout of *ary* as a string understood by
+    :func:`loopy.tag_array_axes`, or *None* if it is not a permutation of
+    the axes of a dense array.
+    """
+    if (not isinstance(ary, ArrayArg)
+            or ary.dim_tags is None
+            or not all(
+                isinstance(dim_tag, FixedStrideArrayDimTag)
+                and dim_tag.layout_nesting_level is not None
+                for dim_tag in ary.dim_tags)):
+        return None
+
+    return ",".join(f"N{dim_tag.layout_nesting_level}"
+                    for dim_tag in ary.dim_tags)
+
+
+def _get_innermost_loop_inames(kernel):
+    """Return a :class:`dict` mapping the instruction ids of the linearized
+    *kernel* to the iname of the innermost loop around them, or *None*.
+    """
+    from loopy.schedule import EnterLoop, LeaveLoop, RunInstruction
+
+    result = {}
+    loop_inames = []
+    for sched_item in kernel.linearization:
+        if isinstance(sched_item, EnterLoop):
+            loop_inames.append(sched_item.iname)
+        elif isinstance(sched_item, LeaveLoop):
+            loop_inames.pop()
+        elif isinstance(sched_item, RunInstruction):
+            result[sched_item.insn_id] = loop_inames[-1] if loop_inames else None
+
+    return result
+
+
+def _get_max_iname_stride(kernel, insn, ary, iname, parameters):
+    """Return the largest number of elements by which an access to *ary* in
+    *insn* advances per iteration of *iname*, or *None* if unknown.
+    """
+    from loopy.diagnostic import ExpressionNotAffineError
+    from loopy.symbolic import ArrayAccessFinder, CoefficientCollector
+
+    subscripts = ArrayAccessFinder(ary.name)(insn.expression)
+    for assignee in insn.assignees:
+        subscripts = subscripts | ArrayAccessFinder(ary.name)(assignee)
+
+    result = 0
+    for subscript in subscripts:
+        stride = 0
+        for idx, dim_tag in zip(subscript.index_tuple, ary.dim_tags):
+            try:
+                coeffs = CoefficientCollector([iname])(idx)
+            except (ExpressionNotAffineError, RuntimeError):
+                return None
+            stride += coeffs.get(var(iname), 0) * dim_tag.stride
+
+        result = max(result, abs(evaluate(stride, parameters)))
+
+    return result
+
+
+def _model_traffic(t_unit, arg_name, parameters, entrypoint,
+                   cache_line_bytes, subgroup_size):
+    """Return the number of bytes of *arg_name* moved by *t_unit*, assuming
+    that each access moves as many bytes as lie between two subsequent
+    accesses made by consecutive work-items (or loop iterations), up to
+    *cache_line_bytes*.
+    """
+    from loopy.kernel.instruction import MultiAssignmentBase
+    from loopy.preprocess import preprocess_program
+    from loopy.schedule import get_one_linearized_kernel
+    from loopy.statistics import get_mem_access_map
+
+    t_unit = preprocess_program(t_unit)
+    kernel = get_one_linearized_kernel(t_unit[entrypoint], t_unit.callables_table)
+    innermost_loop_inames = _get_innermost_loop_inames(kernel)
+
+    ary = kernel.arg_dict[arg_name]
+    itemsize = ary.dtype.itemsize
+
+    result = 0
+    for insn in kernel.instructions:
+        if (not isinstance(insn, MultiAssignmentBase)
+                or arg_name not in (insn.dependency_names()
+                                    | set(insn.assignee_var_names()))):
+            continue
+
+        mem_map = get_mem_access_map(t_unit,
+                count_redundant_work=True, subgroup_size=subgroup_size,
+                entrypoint=entrypoint, within=f"id:{insn.id}")
+
+        for access, count in mem_map.filter_by(
+                variable=[arg_name], mtype=["global"]).items():
+            if access.lid_strides:
+                stride = abs(evaluate(access.lid_strides.get(0, 0), parameters))
+            elif innermost_loop_inames.get(insn.id) is not None:
+                stride = _get_max_iname_stride(kernel, insn, ary,
+                        innermost_loop_inames[insn.id], parameters)
+            else:
+                stride = 0
+
+            if stride is None:
+                bytes_per_access = cache_line_bytes
+            else:
+                bytes_per_access = min(
+                        max(stride, 1) * itemsize, cache_line_bytes)
+
+            result += count.eval_with_dict(parameters) * bytes_per_access
+
+    return result
+
+# }}}
+
+
+def _make_conversion_kernel(target, dtype, new_dim_tags, old_dim_tags):
+    from loopy import make_copy_kernel
+    from loopy.kernel.tools import add_dtypes
+
+    knl = make_copy_kernel(new_dim_tags, old_dim_tags)
+    knl = add_dtypes(knl, {"input,output": dtype})
+    return knl.copy(target=target)
+
+
+def auto_tag_array_axes(
+            t_unit: TranslationUnit,
+            arg_names=None,
+            *,
+            parameters=None,
+            cache_line_bytes: int = 64,
+            subgroup_size=None,
+            return_pack_kernels: bool = False,
+            entrypoint: str | None = None):
+    """Choose the layouts of the array arguments of the entrypoint of
+    *t_unit* by trying all permutations of the axis nesting order of each
+    argument (see :func:`loopy.tag_array_axes`), for instance turning an
+    array of structures into a structure of arrays, and keeping the one with
+    the least modeled memory traffic.
+
+    The traffic of an argument is modeled from the access counts of
+    :func:`loopy.get_mem_access_map`. Each access is assumed to move as many
+    bytes as lie between the elements accessed by consecutive work-items
+    (given by the local stride reported by :func:`loopy.get_mem_access_map`)
+    or, absent those, by consecutive iterations of the innermost loop around
+    the access, but at most *cache_line_bytes*. Arguments are considered one
+    at a time, in the order of *arg_names*.
+
+    :arg arg_names: the names of the arguments whose layouts may be changed,
+        as a comma-separated string or an iterable. Defaults to all dense
+        array arguments with more than one axis.
+    :arg parameters: a mapping from parameter names to the values used to
+        evaluate access counts and strides. Defaults to the ``approximately``
+        values of the :class:`~loopy.ValueArg` arguments.
+    :arg subgroup_size: passed to :func:`loopy.get_mem_access_map`. Defaults
+        to ``"guess"``.
+    :arg return_pack_kernels: If *True*, also return a :class:`dict`
+        mapping the name of each argument whose layout was changed to a tuple
+        ``(pack_knl, unpack_knl)`` of kernels (see
+        :func:`loopy.make_copy_kernel`) converting an array from the original
+        to the new layout, and back.
+
+    :returns: the transformed translation unit, or a tuple of it and the
+        :class:`dict` of pack kernels if *return_pack_kernels* is *True*.
+
+    .. versionadded:: 2024.2
+    """
+    from loopy.transform.data import tag_array_axes
+
+    if entrypoint is None:
+        if len(t_unit.entrypoints) != 1:
+            raise LoopyError("Must specify entrypoint as there are multiple"
+                             " entrypoints.")
+        entrypoint, = t_unit.entrypoints
+
+    kernel = t_unit[entrypoint]
+
+    if arg_names is None:
+        arg_names = [arg.name for arg in kernel.args
+                     if _get_layout_dim_tags(arg) is not None
+                     and len(arg.dim_tags) > 1]
+    elif isinstance(arg_names, str):
+        arg_names = [arg_name.strip() for arg_name in arg_names.split(",")]
+
+    approximate_parameters = {
+            arg.name: arg.approximately for arg in kernel.args
+            if isinstance(arg, ValueArg) and arg.approximately is not None}
+    if parameters is not None:
+        approximate_parameters.update(parameters)
+    parameters = approximate_parameters
+
+    if subgroup_size is None:
+        subgroup_size = "guess"
+
+    def with_dim_tags(t_unit, arg_name, dim_tags):
+        return t_unit.with_kernel(
+                tag_array_axes(t_unit[entrypoint], arg_name, dim_tags))
+
+    pack_kernels = {}
+
+    for arg_name in arg_names:
+        ary = kernel.arg_dict.get(arg_name)
+        orig_dim_tags = _get_layout_dim_tags(ary)
+        if orig_dim_tags is None:
+            raise LoopyError(f"cannot choose a layout for '{arg_name}': "
+                             "not an array argument with a dense layout")
+
+        best_dim_tags = orig_dim_tags
+        best_traffic = _model_traffic(t_unit, arg_name, parameters, entrypoint,
+                                      cache_line_bytes, subgroup_size)
+
+        for levels in permutations(range(len(ary.dim_tags))):
+            dim_tags = ",".join(f"N{level}" for level in levels)
+            if dim_tags == orig_dim_tags:
+                continue
+
+            traffic = _model_traffic(
+                    with_dim_tags(t_unit, arg_name, dim_tags), arg_name,
+                    parameters, entrypoint, cache_line_bytes, subgroup_size)
+            logger.debug("%s: modeled traffic of '%s' with layout '%s': %g",
+                         entrypoint, arg_name, dim_tags, traffic)
+
+            if traffic < best_traffic:
+                best_dim_tags = dim_tags
+                best_traffic = traffic
+
+        if best_dim_tags == orig_dim_tags:
+            continue
+
+        t_unit = with_dim_tags(t_unit, arg_name, best_dim_tags)
+
+        if return_pack_kernels:
+            pack_kernels[arg_name] = (
+                    _make_conversion_kernel(t_unit.target, ary.dtype,
+                                            best_dim_tags, orig_dim_tags),
+                    _make_conversion_kernel(t_unit.target, ary.dtype,
+                                            orig_dim_tags, best_dim_tags))
+
+    if return_pack_kernels:
+        return t_unit, pack_kernels
+    else:
+        return t_unit
+
+# vim: foldmethod=marker
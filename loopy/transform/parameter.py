@@ -71,31 +71,34 @@ def assume(kernel, assumptions):
 
 # {{{ fix_parameter
 
-def _fix_parameter(kernel, name, value, within=None):
+def _fix_parameters(kernel, value_dict, within=None):
     def process_set(s):
         var_dict = s.get_var_dict()
 
-        try:
-            dt, idx = var_dict[name]
-        except KeyError:
-            return s
+        for name, value in value_dict.items():
+            try:
+                dt, idx = var_dict[name]
+            except KeyError:
+                continue
 
-        value_aff = isl.Aff.zero_on_domain(s.space) + value
+            value_aff = isl.Aff.zero_on_domain(s.space) + value
 
-        from loopy.isl_helpers import iname_rel_aff
-        name_equal_value_aff = iname_rel_aff(s.space, name, "==", value_aff)
+            from loopy.isl_helpers import iname_rel_aff
+            name_equal_value_aff = iname_rel_aff(s.space, name, "==", value_aff)
 
-        s = (s
-                .add_constraint(
-                    isl.Constraint.equality_from_aff(name_equal_value_aff))
-                .project_out(dt, idx, 1))
+            s = (s
+                    .add_constraint(
+                        isl.Constraint.equality_from_aff(name_equal_value_aff))
+                    .project_out(dt, idx, 1))
+
+            var_dict = s.get_var_dict()
 
         return s
 
     new_domains = [process_set(dom) for dom in kernel.domains]
 
     from pymbolic.mapper.substitutor import make_subst_func
-    subst_func = make_subst_func({name: value})
+    subst_func = make_subst_func(value_dict)
 
     from loopy.symbolic import PartialEvaluationMapper, SubstitutionMapper
     subst_map = SubstitutionMapper(subst_func)
@@ -107,7 +110,7 @@ def _fix_parameter(kernel, name, value, within=None):
     from loopy.kernel.array import ArrayBase
     new_args = []
     for arg in kernel.args:
-        if arg.name == name:
+        if arg.name in value_dict:
             # remove from argument list
             continue
 
@@ -147,15 +150,19 @@ def fix_parameters(kernel, **value_dict):
     *value_dict* consists of *name*/*value* pairs, where *name* will be fixed
     to be *value*. *name* may refer to :ref:`domain-parameters` or
     :ref:`arguments`.
+
+    .. versionchanged:: 2024.2
+
+        All parameters are fixed in a single pass over the kernel.
     """
     assert isinstance(kernel, LoopKernel)
 
     within = value_dict.pop("within", None)
 
-    for name, value in value_dict.items():
-        kernel = _fix_parameter(kernel, name, value, within)
+    if not value_dict:
+        return kernel
 
-    return kernel
+    return _fix_parameters(kernel, value_dict, within)
 
 # }}}
 
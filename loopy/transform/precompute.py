@@ -56,6 +56,7 @@ from loopy.transform.array_buffer_map import (
     ArrayToBufferMap,
     ArrayToBufferMapBase,
     NoOpArrayToBufferMap,
+    find_rolling_storage_axis,
 )
 from loopy.translation_unit import CallablesTable, TranslationUnit
 from loopy.types import LoopyType, ToLoopyTypeConvertible, to_loopy_type
@@ -238,7 +239,7 @@ class RuleInvocationReplacer(RuleAwareIdentityMapper):
             storage_axis_names, storage_axis_sources,
             non1_storage_axis_names,
             temporary_name, compute_insn_id, compute_dep_id,
-            compute_read_variables):
+            compute_read_variables, rolling_storage_axis=None):
         super().__init__(rule_mapping_context)
 
         self.subst_name = subst_name
@@ -251,6 +252,7 @@ class RuleInvocationReplacer(RuleAwareIdentityMapper):
         self.storage_axis_names = storage_axis_names
         self.storage_axis_sources = storage_axis_sources
         self.non1_storage_axis_names = non1_storage_axis_names
+        self.rolling_storage_axis = rolling_storage_axis
 
         self.temporary_name = temporary_name
         self.compute_insn_id = compute_insn_id
@@ -292,10 +294,10 @@ class RuleInvocationReplacer(RuleAwareIdentityMapper):
         abm = self.array_base_map
 
         stor_subscript = []
-        for sax_name, sax_source, sax_base_idx in zip(
+        for i, (sax_name, sax_source, sax_base_idx) in enumerate(zip(
                 self.storage_axis_names,
                 self.storage_axis_sources,
-                abm.storage_base_indices):
+                abm.storage_base_indices)):
             if sax_name not in self.non1_storage_axis_names:
                 continue
 
@@ -307,7 +309,11 @@ class RuleInvocationReplacer(RuleAwareIdentityMapper):
                 ax_index = var(sax_source)
 
             from loopy.symbolic import simplify_via_aff
-            ax_index = simplify_via_aff(ax_index - sax_base_idx)
+            rolling = self.rolling_storage_axis
+            if rolling is not None and rolling.axis == i:
+                ax_index = rolling.storage_index(simplify_via_aff(ax_index))
+            else:
+                ax_index = simplify_via_aff(ax_index - sax_base_idx)
             stor_subscript.append(ax_index)
 
         new_outer_expr = var(self.temporary_name)
@@ -401,6 +407,8 @@ def precompute_for_single_kernel(
         fetch_bounding_box: bool = False,
         temporary_address_space: AddressSpace | type[auto] | None = None,
         compute_insn_id: str | None = None,
+        storage_mode: str = "full",
+        rolling_iname: str | None = None,
         _enable_mirgecom_workaround: bool = False,
         ) -> LoopKernel:
     """Precompute the expression described in the substitution rule determined by
@@ -481,6 +489,22 @@ def precompute_for_single_kernel(
     :arg compute_insn_id: The ID of the instruction generated to perform the
         precomputation.
 
+    :arg storage_mode: Either ``"full"`` (the default), to store the entire
+        footprint, or ``"rolling"``, to store only the part of the footprint
+        needed by a window of consecutive iterations of the loop over
+        *rolling_iname*. The temporary is then indexed modulo the window size
+        along the storage axis advancing with *rolling_iname*, and each
+        iteration only computes the entries that newly enter the window.
+        This reduces storage for stencil-like sweeps from the extent of the
+        loop to the extent of the stencil.
+
+    :arg rolling_iname: The iname of the sequential loop along which to roll
+        the storage if *storage_mode* is ``"rolling"``. The compute
+        instruction is nested inside this loop, so it is removed from
+        *sweep_inames* if present there. The base index of exactly one storage
+        axis must advance by one per iteration of this loop, and the loop
+        must remain sequential.
+
     If `storage_axes` is not specified, it defaults to the arrangement
     `<direct sweep axes><arguments>` with the direct sweep axes being the
     slower-varying indices.
@@ -503,7 +527,14 @@ def precompute_for_single_kernel(
             raise RuntimeError("sweep iname '%s' is not a known iname"
                     % iname)
 
-    sweep_inames = list(sweep_inames)
+    if storage_mode not in ["full", "rolling"]:
+        raise LoopyError(f"invalid storage_mode: '{storage_mode}'")
+
+    if (storage_mode == "rolling") != (rolling_iname is not None):
+        raise LoopyError("rolling_iname must be given if and only if "
+                "storage_mode is 'rolling'")
+
+    sweep_inames = [iname for iname in sweep_inames if iname != rolling_iname]
     sweep_inames_set = frozenset(sweep_inames)
 
     if isinstance(storage_axes, str):
@@ -774,6 +805,10 @@ def precompute_for_single_kernel(
                 kernel, domch.domain, sweep_inames,
                 access_descriptors, len(storage_axis_names))
 
+        if rolling_iname is not None:
+            rolling_storage_axis = find_rolling_storage_axis(
+                    kernel, abm, rolling_iname)
+
         non1_storage_axis_names = []
         for i, saxis in enumerate(storage_axis_names):
             if abm.non1_storage_axis_flags[i]:
@@ -895,6 +930,13 @@ def precompute_for_single_kernel(
         non1_storage_axis_names = []
         abm = NoOpArrayToBufferMap()
 
+        if rolling_iname is not None:
+            rolling_storage_axis = find_rolling_storage_axis(
+                    kernel, abm, rolling_iname)
+
+    if rolling_iname is None:
+        rolling_storage_axis = None
+
     kernel = kernel.copy(domains=new_kernel_domains)
 
     # {{{ set up compute insn
@@ -905,8 +947,20 @@ def precompute_for_single_kernel(
     assignee = var(temporary_name)
 
     if non1_storage_axis_names:
-        assignee = assignee[
-                tuple(var(iname) for iname in non1_storage_axis_names)]
+        assignee_index = []
+        for i, (sax_name, base_index) in enumerate(
+                zip(storage_axis_names, abm.storage_base_indices)):
+            if sax_name not in non1_storage_axis_names:
+                continue
+
+            if (rolling_storage_axis is not None
+                    and rolling_storage_axis.axis == i):
+                assignee_index.append(rolling_storage_axis.storage_index(
+                    flatten(base_index + var(sax_name))))
+            else:
+                assignee_index.append(var(sax_name))
+
+        assignee = assignee[tuple(assignee_index)]
 
     # {{{ process substitutions on compute instruction
 
@@ -962,10 +1016,18 @@ def precompute_for_single_kernel(
     if compute_insn_id is None:
         compute_insn_id = kernel.make_unique_instruction_id(based_on=c_subst_name)
 
+    if rolling_storage_axis is not None:
+        compute_predicates = frozenset([
+            rolling_storage_axis.get_fill_predicate(
+                storage_axis_names[rolling_storage_axis.axis])])
+    else:
+        compute_predicates = frozenset()
+
     compute_insn = Assignment(
             id=compute_insn_id,
             assignee=assignee,
             expression=compute_expression,
+            predicates=compute_predicates,
             # within_inames determined below
             )
     compute_dep_id = compute_insn_id
@@ -997,7 +1059,8 @@ def precompute_for_single_kernel(
             storage_axis_names, storage_axis_sources,
             non1_storage_axis_names,
             temporary_name, compute_insn_id, compute_dep_id,
-            compute_read_variables=get_dependencies(expander(compute_expression)))
+            compute_read_variables=get_dependencies(expander(compute_expression)),
+            rolling_storage_axis=rolling_storage_axis)
 
     kernel = invr.map_kernel(kernel)
     kernel = kernel.copy(
@@ -1067,6 +1130,9 @@ def precompute_for_single_kernel(
         precompute_outer_inames = precompute_outer_inames \
                 | frozenset(non1_storage_axis_names)
 
+    if rolling_iname is not None:
+        precompute_outer_inames = precompute_outer_inames | {rolling_iname}
+
     kernel = kernel.copy(
             instructions=[
                 insn.copy(within_inames=precompute_outer_inames)
@@ -207,6 +207,11 @@ def privatize_temporaries_with_inames(
 
     from loopy.kernel.data import VectorizeTag
 
+    # Loops emitted as SIMD loops have scalar bodies, so the privatized axis
+    # must be an ordinary array axis rather than a vector one.
+    use_vec_axes = not (
+            kernel.target.get_device_ast_builder().can_implement_simd_loops)
+
     new_temp_vars = kernel.temporary_variables.copy()
     for tv_name, inames in var_to_new_priv_axis_iname.items():
         tv = new_temp_vars[tv_name]
@@ -218,7 +223,7 @@ def privatize_temporaries_with_inames(
 
         dim_tags = ["c"] * (len(shape) + len(extra_shape))
         for i, iname in enumerate(inames):
-            if kernel.iname_tags_of_type(iname, VectorizeTag):
+            if use_vec_axes and kernel.iname_tags_of_type(iname, VectorizeTag):
                 dim_tags[len(shape) + i] = "vec"
 
         base_indices = tv.base_indices
@@ -101,6 +101,10 @@ class _ReductionRealizationContext:
     # reduction.
     inames_added_for_scan: set[str]
 
+    # Maps 'g'-tagged inames to be realized as thread-parallel loops to the
+    # inames that should preferably be nested inside them.
+    thread_parallel_inames: dict[str, set[str]]
+
     # }}}
 
     # {{{ surrounding instruction, read-only (different at each recursive level)
@@ -191,6 +195,7 @@ def _classify_reduction_inames(red_realize_ctx, inames):
     from loopy.kernel.data import (
         ConcurrentTag,
         LocalInameTagBase,
+        ThreadParallelTag,
         UnrolledIlpTag,
         UnrollTag,
         filter_iname_tags_by_type,
@@ -210,7 +215,8 @@ def _classify_reduction_inames(red_realize_ctx, inames):
         elif filter_iname_tags_by_type(iname_tags, LocalInameTagBase):
             local_par.append(iname)
 
-        elif filter_iname_tags_by_type(iname_tags, ConcurrentTag):
+        elif filter_iname_tags_by_type(iname_tags,
+                (ConcurrentTag, ThreadParallelTag)):
             nonlocal_par.append(iname)
 
         else:
@@ -220,6 +226,29 @@ def _classify_reduction_inames(red_realize_ctx, inames):
             tuple(sequential), tuple(local_par), tuple(nonlocal_par))
 
 
+def _is_thread_parallel_iname(red_realize_ctx, iname):
+    """Return whether *iname* is tagged ``g`` (or already realized as a
+    thread-parallel loop) and the target can implement it as a loop whose
+    iterations are distributed across threads.
+    """
+    from loopy.kernel.data import (
+        GroupInameTag,
+        ThreadParallelTag,
+        filter_iname_tags_by_type,
+    )
+
+    try:
+        iname_tags = red_realize_ctx.additional_iname_tags[iname]
+    except KeyError:
+        iname_tags = red_realize_ctx.kernel.iname_tags(iname)
+
+    return bool(
+            filter_iname_tags_by_type(
+                iname_tags, (GroupInameTag, ThreadParallelTag))
+            and red_realize_ctx.kernel.target.get_device_ast_builder()
+            .can_implement_thread_parallel_loops)
+
+
 def _add_params_to_domain(domain, param_names):
     dim_type = isl.dim_type
     nparams_orig = domain.dim(dim_type.param)
@@ -1320,6 +1349,216 @@ def map_reduction_local(red_realize_ctx, expr, nresults, arg_dtypes,
 # }}}
 
 
+# {{{ reduction type: thread-parallel
+
+def _get_constant_iname_lower_bound(kernel, iname):
+    from loopy.isl_helpers import static_min_of_pw_aff
+    from loopy.symbolic import pw_aff_to_expr
+    lbound = pw_aff_to_expr(
+            static_min_of_pw_aff(
+                kernel.get_iname_bounds(iname, constants_only=True)
+                .lower_bound_pw_aff,
+                constants_only=True))
+    assert isinstance(lbound, int)
+    return lbound
+
+
+def _combine_thread_partials(red_realize_ctx, expr, nresults, arg_dtypes,
+        reduction_dtypes, partial_vars, npartials, name_based_on, depends_on):
+    """Add instructions sequentially combining the first *npartials* entries
+    of the arrays *partial_vars* and return the variables holding the
+    result.
+    """
+    orig_kernel = red_realize_ctx.orig_kernel
+
+    combine_iname = red_realize_ctx.var_name_gen(name_based_on + "_combine")
+    red_realize_ctx.domains.append(_make_slab_set(combine_iname, npartials))
+    red_realize_ctx.additional_iname_tags[combine_iname] = frozenset()
+
+    acc_var_names = _make_temporaries(
+            red_realize_ctx=red_realize_ctx,
+            name_based_on="acc_"+name_based_on,
+            nvars=nresults,
+            shape=(),
+            dtypes=reduction_dtypes,
+            address_space=AddressSpace.PRIVATE)
+
+    from pymbolic import var
+    acc_vars = tuple(var(n) for n in acc_var_names)
+
+    neutral, red_realize_ctx.boxed_callables_table[0] = \
+            expr.operation.neutral_element(*arg_dtypes,
+                    callables_table=red_realize_ctx.boxed_callables_table[0],
+                    target=orig_kernel.target)
+
+    init_id = red_realize_ctx.insn_id_gen(
+            f"{red_realize_ctx.id_prefix}_{name_based_on}_combine_init")
+    init_insn = make_assignment(
+            id=init_id,
+            assignees=acc_vars,
+            expression=neutral,
+            within_inames=red_realize_ctx.surrounding_within_inames,
+            within_inames_is_final=True,
+            depends_on=frozenset())
+    red_realize_ctx.additional_insns.append(init_insn)
+
+    combine_id = red_realize_ctx.insn_id_gen(
+            f"{red_realize_ctx.id_prefix}_{name_based_on}_combine")
+    expression, red_realize_ctx.boxed_callables_table[0] = expr.operation(
+            arg_dtypes,
+            _strip_if_scalar(acc_vars, acc_vars),
+            _strip_if_scalar(acc_vars, tuple(
+                partial_var[var(combine_iname)] for partial_var in partial_vars)),
+            red_realize_ctx.boxed_callables_table[0],
+            orig_kernel.target)
+    combine_insn = make_assignment(
+            id=combine_id,
+            assignees=acc_vars,
+            expression=expression,
+            within_inames=(
+                red_realize_ctx.surrounding_within_inames
+                | frozenset([combine_iname])),
+            within_inames_is_final=True,
+            depends_on=frozenset([init_id]) | depends_on,
+            predicates=red_realize_ctx.surrounding_predicates)
+    red_realize_ctx.additional_insns.append(combine_insn)
+
+    return acc_vars, combine_id
+
+
+def map_reduction_threaded(red_realize_ctx, expr, nresults, arg_dtypes,
+        reduction_dtypes, thread_iname):
+    """Realize the reduction *expr* over the ``g``-tagged *thread_iname* (and,
+    possibly, further sequential inames) as a thread-parallel loop over
+    *thread_iname* accumulating per-thread partial results, followed by a
+    sequential combine of the partial results.
+    """
+    orig_kernel = red_realize_ctx.orig_kernel
+
+    inner_inames = frozenset(expr.inames) - {thread_iname}
+    red_realize_ctx.thread_parallel_inames.setdefault(
+            thread_iname, set()).update(inner_inames)
+
+    # The number of threads needs to be bounded, but not constant: *n* may
+    # be bounded by the kernel's assumptions.
+    nthreads = orig_kernel.get_constant_iname_length(thread_iname)
+    thread_lbound = _get_constant_iname_lower_bound(orig_kernel, thread_iname)
+
+    partial_var_names = _make_temporaries(
+            red_realize_ctx=red_realize_ctx,
+            name_based_on="partial_"+thread_iname,
+            nvars=nresults,
+            shape=(nthreads,),
+            dtypes=reduction_dtypes,
+            address_space=AddressSpace.PRIVATE)
+
+    from pymbolic import var
+    partial_vars = tuple(var(n) for n in partial_var_names)
+
+    # {{{ initialize partial results
+
+    # This uses a separate iname to also initialize the partial results of
+    # threads that do not contribute, as the combine reads all of them.
+
+    init_iname = red_realize_ctx.var_name_gen(thread_iname + "_init")
+    red_realize_ctx.domains.append(_make_slab_set(init_iname, nthreads))
+    red_realize_ctx.additional_iname_tags[init_iname] = frozenset()
+
+    neutral, red_realize_ctx.boxed_callables_table[0] = \
+            expr.operation.neutral_element(*arg_dtypes,
+                    callables_table=red_realize_ctx.boxed_callables_table[0],
+                    target=orig_kernel.target)
+
+    init_id = red_realize_ctx.insn_id_gen(
+            f"{red_realize_ctx.id_prefix}_{thread_iname}_init")
+    init_insn = make_assignment(
+            id=init_id,
+            assignees=tuple(
+                partial_var[var(init_iname)] for partial_var in partial_vars),
+            expression=neutral,
+            within_inames=(
+                red_realize_ctx.surrounding_within_inames
+                | frozenset([init_iname])),
+            within_inames_is_final=True,
+            depends_on=frozenset(),
+            # Do not inherit predicates, see map_reduction_seq.
+            )
+    red_realize_ctx.additional_insns.append(init_insn)
+
+    # }}}
+
+    # {{{ accumulate per-thread partial results
+
+    update_id = red_realize_ctx.insn_id_gen(
+            f"{red_realize_ctx.id_prefix}_{'_'.join(expr.inames)}_update")
+
+    update_red_realize_ctx = red_realize_ctx.new_subinstruction(
+            within_inames=(
+                red_realize_ctx.surrounding_within_inames
+                | frozenset(expr.inames)),
+            depends_on=(
+                frozenset({init_id})
+                | red_realize_ctx.surrounding_depends_on))
+
+    reduction_expr = red_realize_ctx.mapper(
+            expr.expr, red_realize_ctx=update_red_realize_ctx,
+            nresults=1)
+
+    # In the case of a multi-argument reduction, we need a name for each of
+    # the arguments in order to pass them to the binary op - so we expand
+    # items that are not "plain" tuples here.
+    if nresults > 1 and not isinstance(reduction_expr, tuple):
+        get_args_insn_id = red_realize_ctx.insn_id_gen(
+                f"{red_realize_ctx.id_prefix}_{'_'.join(expr.inames)}_get")
+
+        reduction_expr = expand_inner_reduction(
+                red_realize_ctx=red_realize_ctx,
+                id=get_args_insn_id,
+                expr=reduction_expr,
+                nresults=nresults,
+                depends_on=red_realize_ctx.surrounding_depends_on,
+                within_inames=update_red_realize_ctx.surrounding_within_inames,
+                predicates=red_realize_ctx.surrounding_predicates,
+                )
+
+        update_red_realize_ctx.surrounding_insn_add_depends_on.add(get_args_insn_id)
+
+    thread_partials = tuple(
+            partial_var[var(thread_iname) - thread_lbound if thread_lbound
+                        else var(thread_iname)]
+            for partial_var in partial_vars)
+
+    expression, red_realize_ctx.boxed_callables_table[0] = expr.operation(
+            arg_dtypes,
+            _strip_if_scalar(thread_partials, thread_partials),
+            reduction_expr,
+            red_realize_ctx.boxed_callables_table[0],
+            orig_kernel.target)
+
+    update_insn = make_assignment(
+            id=update_id,
+            assignees=thread_partials,
+            expression=expression,
+            **update_red_realize_ctx.get_insn_kwargs())
+    red_realize_ctx.additional_insns.append(update_insn)
+
+    # }}}
+
+    acc_vars, combine_id = _combine_thread_partials(
+            red_realize_ctx, expr, nresults, arg_dtypes, reduction_dtypes,
+            partial_vars, nthreads, thread_iname, frozenset([update_id]))
+
+    red_realize_ctx.surrounding_insn_add_depends_on.add(combine_id)
+
+    if nresults == 1:
+        assert len(acc_vars) == 1
+        return acc_vars[0]
+    else:
+        return acc_vars
+
+# }}}
+
+
 # {{{ utils (stateful)
 
 @memoize_on_first_arg
@@ -1760,6 +1999,298 @@ def map_scan_local(red_realize_ctx, expr, nresults, arg_dtypes,
 # }}}
 
 
+# {{{ reduction type: thread-parallel scan
+
+def _add_chunked_sweep_domains(red_realize_ctx, scan_param, chunk_iname,
+        sweep_iname, track_iname, chunk_size, nchunks):
+    """Add domains for a loop over *nchunks* chunks of *chunk_size*
+    consecutive values of the sweep iname (renamed to *sweep_iname*) and,
+    nested within, a loop over the values of the scan iname (renamed to
+    *track_iname*) added to the scan by each sweep iname value.
+    """
+    dim_type = isl.dim_type
+
+    orig_domain = red_realize_ctx.kernel.get_inames_domain(
+            frozenset((scan_param.scan_iname, scan_param.sweep_iname)))
+
+    chunk_domain = _make_slab_set(chunk_iname, nchunks)
+
+    sweep_domain = isl.BasicSet.universe(orig_domain.params().space)
+    sweep_domain = _add_params_to_domain(sweep_domain, (chunk_iname, sweep_iname))
+    affs = isl.affs_from_space(sweep_domain.space)
+
+    sweep_idx = affs[sweep_iname] - scan_param.sweep_lower_bound
+    sweep_domain &= sweep_idx.ge_set(chunk_size * affs[chunk_iname])
+    sweep_domain &= sweep_idx.lt_set(chunk_size * (affs[chunk_iname] + 1))
+    sweep_domain &= affs[sweep_iname].le_set(scan_param.sweep_upper_bound)
+
+    sweep_domain = sweep_domain.move_dims(
+            dim_type.set, 0,
+            dim_type.param, sweep_domain.dim(dim_type.param) - 1, 1)
+    sweep_domain, = sweep_domain.get_basic_sets()
+
+    track_domain = _create_domain_for_sweep_tracking(
+            sweep_domain, track_iname,
+            replace(scan_param, sweep_iname=sweep_iname))
+
+    red_realize_ctx.domains.extend([chunk_domain, sweep_domain, track_domain])
+    red_realize_ctx.inames_added_for_scan.add(track_iname)
+
+    for iname in (sweep_iname, track_iname):
+        red_realize_ctx.additional_iname_tags[iname] = frozenset()
+
+    from loopy.kernel.data import ThreadParallelTag
+    red_realize_ctx.additional_iname_tags[chunk_iname] = frozenset(
+            [ThreadParallelTag()])
+
+
+def map_scan_threaded(red_realize_ctx, expr, nresults, arg_dtypes,
+        reduction_dtypes, scan_param):
+    """Realize the scan *expr* over the ``g``-tagged sweep iname as a
+    thread-parallel loop over chunks of the sweep iname computing the
+    partial result of each chunk, followed by a sequential exclusive scan of
+    the partial results and a thread-parallel loop over the chunks computing
+    the scan within each chunk, starting from its scanned partial result.
+    """
+    orig_kernel = red_realize_ctx.orig_kernel
+    sweep_iname = scan_param.sweep_iname
+
+    red_realize_ctx.thread_parallel_inames.setdefault(sweep_iname, set())
+
+    scan_size = _get_int_iname_size(orig_kernel, sweep_iname)
+
+    assert scan_size > 0
+
+    # Balances the sequential scan over the chunks against the length of
+    # the chunks.
+    from math import isqrt
+    chunk_size = isqrt(scan_size - 1) + 1
+    nchunks = (scan_size + chunk_size - 1) // chunk_size
+
+    base_inames = (
+            red_realize_ctx.surrounding_within_inames
+            - frozenset([sweep_iname]))
+
+    from pymbolic import var
+
+    from loopy.symbolic import pw_aff_to_expr
+    sweep_lower_bound_expr = pw_aff_to_expr(scan_param.sweep_lower_bound)
+
+    scan_red_realize_ctx = red_realize_ctx.new_subinstruction(
+            within_inames=base_inames | frozenset({scan_param.scan_iname}),
+            depends_on=red_realize_ctx.surrounding_depends_on)
+
+    reduction_expr = red_realize_ctx.mapper(
+            expr.expr, red_realize_ctx=scan_red_realize_ctx,
+            nresults=1)
+
+    neutral, red_realize_ctx.boxed_callables_table[0] = \
+            expr.operation.neutral_element(*arg_dtypes,
+                    callables_table=red_realize_ctx.boxed_callables_table[0],
+                    target=orig_kernel.target)
+
+    def make_temporaries(name_based_on, shape):
+        return tuple(var(name) for name in _make_temporaries(
+                red_realize_ctx=red_realize_ctx,
+                name_based_on=name_based_on,
+                nvars=nresults,
+                shape=shape,
+                dtypes=reduction_dtypes,
+                address_space=AddressSpace.PRIVATE))
+
+    def add_chunked_loops(phase):
+        """Return the names of new inames looping over the chunks, the sweep
+        iname values within each chunk and the scan iname values added by
+        each sweep iname value.
+        """
+        inames = tuple(
+                red_realize_ctx.var_name_gen(f"{sweep_iname}__{name}{phase}")
+                for name in ("chunk", "sweep", "track"))
+        _add_chunked_sweep_domains(red_realize_ctx, scan_param, *inames,
+                chunk_size, nchunks)
+        return inames
+
+    def add_chunked_update(phase, acc_vars, inames, depends_on):
+        """Add an instruction accumulating the scan arguments within each
+        chunk into *acc_vars* and return its id.
+        """
+        *_, track_iname = inames
+
+        updated_inner_exprs, update_depends_on = _preprocess_scan_arguments(
+                scan_red_realize_ctx,
+                reduction_expr, nresults,
+                scan_param.scan_iname, track_iname, depends_on)
+
+        update_id = red_realize_ctx.insn_id_gen(
+                f"{red_realize_ctx.id_prefix}_{scan_param.scan_iname}"
+                f"_update{phase}")
+
+        expression, red_realize_ctx.boxed_callables_table[0] = expr.operation(
+                arg_dtypes,
+                _strip_if_scalar(acc_vars, acc_vars),
+                _strip_if_scalar(acc_vars, updated_inner_exprs),
+                red_realize_ctx.boxed_callables_table[0],
+                orig_kernel.target)
+
+        red_realize_ctx.additional_insns.append(make_assignment(
+                id=update_id,
+                assignees=acc_vars,
+                expression=expression,
+                within_inames=(
+                    base_inames
+                    | frozenset(inames)
+                    | frozenset(
+                        scan_red_realize_ctx.surrounding_insn_add_within_inames)),
+                within_inames_is_final=True,
+                depends_on=(
+                    frozenset(update_depends_on)
+                    | frozenset(scan_red_realize_ctx.surrounding_insn_add_depends_on)
+                    ),
+                no_sync_with=(
+                    red_realize_ctx.surrounding_no_sync_with
+                    | frozenset(
+                        scan_red_realize_ctx.surrounding_insn_add_no_sync_with)),
+                predicates=red_realize_ctx.surrounding_predicates))
+
+        return update_id
+
+    # {{{ phase 1: reduce each chunk
+
+    partial_vars = make_temporaries(
+            "partial_"+scan_param.scan_iname, (nchunks,))
+
+    init_iname = red_realize_ctx.var_name_gen(f"{sweep_iname}__init")
+    red_realize_ctx.domains.append(_make_slab_set(init_iname, nchunks))
+    red_realize_ctx.additional_iname_tags[init_iname] = frozenset()
+
+    init_id = red_realize_ctx.insn_id_gen(
+            f"{red_realize_ctx.id_prefix}_{scan_param.scan_iname}_init")
+    red_realize_ctx.additional_insns.append(make_assignment(
+            id=init_id,
+            assignees=tuple(
+                partial_var[var(init_iname)] for partial_var in partial_vars),
+            expression=neutral,
+            within_inames=base_inames | frozenset([init_iname]),
+            within_inames_is_final=True,
+            depends_on=frozenset(),
+            # Do not inherit predicates, see map_reduction_seq.
+            ))
+
+    inames = add_chunked_loops(1)
+    chunk_iname, _, _ = inames
+    reduce_id = add_chunked_update(1,
+            tuple(partial_var[var(chunk_iname)] for partial_var in partial_vars),
+            inames, frozenset([init_id]))
+
+    # }}}
+
+    # {{{ phase 2: exclusive scan of the partial results of the chunks
+
+    offset_vars = make_temporaries(
+            "offset_"+scan_param.scan_iname, (nchunks,))
+    carry_vars = make_temporaries("carry_"+scan_param.scan_iname, ())
+
+    carry_iname = red_realize_ctx.var_name_gen(f"{sweep_iname}__carry")
+    red_realize_ctx.domains.append(_make_slab_set(carry_iname, nchunks))
+    red_realize_ctx.additional_iname_tags[carry_iname] = frozenset()
+
+    carry_init_id = red_realize_ctx.insn_id_gen(
+            f"{red_realize_ctx.id_prefix}_{scan_param.scan_iname}_carry_init")
+    red_realize_ctx.additional_insns.append(make_assignment(
+            id=carry_init_id,
+            assignees=carry_vars,
+            expression=neutral,
+            within_inames=base_inames,
+            within_inames_is_final=True,
+            depends_on=frozenset()))
+
+    offset_ids = frozenset()
+    for offset_var, carry_var in zip(offset_vars, carry_vars):
+        offset_id = red_realize_ctx.insn_id_gen(
+                f"{red_realize_ctx.id_prefix}_{scan_param.scan_iname}_offset")
+        red_realize_ctx.additional_insns.append(make_assignment(
+                id=offset_id,
+                assignees=(offset_var[var(carry_iname)],),
+                expression=carry_var,
+                within_inames=base_inames | frozenset([carry_iname]),
+                within_inames_is_final=True,
+                depends_on=frozenset([carry_init_id])))
+        offset_ids = offset_ids | frozenset([offset_id])
+
+    carry_id = red_realize_ctx.insn_id_gen(
+            f"{red_realize_ctx.id_prefix}_{scan_param.scan_iname}_carry")
+    expression, red_realize_ctx.boxed_callables_table[0] = expr.operation(
+            arg_dtypes,
+            _strip_if_scalar(carry_vars, carry_vars),
+            _strip_if_scalar(carry_vars, tuple(
+                partial_var[var(carry_iname)] for partial_var in partial_vars)),
+            red_realize_ctx.boxed_callables_table[0],
+            orig_kernel.target)
+    red_realize_ctx.additional_insns.append(make_assignment(
+            id=carry_id,
+            assignees=carry_vars,
+            expression=expression,
+            within_inames=base_inames | frozenset([carry_iname]),
+            within_inames_is_final=True,
+            depends_on=offset_ids | frozenset([reduce_id])))
+
+    # }}}
+
+    # {{{ phase 3: scan each chunk, starting from its offset
+
+    acc_vars = make_temporaries("acc_"+scan_param.scan_iname, ())
+    result_vars = make_temporaries(
+            "result_"+scan_param.scan_iname, (scan_size,))
+
+    inames = add_chunked_loops(3)
+    chunk_iname, chunk_sweep_iname, _ = inames
+
+    start_ids = frozenset()
+    for acc_var, offset_var in zip(acc_vars, offset_vars):
+        start_id = red_realize_ctx.insn_id_gen(
+                f"{red_realize_ctx.id_prefix}_{scan_param.scan_iname}_start")
+        red_realize_ctx.additional_insns.append(make_assignment(
+                id=start_id,
+                assignees=(acc_var,),
+                expression=offset_var[var(chunk_iname)],
+                within_inames=base_inames | frozenset([chunk_iname]),
+                within_inames_is_final=True,
+                depends_on=offset_ids | frozenset([carry_id])))
+        start_ids = start_ids | frozenset([start_id])
+
+    scan_id = add_chunked_update(3, acc_vars, inames, start_ids)
+
+    store_ids = frozenset()
+    for result_var, acc_var in zip(result_vars, acc_vars):
+        store_id = red_realize_ctx.insn_id_gen(
+                f"{red_realize_ctx.id_prefix}_{scan_param.scan_iname}_store")
+        red_realize_ctx.additional_insns.append(make_assignment(
+                id=store_id,
+                assignees=(result_var[
+                    var(chunk_sweep_iname) - sweep_lower_bound_expr],),
+                expression=acc_var,
+                within_inames=(
+                    base_inames | frozenset([chunk_iname, chunk_sweep_iname])),
+                within_inames_is_final=True,
+                depends_on=frozenset([scan_id]),
+                predicates=red_realize_ctx.surrounding_predicates))
+        store_ids = store_ids | frozenset([store_id])
+
+    # }}}
+
+    red_realize_ctx.surrounding_insn_add_depends_on.update(store_ids)
+
+    output_idx = var(sweep_iname) - sweep_lower_bound_expr
+
+    if nresults == 1:
+        assert len(result_vars) == 1
+        return result_vars[0][output_idx]
+    else:
+        return [result_var[output_idx] for result_var in result_vars]
+
+# }}}
+
+
 # {{{ top-level dispatch among reduction types
 
 def map_reduction(expr, *, red_realize_ctx, nresults):
@@ -1831,7 +2362,13 @@ def map_reduction(expr, *, red_realize_ctx, nresults):
                 "before code generation."
                 % ", ".join(expr.inames))
 
-    if n_nonlocal_par:
+    thread_iname = None
+    if (n_nonlocal_par == 1 and n_local_par == 0
+            and _is_thread_parallel_iname(
+                red_realize_ctx, iname_classes.nonlocal_parallel[0])):
+        thread_iname, = iname_classes.nonlocal_parallel
+
+    if n_nonlocal_par and thread_iname is None:
         bad_inames = iname_classes.nonlocal_parallel
         raise LoopyError("the only form of parallelism supported "
                 "by reductions is 'local'--found iname(s) '%s' "
@@ -1844,7 +2381,7 @@ def map_reduction(expr, *, red_realize_ctx, nresults):
 
     red_realize_ctx.changes_made()
 
-    if n_local_par == 0 and n_sequential == 0:
+    if n_local_par == 0 and n_sequential == 0 and thread_iname is None:
         warn_with_kernel(red_realize_ctx.kernel, "empty_reduction",
                 "Empty reduction found (no inames to reduce over). "
                 "Eliminating.")
@@ -1872,6 +2409,10 @@ def map_reduction(expr, *, red_realize_ctx, nresults):
                 _error_if_force_scan_on(LoopyError,
                         "Sweep iname '%s' was detected, but is not an iname "
                         "for the instruction." % sweep_iname)
+            elif bad_parallel and _is_thread_parallel_iname(
+                    red_realize_ctx, sweep_iname):
+                return map_scan_threaded(red_realize_ctx, expr, nresults,
+                        arg_dtypes, reduction_dtypes, scan_param)
             elif bad_parallel:
                 _error_if_force_scan_on(LoopyError,
                         "Sweep iname '%s' has an unsupported parallel tag '%s' "
@@ -1898,7 +2439,11 @@ def map_reduction(expr, *, red_realize_ctx, nresults):
 
             # fallthrough to reduction implementation
 
-    if n_sequential:
+    if thread_iname is not None:
+        return map_reduction_threaded(
+                red_realize_ctx,
+                expr, nresults, arg_dtypes, reduction_dtypes, thread_iname)
+    elif n_sequential:
         assert n_local_par == 0
         return map_reduction_seq(
                 red_realize_ctx,
@@ -1913,6 +2458,29 @@ def map_reduction(expr, *, red_realize_ctx, nresults):
 # }}}
 
 
+# {{{ _tag_thread_parallel_inames
+
+def _tag_thread_parallel_inames(kernel, thread_parallel_inames):
+    from loopy.kernel.data import GroupInameTag, ThreadParallelTag
+    from loopy.transform.iname import tag_inames, untag_inames
+
+    for iname in thread_parallel_inames:
+        kernel = untag_inames(kernel, iname, GroupInameTag)
+
+    kernel = tag_inames(kernel, {
+        iname: ThreadParallelTag() for iname in thread_parallel_inames})
+
+    # Avoid starting a parallel region per iteration of the sequential
+    # reduction inames.
+    return kernel.copy(
+            loop_priority=kernel.loop_priority | frozenset(
+                (iname, inner_iname)
+                for iname, inner_inames in thread_parallel_inames.items()
+                for inner_iname in inner_inames))
+
+# }}}
+
+
 # {{{ realize_reduction_for_single_kernel
 
 # @remove_any_newly_unused_inames
@@ -1934,6 +2502,7 @@ def realize_reduction_for_single_kernel(kernel, callables_table,
     domains = kernel.domains[:]
 
     inames_added_for_scan = set()
+    thread_parallel_inames = {}
 
     kernel_changed = False
 
@@ -1975,6 +2544,7 @@ def realize_reduction_for_single_kernel(kernel, callables_table,
                 boxed_callables_table=[callables_table],
 
                 inames_added_for_scan=inames_added_for_scan,
+                thread_parallel_inames=thread_parallel_inames,
 
                 surrounding_within_inames=insn.within_inames,
                 surrounding_depends_on=insn.depends_on,
@@ -2132,6 +2702,9 @@ def realize_reduction_for_single_kernel(kernel, callables_table,
     if not kernel_changed:
         return orig_kernel, callables_table
 
+    if thread_parallel_inames:
+        kernel = _tag_thread_parallel_inames(kernel, thread_parallel_inames)
+
     kernel = _hackily_ensure_multi_assignment_return_values_are_scoped_private(
                 kernel)
 
@@ -26,6 +26,7 @@ THE SOFTWARE.
 import logging
 from functools import cached_property
 
+import numpy as np
 from immutables import Map
 
 from pytools import Record, memoize_method
@@ -51,6 +52,8 @@ __doc__ = """
 .. currentmodule:: loopy
 
 .. autofunction:: save_and_reload_temporaries
+
+.. autofunction:: auto_alias_temporaries
 """
 
 
@@ -824,4 +827,224 @@ def save_and_reload_temporaries(program, entrypoint=None):
 # }}}
 
 
+# {{{ automatic aliasing of temporaries
+
+def _get_temporary_live_ranges(kernel, temporary_names):
+    """Return a :class:`dict` mapping each of *temporary_names* to the
+    :class:`frozenset` of indices into the linearization of *kernel* at which
+    its storage may hold a value that is still needed.
+
+    A temporary occupies its storage from any point reachable from one of its
+    writes up to any point from which one of its reads is reachable. For
+    temporaries in local memory, this range is extended up to the next
+    barrier, as other work-items may still be accessing the storage.
+    """
+    liveness = LivenessAnalysis(kernel)
+    successors = liveness.get_successor_relation()
+    schedule = kernel.linearization
+
+    predecessors = {sched_idx: set() for sched_idx in range(len(schedule))}
+    for sched_idx, succs in successors.items():
+        for succ in succs:
+            predecessors[succ].add(sched_idx)
+
+    accessed = {sched_idx: set() for sched_idx in range(len(schedule))}
+    written = {sched_idx: set() for sched_idx in range(len(schedule))}
+    for sched_idx, sched_item in enumerate(schedule):
+        if isinstance(sched_item, RunInstruction):
+            insn = kernel.id_to_insn[sched_item.insn_id]
+            written[sched_idx] = set(insn.assignee_var_names()) & temporary_names
+            accessed[sched_idx] = (
+                    written[sched_idx]
+                    | (insn.read_dependency_names() & temporary_names))
+
+    # {{{ forward analysis: which temporaries may have been written
+
+    defined_out = {sched_idx: set() for sched_idx in range(len(schedule))}
+
+    changed = True
+    while changed:
+        changed = False
+        for sched_idx in range(len(schedule)):
+            defined_in = set().union(
+                    *(defined_out[pred] for pred in predecessors[sched_idx]))
+            new_defined_out = defined_in | written[sched_idx]
+            if new_defined_out != defined_out[sched_idx]:
+                defined_out[sched_idx] = new_defined_out
+                changed = True
+
+    # }}}
+
+    live_ranges = {name: set() for name in temporary_names}
+    for sched_idx in range(len(schedule)):
+        defined = defined_out[sched_idx].union(
+                *(defined_out[pred] for pred in predecessors[sched_idx]))
+        live = ((liveness[sched_idx].live_in | liveness[sched_idx].live_out)
+                & defined) | accessed[sched_idx]
+
+        for name in live & temporary_names:
+            live_ranges[name].add(sched_idx)
+
+    def is_local_sync_point(sched_item):
+        return isinstance(sched_item, (Barrier, CallKernel, ReturnFromKernel))
+
+    for name in temporary_names:
+        if (kernel.temporary_variables[name].address_space
+                != AddressSpace.LOCAL):
+            continue
+
+        queue = list(live_ranges[name])
+        while queue:
+            sched_idx = queue.pop()
+            for succ in successors[sched_idx]:
+                if succ not in live_ranges[name]:
+                    live_ranges[name].add(succ)
+                    if not is_local_sync_point(schedule[succ]):
+                        queue.append(succ)
+
+    return {name: frozenset(live_range)
+            for name, live_range in live_ranges.items()}
+
+
+def auto_alias_temporaries(program, only_address_space=None,
+        base_name_prefix=None, entrypoint=None):
+    """Let array temporaries whose live ranges in the linearization of the
+    kernel do not overlap share storage (see :func:`loopy.alias_temporaries`),
+    based on the same liveness analysis as
+    :func:`save_and_reload_temporaries`. Temporaries are only aliased with
+    others in the same address space and of the same type.
+
+    Only private and local temporaries are considered. Temporaries with
+    an initializer, with a non-constant size, or already backed by a
+    :attr:`~loopy.TemporaryVariable.base_storage` are left alone. The number
+    of bytes saved per address space is logged at level ``INFO``.
+
+    As the absence of overlap is established for a particular linearization,
+    the kernel is linearized if it was not already, and the linearization
+    is kept in the returned program. The storage for the aliased temporaries
+    is allocated as in :func:`loopy.allocate_temporaries_for_base_storage`.
+
+    :arg only_address_space: If not *None*, only consider temporaries in
+        this :class:`~loopy.AddressSpace`.
+    :arg base_name_prefix: an identifier to be used for the names of the
+        common storage areas
+
+    :returns: The resulting program
+
+    .. versionadded:: 2024.2
+    """
+    from pytools import product
+
+    from loopy.kernel.array import VectorArrayDimTag
+    from loopy.transform.data import (
+        alias_temporaries,
+        allocate_temporaries_for_base_storage,
+    )
+
+    if entrypoint is None:
+        if len(program.entrypoints) != 1:
+            raise LoopyError("Missing argument 'entrypoint'.")
+        entrypoint = next(iter(program.entrypoints))
+
+    knl = program[entrypoint]
+
+    from loopy.preprocess import preprocess_program
+
+    if not knl.linearization:
+        program = preprocess_program(program)
+        from loopy.schedule import get_one_linearized_kernel
+        knl = get_one_linearized_kernel(program[entrypoint],
+                program.callables_table)
+
+    assert knl.linearization is not None
+
+    if only_address_space is None:
+        address_spaces = {AddressSpace.PRIVATE, AddressSpace.LOCAL}
+    else:
+        address_spaces = {only_address_space} - {AddressSpace.GLOBAL}
+
+    storage_names = {tv.base_storage
+                     for tv in knl.temporary_variables.values()
+                     if tv.base_storage is not None}
+
+    def get_nbytes(tv):
+        if (tv.address_space not in address_spaces
+                or tv.base_storage is not None
+                or tv.name in storage_names
+                or tv.initializer is not None
+                # scalars are accessed by value, not through a pointer
+                or not tv.shape
+                or any(isinstance(dim_tag, VectorArrayDimTag)
+                       for dim_tag in tv.dim_tags or ())):
+            return None
+
+        size = product(tv.shape)
+        if not isinstance(size, (int, np.integer)):
+            return None
+
+        return int(size) * tv.dtype.numpy_dtype.itemsize
+
+    temporary_nbytes = {}
+    for tv in knl.temporary_variables.values():
+        nbytes = get_nbytes(tv)
+        if nbytes is not None:
+            temporary_nbytes[tv.name] = nbytes
+
+    live_ranges = _get_temporary_live_ranges(knl, set(temporary_nbytes))
+
+    # {{{ greedily pack temporaries into groups
+
+    # Largest first, and, among temporaries of equal size, in the order in
+    # which their live ranges begin, which needs the fewest groups if the
+    # live ranges are intervals.
+    def get_packing_key(name):
+        return (-temporary_nbytes[name], min(live_ranges[name], default=-1),
+                name)
+
+    groups = []
+    for name in sorted(temporary_nbytes, key=get_packing_key):
+        tv = knl.temporary_variables[name]
+
+        for group in groups:
+            group_tv = knl.temporary_variables[group[0]]
+            if (group_tv.address_space == tv.address_space
+                    and group_tv.dtype == tv.dtype
+                    and all(not (live_ranges[name] & live_ranges[other_name])
+                            for other_name in group)):
+                group.append(name)
+                break
+        else:
+            groups.append([name])
+
+    # }}}
+
+    from collections import defaultdict
+    nbytes_saved = defaultdict(int)
+
+    for group in groups:
+        if len(group) == 1:
+            continue
+
+        address_space = knl.temporary_variables[group[0]].address_space
+        nbytes_saved[address_space] += (
+                sum(temporary_nbytes[name] for name in group)
+                - temporary_nbytes[group[0]])
+
+        logger.info("%s: aliasing temporaries %s",
+                    knl.name, ", ".join(group))
+        knl = alias_temporaries(knl, group, base_name_prefix=base_name_prefix,
+                synchronize_for_exclusive_use=False)
+
+    for address_space, nbytes in sorted(nbytes_saved.items()):
+        logger.info("%s: aliasing temporaries saved %d bytes of %s memory",
+                    knl.name, nbytes, AddressSpace.stringify(address_space))
+
+    if nbytes_saved:
+        knl = allocate_temporaries_for_base_storage(knl)
+
+    return program.with_kernel(knl)
+
+# }}}
+
+
 # vim: foldmethod=marker
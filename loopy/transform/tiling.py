@@ -0,0 +1,529 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 University of Illinois Board of Trustees"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+from islpy import dim_type
+
+from loopy.diagnostic import LoopyError
+from loopy.kernel import LoopKernel
+from loopy.symbolic import IdentityMapper
+from loopy.translation_unit import for_each_kernel
+
+
+if TYPE_CHECKING:
+    from loopy.typing import InameStr
+
+
+logger = logging.getLogger(__name__)
+
+
+__doc__ = """
+.. currentmodule:: loopy
+
+.. autofunction:: tile_inames
+
+.. autofunction:: unroll_and_jam
+
+.. currentmodule:: loopy.transform.tiling
+
+.. autofunction:: get_tile_working_set_bytes
+"""
+
+
+def _normalize_inames(inames: str | Sequence[InameStr]) -> tuple[InameStr, ...]:
+    if isinstance(inames, str):
+        inames = [s.strip() for s in inames.split(",") if s.strip()]
+
+    return tuple(inames)
+
+
+# {{{ working set model
+
+def _get_iname_lower_bounds_and_sizes(kernel, inames):
+    from loopy.isl_helpers import StaticValueFindingError
+
+    result = {}
+    for iname in inames:
+        try:
+            bounds = kernel.get_iname_bounds(iname, constants_only=True)
+            lbound = bounds.lower_bound_pw_aff
+            if not lbound.is_cst():
+                raise StaticValueFindingError
+            lbound = lbound.max_val().to_python()
+            size = bounds.size.max_val().to_python()
+        except StaticValueFindingError:
+            raise LoopyError(
+                    f"could not find constant bounds for iname '{iname}'. "
+                    "Pass values for the domain parameters to get a working "
+                    "set estimate.") from None
+
+        result[iname] = (lbound, size)
+
+    return result
+
+
+def get_tile_working_set_bytes(kernel: LoopKernel,
+                               tile_sizes: Mapping[InameStr, int],
+                               parameters: Mapping[str, int] | None = None
+                               ) -> int:
+    """Return the number of bytes of distinct array elements accessed by
+    *kernel* within one tile of the loop nest whose extents are given by
+    *tile_sizes*, a mapping from inames to tile lengths.
+
+    The footprints are gathered as in :func:`loopy.gather_access_footprints`,
+    after restricting each iname in *tile_sizes* to its first *tile_size*
+    iterations. Inames not in *tile_sizes* are assumed to be nested inside the
+    tile, i.e. their entire range contributes to the working set.
+
+    :arg parameters: a mapping from domain parameters to values. Required if
+        the loop bounds or the footprints depend on them.
+    """
+    from loopy.isl_helpers import make_slab
+    from loopy.kernel.instruction import MultiAssignmentBase
+    from loopy.statistics import AccessFootprintGatherer, count
+    from loopy.transform.parameter import fix_parameters
+    from loopy.transform.subst import expand_subst
+    from loopy.types import LoopyType
+
+    kernel = expand_subst(kernel)
+    if parameters:
+        kernel = fix_parameters(kernel, **parameters)
+
+    iname_to_lbound_and_size = _get_iname_lower_bounds_and_sizes(
+            kernel, tile_sizes)
+
+    new_domains = []
+    for dom in kernel.domains:
+        var_dict = dom.get_var_dict()
+        for iname, tile_size in tile_sizes.items():
+            if iname in var_dict:
+                lbound, _ = iname_to_lbound_and_size[iname]
+                dom = dom & make_slab(dom.space, iname, lbound, lbound+tile_size)
+
+        new_domains.append(dom)
+
+    kernel = kernel.copy(domains=new_domains)
+
+    footprints = []
+    for insn in kernel.instructions:
+        if not isinstance(insn, MultiAssignmentBase):
+            continue
+
+        inames = kernel.insn_inames(insn) | insn.reduction_inames()
+        domain = (kernel.get_inames_domain(inames)
+                  .project_out_except(inames, [dim_type.set]))
+
+        afg = AccessFootprintGatherer(kernel, domain)
+        footprints.append(afg(insn.assignees))
+        footprints.append(afg(insn.expression))
+
+    if not footprints:
+        return 0
+
+    result = 0
+    for var_name, footprint in AccessFootprintGatherer.combine(footprints).items():
+        dtype = kernel.get_var_descriptor(var_name).dtype
+        if not isinstance(dtype, LoopyType):
+            raise LoopyError(f"dtype of '{var_name}' is unknown, cannot "
+                    "estimate the working set")
+
+        nelements = count(kernel, footprint)
+        if nelements.pwqpolynomial.dim(dim_type.param):
+            raise LoopyError(f"footprint of '{var_name}' depends on "
+                    "domain parameters. Pass values for them to get a working "
+                    "set estimate.")
+
+        result += dtype.numpy_dtype.itemsize * nelements.eval_with_dict({})
+
+    return int(result)
+
+
+def _find_tile_sizes(kernel, inames, cache_bytes, parameters):
+    from loopy.transform.parameter import fix_parameters
+
+    fixed_kernel = kernel
+    if parameters:
+        fixed_kernel = fix_parameters(kernel, **parameters)
+    iname_to_size = {
+            iname: size
+            for iname, (_, size) in _get_iname_lower_bounds_and_sizes(
+                fixed_kernel, inames).items()}
+
+    tile_sizes = dict.fromkeys(inames, 1)
+    working_set = get_tile_working_set_bytes(kernel, tile_sizes, parameters)
+    if working_set > cache_bytes:
+        logger.info("tile_inames: smallest tile has a working set of "
+                    f"{working_set} bytes, exceeding cache_bytes={cache_bytes}")
+
+    # Greedily double the tile length that adds the least to the working set
+    # until the working set no longer fits.
+    while True:
+        candidates = []
+        for iname in inames:
+            if tile_sizes[iname] >= iname_to_size[iname]:
+                continue
+
+            new_tile_sizes = {
+                    **tile_sizes,
+                    iname: min(2*tile_sizes[iname], iname_to_size[iname])}
+            new_working_set = get_tile_working_set_bytes(
+                    kernel, new_tile_sizes, parameters)
+            if new_working_set <= cache_bytes:
+                candidates.append((new_working_set, new_tile_sizes))
+
+        if not candidates:
+            break
+
+        # min() picks the earliest (outermost) iname among equals.
+        working_set, tile_sizes = min(candidates, key=lambda c: c[0])
+
+    logger.info(f"tile_inames: chose tile sizes {tile_sizes}, "
+                f"working set: {working_set} bytes")
+
+    return tile_sizes
+
+# }}}
+
+
+# {{{ tile_inames
+
+@for_each_kernel
+def tile_inames(kernel: LoopKernel,
+                inames: str | Sequence[InameStr],
+                tile_sizes: str | Sequence[int] | Mapping[InameStr, int] = "auto",
+                *,
+                cache_bytes: int = 32*1024,
+                parameters: Mapping[str, int] | None = None,
+                ) -> LoopKernel:
+    """Tile the loop nest over *inames* for cache reuse: Split each of
+    *inames* into an outer iname enumerating the tiles and an inner iname
+    enumerating the iterations within a tile, and prioritize the loops so
+    that all tile loops enclose all intra-tile loops, each group ordered as
+    in *inames*.
+
+    For an iname ``i``, the new inames are named as in :func:`split_iname`,
+    i.e. ``i_outer`` and ``i_inner`` unless those are taken.
+
+    :arg inames: a sequence of inames or a comma-separated string of inames,
+        outermost first.
+    :arg tile_sizes: a sequence of tile lengths, one for each of *inames*, a
+        mapping from inames to tile lengths, or ``"auto"``. If ``"auto"``,
+        the tile lengths are powers of two (or the iname's length), chosen
+        greedily such that the tile's working set, as estimated by
+        :func:`loopy.transform.tiling.get_tile_working_set_bytes`, does not
+        exceed *cache_bytes*.
+    :arg cache_bytes: the size of the targeted cache level in bytes. Only
+        used if *tile_sizes* is ``"auto"``.
+    :arg parameters: a mapping from domain parameters to representative
+        values, used for the working set estimate if the loop bounds depend
+        on them. Only used if *tile_sizes* is ``"auto"``.
+
+    .. versionadded:: 2024.2
+    """
+    assert isinstance(kernel, LoopKernel)
+
+    inames = _normalize_inames(inames)
+
+    if not inames:
+        return kernel
+
+    unknown_inames = set(inames) - kernel.all_inames()
+    if unknown_inames:
+        raise LoopyError("tile_inames: unknown inames: "
+                f"{', '.join(sorted(unknown_inames))}")
+
+    if len(set(inames)) != len(inames):
+        raise LoopyError("tile_inames: inames must not repeat")
+
+    # Reductions accumulate into a scalar, so the intra-tile loops of the
+    # other inames cannot be nested inside the tile loop of a reduction iname.
+    reduction_inames = set(inames) & frozenset().union(*(
+            insn.reduction_inames() for insn in kernel.instructions))
+    if reduction_inames:
+        raise LoopyError("tile_inames: cannot tile reduction inames "
+                f"'{', '.join(sorted(reduction_inames))}'. Tile the remaining "
+                "inames, or write the reduction as an explicit update of the "
+                "result.")
+
+    if isinstance(tile_sizes, str):
+        if tile_sizes != "auto":
+            raise LoopyError(f"tile_inames: invalid tile_sizes '{tile_sizes}'")
+        tile_sizes = _find_tile_sizes(kernel, inames, cache_bytes, parameters)
+
+    elif isinstance(tile_sizes, Mapping):
+        if set(tile_sizes) != set(inames):
+            raise LoopyError("tile_inames: tile_sizes must have an entry for "
+                    "each of the inames")
+
+    else:
+        tile_sizes = tuple(tile_sizes)
+        if len(tile_sizes) != len(inames):
+            raise LoopyError("tile_inames: expected one tile size for each of "
+                    f"the {len(inames)} inames, got {len(tile_sizes)}")
+        tile_sizes = dict(zip(inames, tile_sizes))
+
+    from loopy.transform.iname import prioritize_loops, split_iname
+
+    vng = kernel.get_var_name_generator()
+    outer_inames = []
+    inner_inames = []
+    for iname in inames:
+        outer_iname = vng(iname + "_outer")
+        inner_iname = vng(iname + "_inner")
+
+        kernel = split_iname(kernel, iname, tile_sizes[iname],
+                             outer_iname=outer_iname, inner_iname=inner_iname)
+
+        outer_inames.append(outer_iname)
+        inner_inames.append(inner_iname)
+
+    return prioritize_loops(kernel, outer_inames + inner_inames)
+
+# }}}
+
+
+# {{{ unroll_and_jam
+
+class _InvariantLoadHoister(IdentityMapper):
+    def __init__(self, kernel, invariant_inames, read_only_vars, var_name_gen):
+        super().__init__()
+        self.kernel = kernel
+        self.invariant_inames = invariant_inames
+        self.read_only_vars = read_only_vars
+        self.var_name_gen = var_name_gen
+
+        self.hoisted_expr_to_var_name = {}
+
+    def map_subscript(self, expr):
+        from pymbolic.primitives import Variable
+
+        from loopy.kernel.data import AddressSpace, TemporaryVariable
+        from loopy.symbolic import get_dependencies
+
+        if not isinstance(expr.aggregate, Variable):
+            return super().map_subscript(expr)
+
+        var_name = expr.aggregate.name
+        var_descr = self.kernel.get_var_descriptor(var_name)
+
+        if (var_name in self.read_only_vars
+                and not (isinstance(var_descr, TemporaryVariable)
+                    and var_descr.address_space == AddressSpace.PRIVATE)
+                and (get_dependencies(expr.index)
+                     <= self.invariant_inames | self.kernel.all_params())):
+            try:
+                tmp_name = self.hoisted_expr_to_var_name[expr]
+            except KeyError:
+                tmp_name = self.var_name_gen(f"{var_name}_hoisted")
+                self.hoisted_expr_to_var_name[expr] = tmp_name
+
+            return Variable(tmp_name)
+
+        return super().map_subscript(expr)
+
+    # Only the condition and the first operands of logical operators are
+    # evaluated unconditionally, loads from the other operands may be out of
+    # bounds if hoisted.
+
+    def map_if(self, expr):
+        return type(expr)(self.rec(expr.condition), expr.then, expr.else_)
+
+    def map_logical_and(self, expr):
+        return type(expr)((self.rec(expr.children[0]), *expr.children[1:]))
+
+    map_logical_or = map_logical_and
+
+
+def _hoist_invariant_loads(kernel, jam_iname):
+    from pymbolic.primitives import Variable
+
+    from loopy.kernel.data import AddressSpace, TemporaryVariable
+    from loopy.kernel.instruction import Assignment, MultiAssignmentBase
+
+    jammed_insns = [insn for insn in kernel.instructions
+                    if jam_iname in insn.within_inames]
+    jammed_insn_ids = frozenset(insn.id for insn in jammed_insns)
+
+    written_vars = frozenset().union(*(
+        insn.assignee_var_names() for insn in jammed_insns))
+    read_only_vars = frozenset().union(*(
+        insn.read_dependency_names() for insn in jammed_insns)) - written_vars
+
+    var_name_gen = kernel.get_var_name_generator()
+    insn_id_gen = kernel.get_instruction_id_generator()
+
+    new_insns = []
+    new_temps = dict(kernel.temporary_variables)
+
+    # Hoisted loads are shared among instructions in the same loop nest.
+    hoisters = {}
+    within_inames_to_users = {}
+
+    for insn in kernel.instructions:
+        if (insn.id not in jammed_insn_ids
+                or not isinstance(insn, MultiAssignmentBase)
+                # loads of predicated instructions may be out of bounds
+                or insn.predicates):
+            new_insns.append(insn)
+            continue
+
+        invariant_inames = insn.within_inames - {jam_iname}
+        try:
+            hoister = hoisters[invariant_inames]
+        except KeyError:
+            hoister = hoisters[invariant_inames] = _InvariantLoadHoister(
+                    kernel, invariant_inames, read_only_vars, var_name_gen)
+
+        nhoisted_before = len(hoister.hoisted_expr_to_var_name)
+        new_expression = hoister(insn.expression)
+        if nhoisted_before == len(hoister.hoisted_expr_to_var_name) and (
+                new_expression == insn.expression):
+            new_insns.append(insn)
+            continue
+
+        new_insns.append(insn.copy(expression=new_expression))
+        within_inames_to_users.setdefault(invariant_inames, []).append(
+                len(new_insns) - 1)
+
+    for invariant_inames, hoister in hoisters.items():
+        if not hoister.hoisted_expr_to_var_name:
+            continue
+
+        user_indices = within_inames_to_users[invariant_inames]
+
+        # Only the writers of the loaded arrays matter, and they are outside
+        # of the jammed loop nest by construction.
+        load_depends_on = frozenset().union(*(
+            new_insns[i].depends_on for i in user_indices)) - jammed_insn_ids
+
+        load_ids = []
+        for expr, tmp_name in hoister.hoisted_expr_to_var_name.items():
+            new_temps[tmp_name] = TemporaryVariable(
+                    name=tmp_name,
+                    dtype=kernel.get_var_descriptor(expr.aggregate.name).dtype,
+                    shape=(),
+                    address_space=AddressSpace.PRIVATE)
+
+            load_id = insn_id_gen(f"{tmp_name}_load")
+            load_ids.append(load_id)
+            new_insns.append(Assignment(
+                    Variable(tmp_name), expr,
+                    id=load_id,
+                    within_inames=invariant_inames,
+                    depends_on=load_depends_on))
+
+        for i in user_indices:
+            used_vars = new_insns[i].read_dependency_names()
+            new_insns[i] = new_insns[i].copy(
+                    depends_on=new_insns[i].depends_on | frozenset(
+                        load_id
+                        for load_id, tmp_name in zip(
+                            load_ids, hoister.hoisted_expr_to_var_name.values())
+                        if tmp_name in used_vars))
+
+    return kernel.copy(instructions=new_insns, temporary_variables=new_temps)
+
+
+@for_each_kernel
+def unroll_and_jam(kernel: LoopKernel,
+                   outer_iname: InameStr,
+                   factor: int,
+                   *,
+                   hoist_invariant_loads: bool = True,
+                   ) -> LoopKernel:
+    """Unroll the loop over *outer_iname* by *factor* and jam the unrolled
+    copies of its body into the loops nested inside it, so that values
+    computed for (or loaded by) neighboring iterations of *outer_iname* can
+    be kept in registers.
+
+    *outer_iname* is split as in :func:`split_iname` into ``i_outer`` and
+    ``i_inner`` (for ``outer_iname="i"``). The latter is tagged ``ilp.unr``
+    and nested inside all other sequential loops of the instructions in
+    it, so that each of these instructions is duplicated *factor* times
+    within the innermost loop, and temporaries written in them (such as the
+    accumulators of reductions) are privatized. The last iteration of
+    ``i_outer``, which may be incomplete, is code-generated separately as a
+    slab (see the *slabs* argument of :func:`split_iname`), so that the bulk
+    iterations are free of bounds checks.
+
+    :arg hoist_invariant_loads: If *True*, array elements that are read by
+        the jammed instructions and whose indices do not depend on
+        ``i_inner`` are loaded once into a private temporary outside of the
+        unrolled copies. Loads inside reductions whose index depends on the
+        reduction's inames are not hoisted.
+
+    .. versionadded:: 2024.2
+    """
+    assert isinstance(kernel, LoopKernel)
+
+    if factor < 1:
+        raise LoopyError(f"unroll_and_jam: invalid factor {factor}")
+
+    if outer_iname not in kernel.all_inames():
+        raise LoopyError(f"unroll_and_jam: unknown iname '{outer_iname}'")
+
+    from loopy.kernel.data import ConcurrentTag
+    from loopy.transform.iname import split_iname
+
+    vng = kernel.get_var_name_generator()
+    tile_iname = vng(outer_iname + "_outer")
+    jam_iname = vng(outer_iname + "_inner")
+
+    kernel = split_iname(kernel, outer_iname, factor,
+            outer_iname=tile_iname, inner_iname=jam_iname,
+            inner_tag="ilp.unr", slabs=(0, 1))
+
+    # split_iname nests jam_iname immediately inside tile_iname in existing
+    # loop priorities, which is what this transform is meant to undo.
+    new_priorities = {
+            tuple(iname for iname in prio if iname != jam_iname)
+            for prio in kernel.loop_priority}
+
+    sequential_inames = set()
+    for insn in kernel.instructions:
+        if jam_iname in insn.within_inames:
+            sequential_inames.update(
+                    iname
+                    for iname in insn.within_inames | insn.reduction_inames()
+                    if not kernel.iname_tags_of_type(iname, ConcurrentTag))
+
+    sequential_inames.discard(jam_iname)
+
+    new_priorities.update(
+            (iname, jam_iname) for iname in sorted(sequential_inames))
+
+    kernel = kernel.copy(loop_priority=frozenset(
+        prio for prio in new_priorities if len(prio) > 1))
+
+    if hoist_invariant_loads:
+        kernel = _hoist_invariant_loads(kernel, jam_iname)
+
+    return kernel
+
+# }}}
+
+# vim: foldmethod=marker
@@ -465,8 +465,10 @@ class TranslationUnit:
 
     # FIXME: Delete these when _program_executor_cache leaves the building
     def __getstate__(self):
-        from dataclasses import asdict
-        return asdict(self)
+        # Not dataclasses.asdict, which would deep-copy the entire callables
+        # table only for pickle to traverse it again.
+        from dataclasses import fields
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
     def __setstate__(self, state_obj):
         for k, v in state_obj.items():
@@ -272,6 +272,40 @@ def test_c_caching():
     assert "Kernel cache_test retrieved from cache" in logs
 
 
+def test_c_executable_artifact_cache(monkeypatch):
+    from uuid import uuid4
+
+    from loopy.target.c import ExecutableCTarget
+    from loopy.target.c.c_execution import CCompiler, CExecutor
+
+    knl = lp.make_kernel("{[i]: 0 <= i < n}",
+        "out[i] = 2*a[i]",
+        [lp.GlobalArg("a,out", shape="n"), ...],
+        target=ExecutableCTarget(),
+        name=f"artifact_test_{uuid4().hex}")
+    a = np.arange(10, dtype=np.float64)
+
+    with lp.CacheMode(True):
+        _, (out,) = knl.executor()(a=a)
+        assert np.array_equal(out, 2*a)
+
+        # A warm executor must need neither the kernel IR nor a compiler.
+        def fail(self, *args, **kwargs):
+            raise AssertionError("kernel IR was materialized")
+
+        monkeypatch.setattr(
+                CExecutor, "get_typed_and_scheduled_translation_unit", fail)
+        monkeypatch.setattr(CCompiler, "build_shared_library", fail)
+        lp.clear_in_mem_caches()
+
+        _, (out,) = knl.executor()(a=a+1)
+        assert np.array_equal(out, 2*(a+1))
+
+        # ... unless the argument types differ.
+        with pytest.raises(AssertionError, match="kernel IR"):
+            knl.executor()(a=a.astype(np.float32))
+
+
 def test_c_execution_with_global_temporaries():
     # ensure that the "host" code of a bare ExecutableCTarget with
     # global constant temporaries is None
@@ -373,6 +407,210 @@ def test_scalar_global_args():
     assert out == (n*(n-1)/2)
 
 
+def test_auto_test_with_c_target():
+    ref_knl = lp.make_kernel(
+        "{[i,j]: 0<=i,j<n}",
+        "out[i] = sum(j, a[i, j]*x[j])",
+        [lp.GlobalArg("a,x,out", np.float64, shape=lp.auto), ...],
+        target=lp.ExecutableCTarget())
+
+    knl = lp.split_iname(ref_knl, "i", 4)
+
+    result = lp.auto_test_vs_ref(ref_knl, None, knl,
+            parameters={"n": 30}, op_count=[2*30**2], op_label=["flops"],
+            min_samples=5, min_timing_time=0)
+
+    import json
+    result = json.loads(json.dumps(result))
+
+    wall_timing = result["timing"]["wall"]
+    assert wall_timing["nsamples"] >= 5
+    assert wall_timing["median"] == result["elapsed_wall"]
+    assert (wall_timing["median_ci_low"]
+            <= wall_timing["median"]
+            <= wall_timing["median_ci_high"])
+    assert result["elapsed_event"] is None
+    assert set(result["rates"]) == {"flops"}
+
+    from loopy.diagnostic import AutomaticTestFailure
+    bad_knl = lp.make_kernel(
+        "{[i,j]: 0<=i,j<n}",
+        "out[i] = sum(j, a[j, i]*x[j])",
+        [lp.GlobalArg("a,x,out", np.float64, shape=lp.auto), ...],
+        target=lp.ExecutableCTarget())
+    with pytest.raises(AutomaticTestFailure):
+        lp.auto_test_vs_ref(ref_knl, None, bad_knl, parameters={"n": 30})
+
+
+def test_omp_simd_vec_loops():
+    ref_knl = lp.make_kernel(
+        "{[i]: 0<=i<n}",
+        """
+        <> t = 2*a[i]
+        out[i] = sin(t) + b[i]
+        """,
+        [lp.GlobalArg("a,b,out", np.float64, shape=("n",)), ...],
+        target=lp.ExecutableCTarget())
+
+    knl = ref_knl.copy(target=lp.ExecutableCTarget(omp_simd=True))
+    knl = lp.split_iname(knl, "i", 8, inner_tag="vec")
+
+    code = lp.generate_code_v2(knl).device_code()
+    assert "#pragma omp simd" in code
+    # privatized temporary is an ordinary array
+    assert "double t[8];" in code
+
+    # 37 is not a multiple of the vector length
+    lp.auto_test_vs_ref(ref_knl, None, knl, parameters={"n": 37})
+
+    # vec inames with non-constant bounds
+    knl = lp.tag_inames(
+            ref_knl.copy(target=lp.ExecutableCTarget(omp_simd=True)),
+            "i:vec")
+    lp.auto_test_vs_ref(ref_knl, None, knl, parameters={"n": 37})
+
+
+@pytest.mark.parametrize("red_op", ["sum", "max"])
+def test_openmp_reduction(red_op):
+    ref_knl = lp.make_kernel(
+        "{[i]: 0<=i<n}",
+        f"out = {red_op}(i, a[i])",
+        [lp.GlobalArg("a", np.float64, shape=("n",)), ...],
+        target=lp.ExecutableCTarget(),
+        assumptions="n<=1000")
+
+    knl = ref_knl.copy(target=lp.ExecutableCTarget(openmp=True))
+    knl = lp.split_iname(knl, "i", 16, outer_tag="g.0")
+
+    code = lp.generate_code_v2(knl).device_code()
+    assert "#pragma omp parallel for" in code
+
+    lp.auto_test_vs_ref(ref_knl, None, knl, parameters={"n": 937})
+
+
+def test_openmp_argmax():
+    n = 1000
+    knl = lp.make_kernel(
+        "{[i]: 0<=i<n}",
+        "out_max, out_argmax = argmax(i, fabs(a[i]), i)",
+        [lp.GlobalArg("a", np.float64, shape=(n,)), ...],
+        target=lp.ExecutableCTarget(openmp=True))
+    knl = lp.fix_parameters(knl, n=n)
+    knl = lp.split_iname(knl, "i", 64, outer_tag="g.0")
+
+    a = np.random.randn(n)
+    _, (out_argmax, out_max) = knl(a=a)
+    assert out_max == np.max(np.abs(a))
+    assert out_argmax == np.argmax(np.abs(a))
+
+
+@pytest.mark.parametrize("segmented", [False, True])
+def test_openmp_scan(segmented):
+    n = 100
+    if segmented:
+        insn = "out[i], <>_ = reduce(segmented(sum), j, a[j], segflag[j])"
+        args = [lp.GlobalArg("a", np.float64, shape=(n,)),
+                lp.GlobalArg("segflag", np.int32, shape=(n,)), ...]
+    else:
+        insn = "out[i] = sum(j, a[j])"
+        args = [lp.GlobalArg("a", np.float64, shape=(n,)), ...]
+
+    knl = lp.make_kernel(
+        "{[i,j]: 0<=i<n and 0<=j<=i}",
+        insn, args,
+        target=lp.ExecutableCTarget(openmp=True))
+    knl = lp.fix_parameters(knl, n=n)
+    knl = lp.tag_inames(knl, "i:g.0")
+    knl = lp.realize_reduction(knl, force_scan=True)
+
+    code = lp.generate_code_v2(knl).device_code()
+    assert "#pragma omp parallel for" in code
+
+    a = np.random.rand(n)
+    segflag = np.zeros(n, dtype=np.int32)
+    if segmented:
+        segflag[[0, 7, 20, 21, 63]] = 1
+        _, (out,) = knl(a=a, segflag=segflag)
+    else:
+        _, (out,) = knl(a=a)
+
+    ref = np.empty(n)
+    acc = 0
+    for i in range(n):
+        acc = a[i] if segflag[i] else acc + a[i]
+        ref[i] = acc
+
+    assert np.allclose(out, ref)
+
+
+def test_strength_reduce_indices():
+    ref_knl = lp.make_kernel(
+        "{[i,j,k]: 0<=i,j<n and 0<=k<m}",
+        "out[i, j] = sum(k, a[i, k]*b[k, j]) + c[j, i]",
+        [lp.GlobalArg("a,b,c,out", np.float64, shape=lp.auto), ...],
+        target=lp.ExecutableCTarget())
+    ref_knl = lp.prioritize_loops(ref_knl, "i,j,k")
+
+    knl = lp.set_options(ref_knl, strength_reduce_indices=True)
+
+    code = lp.generate_code_v2(knl).device_code()
+    assert "acc_k = acc_k + a[k_offset] * b[k_offset_0];" in code
+    assert "++k, k_offset += 1, k_offset_0 += n)" in code
+    # the outer part of the offset is computed in the outer loop
+    assert "int32_t k_offset = i_offset_0;" in code
+
+    lp.auto_test_vs_ref(ref_knl, None, knl, parameters={"n": 13, "m": 7})
+
+    # triangular domain, slabs, non-affine remainder
+    ref_knl = lp.make_kernel(
+        "{[i,j]: 0<=i<n and i<=j<n}",
+        "out[i, j] = 2*a[j, i] + a[i, (j+3) % n]",
+        [lp.GlobalArg("a,out", np.float64, shape=("n", "n")), ...],
+        target=lp.ExecutableCTarget())
+    ref_knl = lp.split_iname(ref_knl, "j", 4, slabs=(0, 1))
+
+    knl = lp.set_options(ref_knl, strength_reduce_indices=True)
+    lp.auto_test_vs_ref(ref_knl, None, knl, parameters={"n": 37})
+
+
+def test_aligned_args():
+    from loopy.tools import empty_aligned
+
+    knl = lp.make_kernel(
+        "{[i]: 0<=i<n}",
+        "out[i] = 2*a[i]",
+        [lp.GlobalArg("a,out", np.float64, shape=("n",), alignment=64), ...],
+        target=lp.ExecutableCTarget())
+
+    code = lp.generate_code_v2(knl).device_code()
+    assert "a = __builtin_assume_aligned(a, 64);" in code
+    assert "out = __builtin_assume_aligned(out, 64);" in code
+
+    a = empty_aligned(16, np.float64, n=64)
+    a[:] = np.arange(16)
+    _, (out,) = knl(a=a)
+    assert out.ctypes.data % 64 == 0
+    assert np.array_equal(out, 2*a)
+
+    with pytest.raises(ValueError, match="not aligned to 64 bytes"):
+        knl(a=empty_aligned(17, np.float64, n=64)[1:])
+
+
+def test_timing_result_median_ci():
+    from loopy.auto_test import TimingResult
+
+    timing = TimingResult(
+            samples=tuple(float(i) for i in range(10, 0, -1)),
+            warmup_samples=(20.0,),
+            rounds_per_sample=1)
+
+    assert timing.median == 5.5
+    assert timing.quartiles == (3.25, 7.75)
+    # order statistics 2 and 9 for n=10 at the 95% level
+    assert timing.median_ci == (2.0, 9.0)
+    assert timing.warmup_overhead == 14.5
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         exec(sys.argv[1])
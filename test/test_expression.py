@@ -473,6 +473,71 @@ def test_is_expression_equal():
     assert is_expression_equal((x+y)**2, x**2 + 2*x*y + y**2)
 
 
+def test_expression_interning():
+    from loopy.symbolic import (
+        InterningMode,
+        clear_interned_expressions,
+        intern_expr,
+        parse,
+    )
+
+    with InterningMode(True):
+        expr1 = parse("a[i] + sum(j, b[j]*a[i])")
+        expr2 = parse("2*a[i]")
+
+        a_i = expr2.children[1]
+        assert expr1.children[0] is a_i
+        assert expr1.children[1].expr.children[1] is a_i
+        assert intern_expr(parse("a[i]")) is a_i
+
+        with lp.CacheMode(False):
+            knl = lp.make_kernel(
+                    "{[i, j]: 0<=i, j<n}",
+                    """
+                    out1[i, j] = a[i] + b[j]
+                    out2[i, j] = 2*a[i]
+                    """)
+        knl = lp.split_iname(knl, "i", 4)
+
+    insn1, insn2 = knl.default_entrypoint.instructions
+    assert insn1.expression.children[0] is insn2.expression.children[1]
+
+    with InterningMode(False):
+        assert parse("a[i]") is not a_i
+
+    clear_interned_expressions()
+    assert intern_expr(parse("a[i]")) is not a_i
+
+
+def test_expression_interning_keeps_constant_types():
+    from pymbolic.primitives import Variable
+
+    from loopy.symbolic import InterningMode, intern_expr, parse
+
+    with InterningMode(True):
+        int_expr = parse("a[i]*2")
+        float_expr = parse("a[i]*2.0")
+        assert float_expr is not int_expr
+        assert type(float_expr.children[1]) is float
+
+        x = Variable("x")
+        int_sum = intern_expr(x + 2)
+        np_sum = intern_expr(x + np.float32(2))
+        assert np_sum is not int_sum
+        assert type(np_sum.children[1]) is np.float32
+
+        # the parents of nodes differing only in the types of their
+        # constants must not be merged either
+        assert intern_expr(3*(x + 2)) is not intern_expr(3*(x + np.float32(2)))
+
+        with lp.CacheMode(False):
+            lp.make_kernel("{[i]: 0<=i<n}", "out1[i] = a[i] / 2")
+            knl = lp.make_kernel("{[i]: 0<=i<n}", "out[i] = a[i] / 2.0")
+
+    insn, = knl.default_entrypoint.instructions
+    assert type(insn.expression.denominator) is float
+
+
 def test_integer_associativity():
     knl = lp.make_kernel(
             "{[i] : 0<=i<arraylen}",
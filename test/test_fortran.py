@@ -683,6 +683,60 @@ def test_division_in_shapes(ctx_factory):
     lp.auto_test_vs_ref(ref_t_unit, ctx, t_unit, parameters={"m": 128})
 
 
+def test_subroutine_translations_are_cached(monkeypatch):
+    import loopy.frontend.fortran as fortran_frontend
+
+    fortran_src = """
+        subroutine twice(n, a)
+          implicit none
+          real*8  a(n)
+          integer i,n
+
+          do i=1,n
+            a(i) = a(i) * 2
+          end do
+        end subroutine
+
+        subroutine twiceCross(n, a, i)
+          implicit none
+          integer i, n
+          real*8  a(n,n)
+
+          call twice(n, a(1:n, i))
+          call twice(n, a(i, %s:n))
+        end subroutine
+        """
+
+    with lp.CacheMode(False):
+        ref_t_unit = lp.parse_fortran(fortran_src % "1", nprocs=1)
+
+    with lp.CacheMode(True):
+        lp.parse_fortran(fortran_src % "1", nprocs=1)
+
+        translated = []
+        translate_subroutine = fortran_frontend._translate_subroutine
+
+        def counting_translate_subroutine(source, *args):
+            translated.append(source)
+            return translate_subroutine(source, *args)
+
+        monkeypatch.setattr(fortran_frontend, "_translate_subroutine",
+                            counting_translate_subroutine)
+
+        assert lp.parse_fortran(fortran_src % "1", nprocs=1) == ref_t_unit
+        assert not translated
+
+        # only the changed subroutine is translated again, the change is
+        # unique to not find it on disk from previous runs
+        from uuid import uuid4
+        lbound = 2 + uuid4().int % 10**9
+        t_unit = lp.parse_fortran(fortran_src % lbound, nprocs=1)
+        assert len(translated) == 1
+        assert "twiceCross" in translated[0]
+        assert t_unit["twice"] == ref_t_unit["twice"]
+        assert t_unit["twiceCross"] != ref_t_unit["twiceCross"]
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         exec(sys.argv[1])
@@ -1093,6 +1093,60 @@ def test_kernel_splitting_with_loop(ctx_factory):
     lp.auto_test_vs_ref(ref_knl, ctx, knl, parameters={"n": 5})
 
 
+def test_parallel_codegen(ctx_factory):
+    ctx = ctx_factory()
+    cq = cl.CommandQueue(ctx)
+
+    twice = lp.make_function(
+            "{[j]: 0<=j<3}",
+            "y[j] = 2*x[j]",
+            name="twice")
+
+    knl = lp.make_kernel(
+            "{ [i,k,j]: 0<=i<n and 0<=k<3 and 0<=j<3 }",
+            """
+            for i
+                for k
+                    ... gbarrier
+                    c[k,i] = a[k, i + 1]
+                    ... gbarrier
+                    d[k,i] = sin(c[k,i])
+                end
+                ... gbarrier
+                [j]: out[j,i] = twice([j]: d[j,i])
+            end
+            """, seq_dependencies=True)
+
+    knl = lp.add_and_infer_dtypes(knl,
+            {"a": np.float32, "c,d,out": np.float32, "n": np.int32})
+    knl = lp.split_iname(knl, "i", 128, outer_tag="g.0", inner_tag="l.0")
+    knl = lp.merge([knl, twice])
+
+    from loopy.tools import LoopyKeyBuilder
+
+    serial_knl = lp.set_options(knl, codegen_nprocs=0)
+    parallel_knl = lp.set_options(knl, codegen_nprocs=2)
+
+    # codegen_nprocs does not change the generated code, and thus neither
+    # the kernel's identity.
+    assert serial_knl == parallel_knl
+    assert (LoopyKeyBuilder()(serial_knl)
+            == LoopyKeyBuilder()(parallel_knl))
+
+    with lp.CacheMode(False):
+        serial_cgr = lp.generate_code_v2(serial_knl)
+        parallel_cgr = lp.generate_code_v2(parallel_knl)
+
+    assert len(parallel_cgr.device_programs) == 4
+    assert parallel_cgr.all_code() == serial_cgr.all_code()
+
+    a = np.random.rand(3, 6).astype(np.float32)
+    c = np.empty((3, 5), dtype=np.float32)
+    d = np.empty((3, 5), dtype=np.float32)
+    _, (_, _, out) = parallel_knl.executor(ctx)(cq, a=a, c=c, d=d)
+    assert np.allclose(out, 2*np.sin(a[:, 1:]))
+
+
 def save_and_reload_temporaries_test(queue, prog, out_expect, debug=False):
 
     from loopy.transform.save import save_and_reload_temporaries
@@ -3088,6 +3142,117 @@ def test_cached_written_variables_doesnt_carry_over_invalidly():
     assert "b" not in knl2["loopy_kernel"].get_written_variables()
 
 
+def test_make_kernel_is_cached_on_disk(monkeypatch):
+    from loopy.kernel import creation
+
+    def make_knl(insns, **kwargs):
+        return lp.make_kernel(
+                "{[i]: 0<=i<n}", insns,
+                [lp.GlobalArg("a", np.float32, shape=("n",)), ...],
+                name="cached_knl", **kwargs)
+
+    with lp.CacheMode(True):
+        knl = make_knl("out[i] = 2*a[i]")
+
+        def make_function_uncached(*args, **kwargs):
+            raise AssertionError("kernel creation was not cached")
+
+        with monkeypatch.context() as mp:
+            mp.setattr(creation, "_make_function_uncached",
+                       make_function_uncached)
+
+            from loopy.tools import clear_in_mem_caches
+            clear_in_mem_caches()
+
+            # differs only in whitespace
+            assert make_knl("""
+                out[i] = 2*a[i]
+                """) == knl
+
+        # lambdas cannot be keyed persistently, creation is not cached
+        make_knl("out[i] = 2*a[i]",
+                 symbol_manglers=[lambda kernel, name: None])
+
+        with monkeypatch.context() as mp:
+            mp.setattr(creation, "_make_function_uncached",
+                       make_function_uncached)
+            with pytest.raises(AssertionError):
+                make_knl("out[i] = 2*a[i]",
+                         symbol_manglers=[lambda kernel, name: None])
+
+
+def test_set_operation_cache(monkeypatch):
+    import islpy as isl
+
+    from loopy.kernel import tools as kernel_tools
+
+    cache = kernel_tools.SetOperationCache()
+    monkeypatch.setattr(kernel_tools, "set_operation_cache", cache)
+
+    def make_knl(name):
+        knl = lp.make_kernel(
+                "{[i, j]: 0<=i<n and 0<=j<=i}",
+                "out[i, j] = 2*a[i, j]",
+                [lp.GlobalArg("a,out", np.float32, shape=lp.auto), ...],
+                name=name)
+        return lp.split_iname(knl, "i", 4, outer_tag="g.0", inner_tag="l.0")
+
+    with lp.CacheMode(False):
+        lp.generate_code_v2(make_knl("first"))
+        assert cache.misses
+
+        # shared across kernels
+        cache.reset_stats()
+        lp.generate_code_v2(make_knl("second"))
+        assert cache.hits
+        assert not cache.misses
+        assert cache.hit_rate == 1
+
+    # least recently used results are evicted first
+    sets = [isl.Set(f"[n] -> {{ [i]: {lbound} <= i < n }}")
+            for lbound in range(3)]
+    small_cache = kernel_tools.SetOperationCache(maxsize=2)
+    for set_ in [*sets, sets[2], sets[0]]:
+        small_cache.op(set_, kernel_tools._get_dim_min, (0,))
+    assert (small_cache.hits, small_cache.misses) == (1, 4)
+
+    with lp.CacheMode(True):
+        for _ in range(2):
+            disk_cache = kernel_tools.SetOperationCache(persistent=True)
+            result = disk_cache.op(
+                    sets[1], kernel_tools._get_dim_max, (0,))
+            assert result.plain_is_equal(sets[1].dim_max(0))
+        assert disk_cache.persistent_hits == 1
+
+
+def test_kernel_template():
+    def make(make_func, **kwargs):
+        return make_func(
+                "{[i,j]: 0<=i<n and 0<=j<m}",
+                """
+                out[i, j] = c*a[i, j] + j
+                """,
+                [lp.GlobalArg("a,out", np.float64, shape=("n", "m")), ...],
+                name="templated", **kwargs)
+
+    template = make(lp.make_kernel_template, placeholders="m, c")
+
+    for m in [3, 5]:
+        knl = template.instantiate(m=m, c=2)
+        assert knl == lp.fix_parameters(make(lp.make_kernel), m=m, c=2)
+        assert set(knl.default_entrypoint.arg_dict) == {"a", "out", "n"}
+
+    # partial instantiation
+    knl = template.instantiate(m=3)
+    assert "c" in knl.default_entrypoint.arg_dict
+
+    with pytest.raises(lp.LoopyError):
+        template.instantiate(n=3)
+
+    with pytest.raises(lp.LoopyError):
+        make(lp.make_kernel_template, placeholders="k")
+
+
 def test_kernel_tagging():
     from pytools.tag import Tag
 
@@ -3506,6 +3671,27 @@ def test_global_temps_with_multiple_base_storages(ctx_factory):
     assert out == sum(i**2 for i in range(n)) + sum(i**3 for i in range(n))
 
 
+def test_t_unit_to_python_with_prefetch():
+    t_unit = lp.make_kernel(
+        "{[i,j]: 0<=i<n and 0<=j<m}",
+        """
+        ... prefetch a[i, j + 8] {id=pf}
+        out[i, j] = 2*a[i, j] {dep=pf}
+        """,
+        [lp.GlobalArg("a,out", np.float64, shape=("n", "m")), ...])
+
+    pf_insn = t_unit.default_entrypoint.id_to_insn["pf"]
+    assert isinstance(pf_insn, lp.PrefetchInstruction)
+
+    # contains check to assert roundtrip equivalence
+    assert "... prefetch a[i, j + 8]" in lp.t_unit_to_python(t_unit)
+
+    with pytest.raises(lp.LoopyError):
+        lp.make_kernel("{[i]: 0<=i<n}", "... prefetch")
+    with pytest.raises(lp.LoopyError):
+        lp.make_kernel("{[i]: 0<=i<n}", "... nop a[i]")
+
+
 def test_t_unit_to_python_with_substs():
     t_unit = lp.make_kernel(
         "{[i]: 0<=i<10}",
@@ -3719,6 +3905,84 @@ def test_loop_imperfect_nest_priorities_in_v2_scheduler():
     lp.generate_code_v2(knl)
 
 
+def test_compact_kernel_representation():
+    import pickle
+
+    t_unit = lp.make_kernel(
+            "{[e,i]: 0<=e<n and 0<=i<4}",
+            [f"out[e, {k}] = a[e, {k}] + sum(i, b[e, i])" for k in range(3)],
+            [lp.GlobalArg("a,out", np.float64, shape=("n", 3)),
+             lp.GlobalArg("b", np.float64, shape=("n", 4)), ...])
+    t_unit = lp.linearize(lp.preprocess_kernel(t_unit))
+    knl = t_unit.default_entrypoint
+
+    assert knl.linearization
+    for sched_item in knl.linearization:
+        assert not hasattr(sched_item, "__dict__")
+
+    insns = [insn for insn in knl.instructions
+            if insn.assignee_var_names() == ("out",)]
+    assert len(insns) == 3
+    assert len({id(insn.within_inames) for insn in insns}) == 1
+    assert len({id(insn.tags) for insn in insns}) == 1
+
+    unpickled = pickle.loads(pickle.dumps(t_unit))
+    assert unpickled == t_unit
+    assert (unpickled.default_entrypoint.instructions[0].within_inames
+            is knl.instructions[0].within_inames)
+
+
+def test_instruction_index():
+    from loopy.kernel.instruction_index import InstructionIndex
+
+    knl = lp.make_kernel(
+            "{[i,j]: 0<=i,j<n}",
+            """
+            a[i] = 1 {id=a}
+            b[i] = a[i] {id=b, dep=a}
+            c[i] = b[i] {id=c, dep=b}
+            d[j] = 2 {id=d}
+            e[i] = c[i] + d[i] {id=e, dep=c:d}
+            """, [lp.GlobalArg("a,b,c,d,e", np.float64, shape="n"), ...])
+    knl = knl.default_entrypoint
+
+    index = knl.get_instruction_index()
+    assert knl.recursive_insn_dep_map() == {
+            "a": set(), "b": {"a"}, "c": {"a", "b"}, "d": set(),
+            "e": {"a", "b", "c", "d"}}
+    assert index.depends_on_recursively("e", "a")
+    assert not index.depends_on_recursively("a", "e")
+    assert index.find_recursive_dependencies(["c"]) == {"a", "b", "c"}
+    assert knl.writer_map()["b"] == {"b"}
+    assert knl.reader_map()["d"] == {"e"}
+    assert knl.iname_to_insns() == {"i": {"a", "b", "c", "e"}, "j": {"d"}}
+
+    def assert_index_equal(derived, fresh):
+        for insn in knl.instructions:
+            assert (derived.ids_from_bits(
+                        derived.get_recursive_dependency_bits(insn.id))
+                    == fresh.ids_from_bits(
+                        fresh.get_recursive_dependency_bits(insn.id)))
+        assert derived.get_readers() == fresh.get_readers()
+        assert derived.get_writers() == fresh.get_writers()
+        assert derived.get_insns_within() == fresh.get_insns_within()
+
+    # changes to instructions are applied to the index of the original kernel
+    knl = knl.copy(instructions=[
+        insn.copy(within_inames=frozenset({"j"})) if insn.id == "c" else insn
+        for insn in knl.instructions])
+    derived = knl.get_instruction_index()
+    assert derived is not index
+    assert derived._recursive_dep_bits is index._recursive_dep_bits
+    assert knl.iname_to_insns() == {"i": {"a", "b", "e"}, "j": {"c", "d"}}
+    assert_index_equal(derived, InstructionIndex(knl.instructions))
+
+    knl = lp.remove_instructions(knl, {"b"})
+    assert knl.recursive_insn_dep_map()["e"] == {"a", "c", "d"}
+    assert_index_equal(
+            knl.get_instruction_index(), InstructionIndex(knl.instructions))
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         exec(sys.argv[1])
@@ -22,11 +22,14 @@ THE SOFTWARE.
 
 import logging
 import sys
+from dataclasses import dataclass
 from pickle import dumps, loads
+from typing import ClassVar
 
 import pytest
 
 import loopy as lp
+from loopy.tools import LazilyUnpicklingFieldsMixin
 
 
 logger = logging.getLogger(__name__)
@@ -249,6 +252,71 @@ def test_lazily_unpickling_list_eq_and_persistent_hashing():
     # }}}
 
 
+class PickleDetectorForLazilyUnpicklingFields(PickleDetector):
+    instance_unpickled = False
+
+    def __init__(self):
+        self.state = None
+
+
+@dataclass(frozen=True)
+class RecordWithLazilyUnpicklingFields(LazilyUnpicklingFieldsMixin):
+    eager: int
+    lazy: PickleDetectorForLazilyUnpicklingFields
+
+    _lazily_unpickled_fields: ClassVar[frozenset[str]] = frozenset({"lazy"})
+
+    def __getstate__(self):
+        return self._get_fields_state()
+
+    def __setstate__(self, state):
+        self._set_fields_state(state)
+
+
+def test_lazily_unpickling_fields():
+    cls = PickleDetectorForLazilyUnpicklingFields
+    Record = RecordWithLazilyUnpicklingFields  # noqa: N806
+
+    pickled_record = dumps(Record(1, cls()))
+
+    record = loads(pickled_record)
+    assert record.eager == 1
+    assert not cls.instance_unpickled
+
+    # pickling again does not need the lazy field
+    record = loads(dumps(record))
+    assert not cls.instance_unpickled
+
+    assert isinstance(record.lazy, cls)
+    assert cls.instance_unpickled
+    assert record.lazy is record.lazy
+
+    with pytest.raises(AttributeError):
+        record.nonexistent  # noqa: B018
+
+    with pytest.raises(lp.LoopyError):
+        record.__setstate__((0, {}, {}))
+
+
+def test_kernel_fields_unpickled_lazily():
+    knl = lp.make_kernel(
+            "{[i]: 0<=i<10}",
+            """
+            <> tmp = 2*a[i]
+            out[i] = tmp
+            """).default_entrypoint
+
+    reconst_knl = loads(dumps(knl))
+    assert "domains" not in reconst_knl.__dict__
+    assert "temporary_variables" not in reconst_knl.__dict__
+
+    assert reconst_knl.get_written_variables() == {"tmp", "out"}
+    assert "domains" not in reconst_knl.__dict__
+
+    assert reconst_knl == knl
+    assert reconst_knl.domains == knl.domains
+
+
 def test_Optional():  # noqa
     from loopy import Optional
 
@@ -280,6 +280,78 @@ def test_alias_temporaries(ctx_factory):
             parameters={"n": 30})
 
 
+def test_auto_alias_temporaries(ctx_factory):
+    ctx = ctx_factory()
+
+    knl = lp.make_kernel(
+        "{[i,j]: 0<=i<n and 0<=j<16}",
+        """
+        for i, j
+            <> ta[j] = 2*a[16*i + j]  {id=wa}
+            <> tb[j] = ta[(j+1) % 16] + 1  {id=wb, dep=wa}
+            <> tc[j] = 3*tb[(j+3) % 16]  {id=wc, dep=wb}
+            <> p[j] = tc[15 - j]  {id=wp, dep=wc}
+            out[16*i + j] = p[j]  {dep=wp}
+        end
+        """, seq_dependencies=False)
+
+    knl = lp.add_and_infer_dtypes(knl, {"a": np.float64})
+    knl = lp.tag_inames(knl, "i:g.0,j:l.0")
+    knl = lp.set_temporary_address_space(knl, "ta,tb,tc", "local")
+    knl = lp.set_temporary_address_space(knl, "p", "private")
+
+    ref_knl = knl
+
+    knl = lp.auto_alias_temporaries(knl)
+
+    tvs = knl.default_entrypoint.temporary_variables
+    # tb is live while either of ta and tc are
+    assert tvs["ta"].base_storage is not None
+    assert tvs["ta"].base_storage == tvs["tc"].base_storage
+    assert tvs["tb"].base_storage is None
+    assert tvs["p"].base_storage is None
+
+    lp.auto_test_vs_ref(ref_knl, ctx, knl, parameters={"n": 20})
+
+    knl = lp.auto_alias_temporaries(ref_knl,
+            only_address_space=lp.AddressSpace.PRIVATE)
+    assert all(tv.base_storage is None
+               for tv in knl.default_entrypoint.temporary_variables.values())
+
+    knl = lp.make_kernel(
+        "{[i,j0,j1,j2,j3]: 0<=i<n and 0<=j0,j1,j2,j3<16}",
+        """
+        for i
+            for j0
+                <> ta[j0] = 2*a[16*i + j0]  {id=wa}
+            end
+            for j1
+                <> tb[j1] = ta[15 - j1] + 1  {id=wb, dep=wa}
+            end
+            for j2
+                <> tc[j2] = 3*tb[(j2+3) % 16]  {id=wc, dep=wb}
+            end
+            for j3
+                <> td[j3] = tc[15 - j3] - tc[j3]  {id=wd, dep=wc}
+                out[16*i + j3] = td[j3]  {dep=wd}
+            end
+        end
+        """, seq_dependencies=False)
+
+    knl = lp.add_and_infer_dtypes(knl, {"a": np.float64})
+    knl = lp.tag_inames(knl, "i:g.0")
+
+    ref_knl = knl
+
+    knl = lp.auto_alias_temporaries(knl)
+    tvs = knl.default_entrypoint.temporary_variables
+    assert tvs["ta"].base_storage == tvs["tc"].base_storage
+    assert tvs["tb"].base_storage == tvs["td"].base_storage
+    assert tvs["ta"].base_storage != tvs["tb"].base_storage
+
+    lp.auto_test_vs_ref(ref_knl, ctx, knl, parameters={"n": 20})
+
+
 def test_vectorize(ctx_factory):
     ctx = ctx_factory()
 
@@ -546,6 +618,76 @@ def test_precompute_with_preexisting_inames_fail():
                 precompute_inames="ii,jj")
 
 
+def test_precompute_rolling_storage(ctx_factory):
+    ctx = ctx_factory()
+
+    knl = lp.make_kernel(
+        "{[k,i]: 1<=k<n-1 and 0<=i<16}",
+        """
+        f(kk, ii) := sin(a[kk, ii])
+        out[k, i] = f(k-1, (i+1) % 16) + 2*f(k, i) + f(k+1, (i+15) % 16)
+        """, [lp.GlobalArg("a,out", np.float64, shape=("n", 16)), ...])
+    knl = lp.tag_inames(knl, "i:l.0")
+    ref_knl = knl
+
+    knl = lp.precompute(knl, "f", "k,i", default_tag="l.auto",
+            temporary_address_space=lp.AddressSpace.LOCAL,
+            storage_mode="rolling", rolling_iname="k")
+
+    assert knl.default_entrypoint.temporary_variables["f_0"].shape == (3, 16)
+
+    lp.auto_test_vs_ref(ref_knl, ctx, knl, parameters={"n": 30})
+
+    with pytest.raises(lp.LoopyError):
+        lp.precompute(ref_knl, "f", "k,i", storage_mode="rolling",
+                      rolling_iname="i")
+
+
+def test_precompute_rolling_storage_nonrectangular(ctx_factory):
+    ctx = ctx_factory()
+
+    knl = lp.make_kernel(
+        "{[t,k]: 0<=t<4 and t+1<=k<n-1}",
+        """
+        f(tt, kk) := a[tt, kk]*2
+        out[t, k] = f(t, k-1) + f(t, k) + f(t, k+1)
+        """, [lp.GlobalArg("a,out", np.float64, shape=(4, "n")), ...])
+    ref_knl = knl
+
+    knl = lp.prioritize_loops(knl, "t,k")
+    knl = lp.precompute(knl, "f", "k", storage_mode="rolling",
+            rolling_iname="k")
+
+    lp.auto_test_vs_ref(ref_knl, ctx, knl, parameters={"n": 20})
+
+    # without a loop nesting, the bounds of k are not known per iteration of t
+    with pytest.raises(lp.LoopyError):
+        lp.precompute(ref_knl, "f", "k", storage_mode="rolling",
+                      rolling_iname="k")
+
+
+def test_buffer_array_rolling_storage(ctx_factory):
+    ctx = ctx_factory()
+
+    knl = lp.make_kernel(
+        "{[k,i]: 0<=k<n and 0<=i<m}",
+        """
+        out[k, i] = out[k, i] + a[k, i]  {id=w0}
+        out[k+1, i] = out[k+1, i] + 2*a[k, i]  {id=w1, dep=w0}
+        out[k+2, i] = out[k+2, i] + a[k, i]  {id=w2, dep=w1}
+        """, [lp.GlobalArg("a,out", np.float64, shape=lp.auto), ...])
+    knl = lp.tag_inames(knl, "i:g.0")
+    ref_knl = knl
+
+    knl = lp.buffer_array(knl, "out", "k",
+            temporary_scope=lp.AddressSpace.PRIVATE,
+            storage_mode="rolling", rolling_iname="k")
+
+    assert knl.default_entrypoint.temporary_variables["out_buf"].shape == (3,)
+
+    lp.auto_test_vs_ref(ref_knl, ctx, knl, parameters={"n": 30, "m": 17})
+
+
 def test_add_nosync():
     orig_prog = lp.make_kernel("{[i]: 0<=i<10}",
         """
@@ -1753,6 +1895,341 @@ def test_duplicate_iname_not_read_only_nested(ctx_factory):
     lp.auto_test_vs_ref(ref_t_unit, ctx, t_unit)
 
 
+def test_tile_inames():
+    knl = lp.make_kernel(
+            "{[i,j,k]: 0<=i,j,k<n}",
+            "c[i, j] = c[i, j] + a[i, k]*b[k, j]",
+            [lp.GlobalArg("a,b,c", np.float64, shape=("n", "n")), ...],
+            target=lp.ExecutableCTarget(),
+            assumptions="n >= 1")
+    ref_knl = knl
+
+    from loopy.transform.tiling import get_tile_working_set_bytes
+    cache_bytes = 8*1024
+    params = {"n": 64}
+
+    tiled_knl = lp.tile_inames(knl, "i,k,j",
+            cache_bytes=cache_bytes, parameters=params)
+
+    priority, = tiled_knl.default_entrypoint.loop_priority
+    assert priority == (
+            "i_outer", "k_outer", "j_outer", "i_inner", "k_inner", "j_inner")
+
+    tile_sizes = {
+            iname: tiled_knl.default_entrypoint.get_constant_iname_length(
+                f"{iname}_inner")
+            for iname in "ikj"}
+    assert (get_tile_working_set_bytes(
+                knl.default_entrypoint, tile_sizes, params)
+            <= cache_bytes)
+    # doubling any of the tile lengths would overflow the cache
+    for iname in "ikj":
+        assert (get_tile_working_set_bytes(
+                    knl.default_entrypoint,
+                    {**tile_sizes, iname: 2*tile_sizes[iname]}, params)
+                > cache_bytes)
+
+    lp.auto_test_vs_ref(ref_knl, None, tiled_knl, parameters={"n": 70})
+
+    tiled_knl = lp.tile_inames(knl, ["i", "j"], (4, 8))
+    assert tiled_knl.default_entrypoint.get_constant_iname_length(
+            "j_inner") == 8
+    lp.auto_test_vs_ref(ref_knl, None, tiled_knl, parameters={"n": 13})
+
+    reduction_knl = lp.make_kernel(
+            "{[i,j,k]: 0<=i,j,k<n}",
+            "c[i, j] = sum(k, a[i, k]*b[k, j])",
+            [lp.GlobalArg("a,b,c", np.float64, shape=("n", "n")), ...],
+            target=lp.ExecutableCTarget())
+    with pytest.raises(lp.LoopyError):
+        lp.tile_inames(reduction_knl, "i,j,k", (4, 4, 4))
+
+    tiled_knl = lp.tile_inames(reduction_knl, "i,j",
+            cache_bytes=cache_bytes, parameters=params)
+    lp.auto_test_vs_ref(reduction_knl, None, tiled_knl, parameters={"n": 20})
+
+
+def test_unroll_and_jam():
+    knl = lp.make_kernel(
+            "{[i,j,k]: 0<=i,j<n and 0<=k<m}",
+            """
+            for i, j
+                acc = 0 {id=init}
+                for k
+                    acc = acc + a[i, k]*b[k, j] {id=update, dep=init}
+                end
+                c[i, j] = acc {dep=update}
+            end
+            """,
+            [
+                lp.GlobalArg("a", np.float64, shape=("n", "m")),
+                lp.GlobalArg("b", np.float64, shape=("m", "n")),
+                lp.GlobalArg("c", np.float64, shape=("n", "n")),
+                lp.TemporaryVariable("acc", np.float64),
+                ...],
+            target=lp.ExecutableCTarget(),
+            assumptions="n >= 1 and m >= 1")
+    knl = lp.prioritize_loops(knl, "i,j")
+    ref_knl = knl
+
+    jammed_knl = lp.unroll_and_jam(knl, "i", 4)
+    jammed_kernel = jammed_knl.default_entrypoint
+
+    # the load of b is shared among the unrolled copies
+    load, = [insn for insn in jammed_kernel.instructions
+             if insn.id.startswith("b_hoisted")]
+    assert load.within_inames == frozenset({"i_outer", "j", "k"})
+    assert load.id in jammed_kernel.id_to_insn["update"].depends_on
+
+    code = lp.generate_code_v2(jammed_knl).device_code()
+    assert "acc[3]" in code
+    assert code.count("b_hoisted = ") == 2  # bulk and tail slab
+
+    lp.auto_test_vs_ref(ref_knl, None, jammed_knl, parameters={"n": 15, "m": 7})
+
+    reduction_knl = lp.make_kernel(
+            "{[i,j,k]: 0<=i,j,k<n}",
+            "c[i, j] = sum(k, a[i, k]*b[k, j])",
+            [lp.GlobalArg("a,b,c", np.float64, shape=("n", "n")), ...],
+            target=lp.ExecutableCTarget())
+    jammed_knl = lp.unroll_and_jam(reduction_knl, "i", 3)
+    assert "acc_k[2]" in lp.generate_code_v2(jammed_knl).device_code()
+    lp.auto_test_vs_ref(reduction_knl, None, jammed_knl, parameters={"n": 10})
+
+
+@pytest.mark.parametrize("insn", [
+    "out[i, j] = if(j < m-1, b[i, j]*a[j+1], 0)",
+    """
+    if j < m-1
+        out[i, j] = b[i, j]*a[j+1]
+    end
+    """,
+    ])
+def test_unroll_and_jam_conditional_loads(insn):
+    knl = lp.make_kernel(
+            "{[i,j]: 0<=i<n and 0<=j<m}",
+            insn,
+            [lp.GlobalArg("a", np.float64, shape=("m",)),
+             lp.GlobalArg("b,out", np.float64, shape=("n", "m")), ...],
+            target=lp.ExecutableCTarget())
+    knl = lp.prioritize_loops(knl, "i,j")
+    ref_knl = knl
+
+    # a[j+1] is out of bounds when j == m-1 and must not be loaded
+    # unconditionally
+    jammed_knl = lp.unroll_and_jam(knl, "i", 4)
+    assert not any(insn.id.startswith("a_hoisted")
+                   for insn in jammed_knl.default_entrypoint.instructions)
+
+    out = np.zeros((10, 7))
+    lp.auto_test_vs_ref(ref_knl, None, jammed_knl,
+                        parameters={"n": 10, "m": 7, "out": out})
+
+
+def test_add_software_prefetch():
+    from loopy.symbolic import parse
+
+    knl = lp.make_kernel(
+            "{[i,j]: 0<=i<n and 0<=j<m}",
+            "out[i] = sum(j, a[i, j]) + b[i]",
+            [lp.GlobalArg("a", np.float64, shape=("n", "m")),
+             lp.GlobalArg("b,out", np.float64, shape=("n",)), ...],
+            target=lp.ExecutableCTarget())
+
+    pf_knl = lp.add_software_prefetch(knl, "b", "i", 8)
+    pf_kernel = pf_knl.default_entrypoint
+
+    pf_insn, = [insn for insn in pf_kernel.instructions
+                if isinstance(insn, lp.PrefetchInstruction)]
+    assert pf_insn.address == parse("b[i + 8]")
+    assert pf_insn.within_inames == frozenset({"i"})
+    assert "b" not in pf_insn.read_dependency_names()
+
+    # transformations apply to the prefetch address
+    split_knl = lp.split_iname(pf_knl, "i", 4)
+    assert "__builtin_prefetch(&(b[8 + 4 * i_outer + i_inner]));" in (
+            lp.generate_code_v2(split_knl).device_code())
+
+    lp.auto_test_vs_ref(knl, None, pf_knl, parameters={"n": 50, "m": 3})
+
+    assert "prefetch(&(b[8 + i]), 1);" in lp.generate_code_v2(
+            pf_knl.copy(target=lp.OpenCLTarget())).device_code()
+    assert "prefetch(" not in lp.generate_code_v2(
+            pf_knl.copy(target=lp.CudaTarget())).device_code()
+
+    # reads inside the reduction are not prefetched in 'i'
+    with pytest.raises(lp.LoopyError):
+        lp.add_software_prefetch(knl, "a", "i", 8)
+
+    knl = lp.make_kernel(
+            "{[i,j]: 0<=i<n and 0<=j<m}",
+            "out[i, j] = 2*a[i, j]",
+            [lp.GlobalArg("a,out", np.float64, shape=("n", "m")), ...],
+            target=lp.ExecutableCTarget())
+    knl = lp.prioritize_loops(knl, "i,j")
+
+    pf_knl = lp.add_software_prefetch(knl, "a", "j", 8)
+    pf_insn, = [insn for insn in pf_knl.default_entrypoint.instructions
+                if isinstance(insn, lp.PrefetchInstruction)]
+    assert pf_insn.address == parse("a[i, j + 8]")
+    lp.auto_test_vs_ref(knl, None, pf_knl, parameters={"n": 5, "m": 30})
+
+
+def test_auto_prioritize_loops():
+    knl = lp.make_kernel(
+            "{[i,j,k]: 0<=i,j<n and 0<=k<m}",
+            "out[i, j] = sum(k, a[k, i]*b[j, k]) + sin(c[j, i])",
+            [lp.GlobalArg("a,b,c,out", np.float64, shape=lp.auto), ...],
+            target=lp.ExecutableCTarget())
+
+    prio_knl = lp.auto_prioritize_loops(knl)
+    # 'i' is the unit-stride iname of 'a' and 'c', reduction iname 'k' is
+    # not prioritized
+    assert prio_knl.default_entrypoint.loop_priority == frozenset({("j", "i")})
+
+    code = lp.generate_code_v2(prio_knl).device_code()
+    assert code.index("for (int32_t j") < code.index("for (int32_t i")
+
+    lp.auto_test_vs_ref(knl, None, prio_knl, parameters={"n": 11, "m": 5})
+
+    # existing priorities are kept
+    knl = lp.prioritize_loops(knl, "i,j")
+    assert lp.auto_prioritize_loops(knl).default_entrypoint.loop_priority == (
+            frozenset({("i", "j")}))
+
+
+def test_auto_tag_array_axes():
+    knl = lp.make_kernel(
+            "{[i,f]: 0<=i<n and 0<=f<3}",
+            "out[f, i] = 2*a[i, f] + b[f, i]",
+            [lp.GlobalArg("a,b,out", np.float64, shape=lp.auto), ...],
+            target=lp.ExecutableCTarget())
+    knl = lp.prioritize_loops(knl, "f,i")
+    knl = lp.fix_parameters(knl, n=1000)
+
+    new_knl, pack_kernels = lp.auto_tag_array_axes(knl, return_pack_kernels=True)
+
+    # 'a' becomes a structure of arrays, the others are unit-stride already
+    new_arg_dict = new_knl.default_entrypoint.arg_dict
+    assert [dim_tag.stride for dim_tag in new_arg_dict["a"].dim_tags] == [1, 1000]
+    assert new_arg_dict["b"] == knl.default_entrypoint.arg_dict["b"]
+    assert set(pack_kernels) == {"a"}
+
+    rng = np.random.default_rng(seed=12)
+    a = rng.random((1000, 3))
+    b = rng.random((3, 1000))
+    _, (ref_out,) = knl(a=a, b=b)
+
+    pack_knl, unpack_knl = pack_kernels["a"]
+    _, (packed_a,) = pack_knl(input=a)
+    assert packed_a.strides == (8, 8000)
+    _, (out,) = new_knl(a=packed_a, b=b)
+    assert np.allclose(out, ref_out)
+
+    _, (unpacked_a,) = unpack_knl(input=packed_a)
+    assert unpacked_a.strides == a.strides
+    assert np.array_equal(unpacked_a, a)
+
+    # the same, using local strides
+    knl = lp.tag_inames(knl.copy(target=lp.PyOpenCLTarget()), "i:l.0")
+    new_knl = lp.auto_tag_array_axes(knl, "a, b")
+    new_arg_dict = new_knl.default_entrypoint.arg_dict
+    assert [dim_tag.stride for dim_tag in new_arg_dict["a"].dim_tags] == [1, 1000]
+
+
+def test_fuse_loops(ctx_factory):
+    ctx = ctx_factory()
+
+    knl = lp.make_kernel(
+            ["{[i]: 0<=i<n}", "{[j]: 0<=j<n}", "{[k]: 0<=k<n}"],
+            """
+            tmp[i] = 2*a[i]  {id=write_tmp}
+            out[j] = tmp[j] + 1  {id=read_tmp, dep=write_tmp}
+            out2[k] = tmp[(k + 1) % n]  {id=read_tmp_shifted, dep=write_tmp}
+            """,
+            [lp.GlobalArg("a,out,out2", np.float64, shape=("n",)),
+             lp.TemporaryVariable("tmp", np.float64, shape=("n",)),
+             ...])
+    knl = lp.fix_parameters(knl, n=20)
+
+    fused_knl = lp.fuse_loops(knl)
+    fused_knl_default = fused_knl.default_entrypoint
+
+    # 'k' reads elements of 'tmp' written in later iterations
+    assert fused_knl_default.all_inames() == {"i", "k"}
+    assert fused_knl_default.id_to_insn["read_tmp"].within_inames == {"i"}
+    assert fused_knl_default.id_to_insn["read_tmp_shifted"].within_inames == {"k"}
+
+    lp.auto_test_vs_ref(knl, ctx, fused_knl)
+
+    assert (lp.fuse_loops(knl, [("j", "i")]).default_entrypoint.all_inames()
+            == {"j", "k"})
+
+    with pytest.raises(lp.LoopyError):
+        lp.fuse_loops(knl, [("i", "k")])
+
+    # instruction that must run between the loops
+    knl = lp.make_kernel(
+            ["{[i]: 0<=i<n}", "{[j]: 0<=j<n}"],
+            """
+            tmp[i] = 2*a[i]  {id=write_tmp}
+            <> s = tmp[0]  {id=read_first, dep=write_tmp}
+            out[j] = s*a[j]  {dep=read_first}
+            """,
+            [lp.GlobalArg("a,out", np.float64, shape=("n",)),
+             lp.TemporaryVariable("tmp", np.float64, shape=("n",)),
+             ...])
+
+    assert lp.fuse_loops(knl).default_entrypoint.all_inames() == {"i", "j"}
+
+
+def test_expand_subst_reuses_expansions(monkeypatch):
+    import pymbolic.primitives as p
+
+    from loopy.symbolic import RuleAwareSubstitutionRuleExpander, parse
+
+    knl = lp.make_kernel(
+            "{[i, j]: 0<=i, j<n}",
+            """
+            avg(f) := 0.5*(a[i, f] + a[i, f+1])
+            jump(f) := a[i, f+1] - a[i, f]
+            flux(f) := avg(f) + c*jump(f)
+            out1[i, j] = flux(j)
+            out2[i, j] = 2*flux(j)  {id=insn2}
+            out3[i, j] = flux(j) + flux(0)
+            """)
+
+    expansions = []
+    map_subst_rule = RuleAwareSubstitutionRuleExpander.map_subst_rule
+
+    def counting_map_subst_rule(self, name, *args):
+        expansions.append(name)
+        return map_subst_rule(self, name, *args)
+
+    monkeypatch.setattr(RuleAwareSubstitutionRuleExpander, "map_subst_rule",
+                        counting_map_subst_rule)
+
+    expanded = lp.expand_subst(knl)
+    # flux(j), flux(0), each expanding avg and jump
+    assert len(expansions) == 6
+
+    flux_j = parse("0.5*(a[i, j] + a[i, j + 1]) + c*(a[i, j + 1] - a[i, j])")
+    insn1, insn2, insn3 = expanded.default_entrypoint.instructions
+    assert not expanded.default_entrypoint.substitutions
+    assert insn1.expression == flux_j
+    assert insn2.expression == 2*flux_j
+    assert insn3.expression == p.Sum((flux_j, parse(
+        "0.5*(a[i, 0] + a[i, 0 + 1]) + c*(a[i, 0 + 1] - a[i, 0])")))
+
+    # expansions restricted to some instructions are not reused
+    expansions.clear()
+    expanded = lp.expand_subst(knl, "id:insn2")
+    assert len(expansions) == 3 * 4
+    insn1, insn2, _ = expanded.default_entrypoint.instructions
+    assert insn1.expression == parse("flux(j)")
+    assert insn2.expression == 2*flux_j
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         exec(sys.argv[1])